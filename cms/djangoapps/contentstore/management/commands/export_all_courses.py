@@ -1,10 +1,15 @@
 """
 Script for exporting all courseware from Mongo to a directory and listing the courses which failed to export
 """
+import time
+from multiprocessing import Pool
+from optparse import make_option
+
 from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
 from xmodule.modulestore.xml_exporter import export_to_xml
-from xmodule.modulestore.django import modulestore
-from xmodule.contentstore.django import contentstore
+from xmodule.modulestore.django import modulestore, clear_existing_modulestores
+from xmodule.contentstore.django import contentstore, clear_existing_contentstores
 
 
 class Command(BaseCommand):
@@ -13,6 +18,15 @@ class Command(BaseCommand):
     """
     help = 'Export all courses from mongo to the specified data directory and list the courses which failed to export'
 
+    option_list = BaseCommand.option_list + (
+        make_option('--processes',
+                    action='store',
+                    dest='processes',
+                    type='int',
+                    default=1,
+                    help='Number of courses to export at once, each in its own process'),
+    )
+
     def handle(self, *args, **options):
         """
         Execute the command
@@ -21,7 +35,7 @@ class Command(BaseCommand):
             raise CommandError("export requires one argument: <output path>")
 
         output_path = args[0]
-        courses, failed_export_courses = export_courses_to_output_path(output_path)
+        courses, failed_export_courses = export_courses_to_output_path(output_path, options['processes'])
 
         print("=" * 80)
         print(u"=" * 30 + u"> Export summary")
@@ -32,28 +46,57 @@ class Command(BaseCommand):
         print("=" * 80)
 
 
-def export_courses_to_output_path(output_path):
+def export_courses_to_output_path(output_path, processes=1):
     """
     Export all courses to target directory and return the list of courses which failed to export
-    """
-    content_store = contentstore()
-    module_store = modulestore()
-    root_dir = output_path
-    courses = module_store.get_courses()
 
+    With more than one process, the courses are exported at once in that many processes.
+    """
+    courses = modulestore().get_courses()
     course_ids = [x.id for x in courses]
-    failed_export_courses = []
 
-    for course_id in course_ids:
-        print(u"-" * 80)
-        print(u"Exporting course id = {0} to {1}".format(course_id, output_path))
+    if processes > 1:
+        # the processes must not share the connections of this one
+        connection.close()
+        pool = Pool(processes, initializer=_reset_connections)
         try:
-            course_dir = course_id.to_deprecated_string().replace('/', '...')
-            export_to_xml(module_store, content_store, course_id, root_dir, course_dir)
-        except Exception as err:  # pylint: disable=broad-except
-            failed_export_courses.append(unicode(course_id))
-            print(u"=" * 30 + u"> Oops, failed to export {0}".format(course_id))
-            print(u"Error:")
-            print(err)
+            results = pool.map(_export_course, [(course_id, output_path) for course_id in course_ids])
+        finally:
+            pool.close()
+            pool.join()
+    else:
+        results = [_export_course((course_id, output_path)) for course_id in course_ids]
 
+    failed_export_courses = [unicode(course_id) for course_id, succeeded in zip(course_ids, results) if not succeeded]
     return courses, failed_export_courses
+
+
+def _reset_connections():
+    """
+    Make an export process open its own connections to the databases, rather than using those
+    it inherited.
+    """
+    connection.close()
+    clear_existing_modulestores()
+    clear_existing_contentstores()
+
+
+def _export_course(args):
+    """
+    Export the course to the output path, given as a (course id, output path) pair, printing how
+    long it took. Return whether the course was exported.
+    """
+    course_id, output_path = args
+    print(u"-" * 80)
+    print(u"Exporting course id = {0} to {1}".format(course_id, output_path))
+    start = time.time()
+    try:
+        course_dir = course_id.to_deprecated_string().replace('/', '...')
+        export_to_xml(modulestore(), contentstore(), course_id, output_path, course_dir)
+    except Exception as err:  # pylint: disable=broad-except
+        print(u"=" * 30 + u"> Oops, failed to export {0}".format(course_id))
+        print(u"Error:")
+        print(err)
+        return False
+    print(u"Exported course id = {0} in {1:.1f} seconds".format(course_id, time.time() - start))
+    return True
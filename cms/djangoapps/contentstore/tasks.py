@@ -29,10 +29,16 @@ def rerun_course(source_course_key_string, destination_course_key_string, user_i
         # use the split modulestore as the store for the rerun course,
         # as the Mongo modulestore doesn't support multiple runs of the same course.
         store = modulestore()
+        CourseRerunState.objects.progressed(
+            course_key=destination_course_key, message="Copying the course content and assets."
+        )
         with store.default_store('split'):
             store.clone_course(source_course_key, destination_course_key, user_id, fields=fields)
 
         # set initial permissions for the user to access the course.
+        CourseRerunState.objects.progressed(
+            course_key=destination_course_key, message="Setting up the course team."
+        )
         initialize_permissions(destination_course_key, User.objects.get(id=user_id))
 
         # update state: Succeeded
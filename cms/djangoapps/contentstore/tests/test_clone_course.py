@@ -3,6 +3,7 @@ Unit tests for cloning a course between the same and different module stores.
 """
 import json
 from opaque_keys.edx.locator import CourseLocator
+from opaque_keys.edx.locations import SlashSeparatedCourseKey
 from xmodule.modulestore import ModuleStoreEnum, EdxJSONEncoder
 from contentstore.tests.utils import CourseTestCase
 from contentstore.tasks import rerun_course
@@ -22,14 +23,11 @@ class CloneCourseTest(CourseTestCase):
         mongo_course1_id = self.import_and_populate_course()
 
         # 2. clone course (mongo -> mongo)
-        # TODO - This is currently failing since clone_course doesn't handle Private content - fails on Publish
-        # mongo_course2_id = SlashSeparatedCourseKey('edX2', 'toy2', '2013_Fall')
-        # self.store.clone_course(mongo_course1_id, mongo_course2_id, self.user.id)
-        # self.assertCoursesEqual(mongo_course1_id, mongo_course2_id)
-        # self.check_populated_course(mongo_course2_id)
-
-        # NOTE: When the code above is uncommented this can be removed.
-        mongo_course2_id = mongo_course1_id
+        with self.store.default_store(ModuleStoreEnum.Type.mongo):
+            mongo_course2_id = SlashSeparatedCourseKey('edX2', 'toy2', '2013_Fall')
+            self.store.clone_course(mongo_course1_id, mongo_course2_id, self.user.id)
+            # the non-portable links of the clone are rewritten, so only check its content
+            self.check_populated_course(mongo_course2_id)
 
         # 3. clone course (mongo -> split)
         with self.store.default_store(ModuleStoreEnum.Type.split):
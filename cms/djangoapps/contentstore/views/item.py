@@ -34,6 +34,7 @@ from xmodule.x_module import PREVIEW_VIEWS, STUDIO_VIEW, STUDENT_VIEW
 from xmodule.course_module import DEFAULT_START_DATE
 from django.contrib.auth.models import User
 from util.date_utils import get_default_time_display
+from util.sandboxing import invalidate_safe_exec_results
 
 from util.json_request import expect_json, JsonResponse
 
@@ -442,6 +443,7 @@ def _save_xblock(user, xblock, data=None, children_strings=None, metadata=None,
         # Used by Bok Choy tests and by republishing of staff locks.
         if publish == 'make_public':
             modulestore().publish(xblock.location, user.id)
+            invalidate_safe_exec_results(xblock.location.course_key)
 
         # Note that children aren't being returned until we have a use case.
         return JsonResponse(result, encoder=EdxJSONEncoder)
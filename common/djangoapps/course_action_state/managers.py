@@ -127,6 +127,17 @@ class CourseRerunUIStateManager(CourseActionUIStateManager):
             display_name=display_name,
         )
 
+    def progressed(self, course_key, message):
+        """
+        To be called as an in progress rerun for the given course goes through its steps, with
+        a message describing the current step.
+        """
+        self.update_state(
+            course_key=course_key,
+            new_state=self.State.IN_PROGRESS,
+            message=message,
+        )
+
     def succeeded(self, course_key):
         """
         To be called when an existing rerun for the given course has successfully completed.
@@ -85,6 +85,16 @@ class TestCourseRerunStateManager(TestCase):
         # dismiss ui and verify
         self.dismiss_ui_and_verify(rerun)
 
+    def test_rerun_progressed(self):
+        self.initiate_rerun()
+
+        CourseRerunState.objects.progressed(course_key=self.course_key, message="Copying assets")
+        self.expected_rerun_state.update({
+            'state': CourseRerunUIStateManager.State.IN_PROGRESS,
+            'message': "Copying assets",
+        })
+        self.verify_rerun_state()
+
     def test_rerun_failed(self):
         # initiate
         self.initiate_rerun()
@@ -1,6 +1,7 @@
 from django.conf import settings
 
 from dogapi import dog_stats_api, dog_http_api
+from dogstats_wrapper import metrics_buffer
 
 
 def run():
@@ -10,6 +11,10 @@ def run():
     Can be configured using a dictionary named DATADOG in the django
     project settings.
 
+    With the statsd agent, setting 'buffer_flush_interval' (in seconds)
+    aggregates the metrics of dogstats_wrapper in process, and sends them
+    at the end of each interval.
+
     """
 
     # By default use the statsd agent
@@ -18,8 +23,17 @@ def run():
     if hasattr(settings, 'DATADOG'):
         options.update(settings.DATADOG)
 
+    buffer_flush_interval = options.pop('buffer_flush_interval', None)
+
     # Not all arguments are documented.
     # Look at the source code for details.
     dog_stats_api.start(**options)
 
+    if buffer_flush_interval and options.get('statsd') and not options.get('disabled'):
+        metrics_buffer.start(
+            host=options.get('statsd_host', 'localhost'),
+            port=options.get('statsd_port', 8125),
+            flush_interval=buffer_flush_interval,
+        )
+
     dog_http_api.api_key = options.get('api_key')
@@ -32,18 +32,18 @@ EMBARGO_SITE_REDIRECT_URL = 'https://www.edx.org/'
 """
 from functools import partial
 import logging
-import pygeoip
 from lazy import lazy
 
 from django.core.exceptions import MiddlewareNotUsed
-from django.core.cache import cache
 from django.conf import settings
 from django.shortcuts import redirect
 from django.http import HttpResponseRedirect, HttpResponseForbidden
 from ipware.ip import get_ip
 from util.request import course_id_from_url
 
+from geoinfo.api import country_code_by_addr
 from student.models import unique_id_for_user
+from user_api.models import UserRequestContext
 from embargo.models import EmbargoedCourse, EmbargoedState, IPFilter
 
 log = logging.getLogger(__name__)
@@ -162,15 +162,10 @@ class EmbargoMiddleware(object):
             A unicode message if the user is embargoed, otherwise `None`
 
         """
-        cache_key = u'user.{user_id}.profile.country'.format(user_id=user.id)
-        profile_country = cache.get(cache_key)
-        if profile_country is None:
-            profile = getattr(user, 'profile', None)
-            if profile is not None and profile.country.code is not None:
-                profile_country = profile.country.code.upper()
-            else:
-                profile_country = ""
-            cache.set(cache_key, profile_country)
+        if user.is_authenticated():
+            profile_country = UserRequestContext.get(user).profile_country
+        else:
+            profile_country = ""
 
         if profile_country in self._embargoed_countries:
             return self.REASONS['profile_country'].format(
@@ -193,10 +188,7 @@ class EmbargoMiddleware(object):
             str: A 2-letter country code.
 
         """
-        if ip_addr.find(':') >= 0:
-            return pygeoip.GeoIP(settings.GEOIPV6_PATH).country_code_by_addr(ip_addr)
-        else:
-            return pygeoip.GeoIP(settings.GEOIP_PATH).country_code_by_addr(ip_addr)
+        return country_code_by_addr(ip_addr)
 
     @property
     def _embargo_redirect_response(self):
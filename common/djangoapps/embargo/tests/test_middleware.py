@@ -22,6 +22,7 @@ from xmodule.modulestore.tests.django_utils import (
 # Explicitly import the cache from ConfigurationModel so we can reset it after each test
 from config_models.models import cache
 from embargo.models import EmbargoedCourse, EmbargoedState, IPFilter
+import geoinfo.api
 
 
 # Since we don't need any XML course fixtures, use a modulestore configuration
@@ -57,6 +58,8 @@ class EmbargoMiddlewareTests(ModuleStoreTestCase):
 
         self.patcher = mock.patch.object(pygeoip.GeoIP, 'country_code_by_addr', self.mock_country_code_by_addr)
         self.patcher.start()
+        # Lookups are cached per process, don't reuse other tests' results
+        geoinfo.api.clear_cache()
 
     def tearDown(self):
         # Explicitly clear ConfigurationModel's cache so tests have a clear cache
@@ -260,12 +263,12 @@ class EmbargoMiddlewareTests(ModuleStoreTestCase):
         profile.save()
 
         # Warm the cache
-        with self.assertNumQueries(16):
+        with self.assertNumQueries(14):
             self.client.get(self.embargoed_page)
 
         # Access the page multiple times, but expect that we hit
         # the database to check the user's profile only once
-        with self.assertNumQueries(10):
+        with self.assertNumQueries(4):
             self.client.get(self.embargoed_page)
 
     def test_embargo_profile_country_db_null(self):
@@ -0,0 +1,92 @@
+"""
+Look up the country of an IP address.
+
+The GeoIP databases are opened once per process, memory-mapped, and shared by
+all the callers (`geoinfo.middleware.CountryMiddleware`, the embargo
+middleware...). Recent lookups are kept in a bounded LRU, so that the same
+addresses, which make most of the traffic, are only looked up once.
+
+Usage:
+
+    from geoinfo.api import country_code_by_addr
+    country_code = country_code_by_addr(ip_address)
+
+"""
+from collections import OrderedDict
+import threading
+
+import pygeoip
+
+from django.conf import settings
+
+# How many addresses are remembered in each process.
+COUNTRY_CACHE_SIZE = 10000
+
+
+class CountryLookup(object):
+    """
+    Memory-mapped GeoIP databases, with an LRU of their results.
+    """
+    def __init__(self, size):
+        self.size = size
+        self._readers = {}
+        self._countries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _reader(self, ip_addr):
+        """
+        Return the GeoIP database to use for `ip_addr`, opening it if needed.
+        """
+        path = settings.GEOIPV6_PATH if ip_addr.find(':') >= 0 else settings.GEOIP_PATH
+        reader = self._readers.get(path)
+        if reader is None:
+            reader = pygeoip.GeoIP(path, pygeoip.MMAP_CACHE)
+            self._readers[path] = reader
+        return reader
+
+    def country_code_by_addr(self, ip_addr):
+        """
+        Return the 2-letter country code of an IPv4 or IPv6 address.
+        """
+        with self._lock:
+            try:
+                country_code = self._countries.pop(ip_addr)
+            except KeyError:
+                country_code = self._reader(ip_addr).country_code_by_addr(ip_addr)
+            self._countries[ip_addr] = country_code
+            while len(self._countries) > self.size:
+                self._countries.popitem(last=False)
+        return country_code
+
+    def clear(self):
+        """
+        Forget the cached results, and close the databases.
+        """
+        with self._lock:
+            self._countries.clear()
+            self._readers.clear()
+
+
+_lookup = CountryLookup(COUNTRY_CACHE_SIZE)
+
+
+def country_code_by_addr(ip_addr):
+    """
+    Return the 2-letter country code associated with an IP address.
+    Handles both IPv4 and IPv6 addresses.
+
+    Args:
+        ip_addr (str): The IP address to look up.
+
+    Returns:
+        str: A 2-letter country code.
+
+    """
+    return _lookup.country_code_by_addr(ip_addr)
+
+
+def clear_cache():
+    """
+    Forget all cached lookups, e.g. after the GeoIP databases were updated.
+    """
+    _lookup.clear()
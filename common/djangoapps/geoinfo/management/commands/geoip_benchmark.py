@@ -0,0 +1,63 @@
+"""
+Time the per-request cost of looking up the country of an IP address.
+
+    $ ./manage.py lms geoip_benchmark --settings=devstack [--requests=10000] [--addresses=1000]
+
+Simulates `requests` lookups for `addresses` distinct random IPv4 addresses,
+the way the middlewares did it before (opening the GeoIP database for every
+lookup), and through `geoinfo.api`.
+"""
+from optparse import make_option
+import random
+import time
+
+import pygeoip
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from geoinfo import api
+
+
+class Command(BaseCommand):
+    """
+    Print the average time of a country lookup.
+    """
+    help = "Print the average time of a country lookup, with and without geoinfo.api"
+
+    option_list = BaseCommand.option_list + (
+        make_option('--requests',
+                    dest='requests',
+                    type='int',
+                    default=10000,
+                    help='number of lookups'),
+        make_option('--addresses',
+                    dest='addresses',
+                    type='int',
+                    default=1000,
+                    help='number of distinct IP addresses'),
+    )
+
+    def handle(self, *args, **options):
+        rand = random.Random(0)
+        addresses = [
+            '.'.join(str(rand.randint(1, 254)) for _ in xrange(4))
+            for _ in xrange(options['addresses'])
+        ]
+        ip_addrs = [rand.choice(addresses) for _ in xrange(options['requests'])]
+
+        def new_database(ip_addr):
+            """The lookup as it used to be done."""
+            return pygeoip.GeoIP(settings.GEOIP_PATH).country_code_by_addr(ip_addr)
+
+        api.clear_cache()
+        for name, lookup in [
+                ("database per lookup", new_database),
+                ("shared database", api.CountryLookup(0).country_code_by_addr),
+                ("shared database + LRU", api.country_code_by_addr),
+        ]:
+            start = time.time()
+            for ip_addr in ip_addrs:
+                lookup(ip_addr)
+            elapsed = time.time() - start
+            self.stdout.write("{:<24} {:>10.1f} us/lookup\n".format(name, elapsed / len(ip_addrs) * 1e6))
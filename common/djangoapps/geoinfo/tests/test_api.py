@@ -0,0 +1,51 @@
+"""
+Tests for the shared GeoIP lookup.
+"""
+from mock import patch
+import pygeoip
+
+from django.test import TestCase
+
+from geoinfo import api
+
+
+class CountryLookupTests(TestCase):
+    """
+    Tests of geoinfo.api.
+    """
+    def setUp(self):
+        api.clear_cache()
+        self.addCleanup(api.clear_cache)
+
+    def test_real_databases(self):
+        self.assertEqual(api.country_code_by_addr('117.79.83.1'), 'CN')
+        self.assertEqual(api.country_code_by_addr('2001:da8:20f:1502:edcf:550b:4a9c:207d'), 'CN')
+
+    def test_databases_opened_once(self):
+        api.country_code_by_addr('117.79.83.1')
+        with patch.object(pygeoip, 'GeoIP') as mock_geoip:
+            api.country_code_by_addr('4.0.0.0')
+        self.assertFalse(mock_geoip.called)
+
+    @patch.object(pygeoip.GeoIP, 'country_code_by_addr')
+    def test_results_cached(self, mock_country_code_by_addr):
+        mock_country_code_by_addr.return_value = 'SD'
+        self.assertEqual(api.country_code_by_addr('4.0.0.0'), 'SD')
+        self.assertEqual(api.country_code_by_addr('4.0.0.0'), 'SD')
+        self.assertEqual(mock_country_code_by_addr.call_count, 1)
+
+    @patch.object(pygeoip.GeoIP, 'country_code_by_addr')
+    def test_least_recently_used_evicted(self, mock_country_code_by_addr):
+        mock_country_code_by_addr.return_value = 'US'
+        lookup = api.CountryLookup(2)
+        lookup.country_code_by_addr('1.0.0.0')
+        lookup.country_code_by_addr('2.0.0.0')
+        lookup.country_code_by_addr('1.0.0.0')
+        lookup.country_code_by_addr('3.0.0.0')
+        self.assertEqual(mock_country_code_by_addr.call_count, 3)
+
+        # 2.0.0.0 was evicted, 1.0.0.0 was not.
+        lookup.country_code_by_addr('1.0.0.0')
+        self.assertEqual(mock_country_code_by_addr.call_count, 3)
+        lookup.country_code_by_addr('2.0.0.0')
+        self.assertEqual(mock_country_code_by_addr.call_count, 4)
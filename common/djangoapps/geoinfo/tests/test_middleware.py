@@ -13,6 +13,7 @@ from student.models import CourseEnrollment
 from student.tests.factories import UserFactory, AnonymousUserFactory
 
 from django.contrib.sessions.middleware import SessionMiddleware
+import geoinfo.api
 from geoinfo.middleware import CountryMiddleware
 
 
@@ -29,6 +30,8 @@ class CountryMiddlewareTests(TestCase):
         self.request_factory = RequestFactory()
         self.patcher = patch.object(pygeoip.GeoIP, 'country_code_by_addr', self.mock_country_code_by_addr)
         self.patcher.start()
+        # Lookups are cached per process, don't reuse other tests' results
+        geoinfo.api.clear_cache()
 
     def tearDown(self):
         self.patcher.stop()
@@ -1,7 +1,17 @@
 import threading
 
-_request_cache_threadlocal = threading.local()
-_request_cache_threadlocal.data = {}
+
+class _RequestCacheThreadLocal(threading.local):
+    """
+    Thread local storage for the request cache, with an empty cache in each
+    new thread, even if RequestCache.process_request has not run in it.
+    """
+    def __init__(self):
+        super(_RequestCacheThreadLocal, self).__init__()
+        self.data = {}
+
+_request_cache_threadlocal = _RequestCacheThreadLocal()
+
 
 class RequestCache(object):
     @classmethod
@@ -0,0 +1,126 @@
+"""
+Middlewares which profile the requests.
+
+RequestProfilerMiddleware profiles a sample of the requests.
+
+For each sampled request, it records the number of and the time spent in the
+SQL queries, Mongo operations, cache calls, safe_exec runs and xblock renders
+(see `request_profiler.profiler`), and sends them to datadog and the logs with
+the name of the view (set by `ViewNameMiddleware`).
+
+Enabled with FEATURES['ENABLE_REQUEST_PROFILER'], for the fraction
+settings.REQUEST_PROFILER_SAMPLE_RATE of the requests.
+
+ModulestoreTracingMiddleware traces the Mongo operations of the modulestores
+in every request, and logs a warning when a view makes more than its budget
+(see `mongo_budget`). Enabled with FEATURES['ENABLE_MODULESTORE_TRACING'].
+"""
+import logging
+import random
+
+from django.conf import settings
+from django.core.cache import get_cache
+from django.core.exceptions import MiddlewareNotUsed
+
+import dogstats_wrapper as dog_stats_api
+
+from request_profiler import profiler
+from xmodule.modulestore.tracing import trace_mongo_calls
+
+log = logging.getLogger(__name__)
+
+
+class RequestProfilerMiddleware(object):
+    """
+    Profile a sample of the requests.
+    """
+    def __init__(self):
+        if not settings.FEATURES.get('ENABLE_REQUEST_PROFILER', False):
+            raise MiddlewareNotUsed()
+        self.sample_rate = settings.REQUEST_PROFILER_SAMPLE_RATE
+        profiler.install(cache_classes=set(type(get_cache(alias)) for alias in settings.CACHES))
+
+    def process_request(self, request):
+        """
+        Start profiling the request, if it is sampled.
+        """
+        leftover = profiler.current_profile()
+        if leftover is not None:
+            # the previous request of the thread didn't get a response
+            leftover.finish()
+
+        request.profile = None
+        if random.random() < self.sample_rate:
+            request.profile = profiler.Profile()
+            request.profile.begin()
+
+    def process_response(self, request, response):
+        """
+        Report the profile of the request.
+        """
+        profile = getattr(request, 'profile', None)
+        if profile is None:
+            return response
+        profile.finish()
+        request.profile = None
+
+        view_name = getattr(request, 'view_name', 'unknown')
+        tags = [u'view:{}'.format(view_name), u'status:{}'.format(response.status_code)]
+        dog_stats_api.histogram('request_profiler.duration', profile.duration, tags=tags)
+        for kind in profile.counts:
+            kind_tags = tags + [u'kind:{}'.format(kind)]
+            dog_stats_api.histogram('request_profiler.calls', profile.counts[kind], tags=kind_tags)
+            dog_stats_api.histogram('request_profiler.time', profile.times[kind], tags=kind_tags)
+
+        log.info(
+            u"Profile of %s %s (view %s): %.3fs, %s",
+            request.method, request.path, view_name, profile.duration, profile.summary()
+        )
+        return response
+
+
+def mongo_budget(name):
+    """
+    Return the budget of modulestore Mongo operations of a view or task, from
+    settings.MODULESTORE_MONGO_BUDGETS, or its 'default' budget.
+    """
+    budgets = settings.MODULESTORE_MONGO_BUDGETS
+    return budgets.get(name, budgets.get('default'))
+
+
+class ModulestoreTracingMiddleware(object):
+    """
+    Trace the Mongo operations of the modulestores in each request.
+    """
+    def __init__(self):
+        if not settings.FEATURES.get('ENABLE_MODULESTORE_TRACING', False):
+            raise MiddlewareNotUsed()
+
+    def process_request(self, request):
+        """
+        Start tracing the request.
+        """
+        request.mongo_tracing = trace_mongo_calls(request.path)
+        request.mongo_trace = request.mongo_tracing.__enter__()
+
+    def process_response(self, request, response):
+        """
+        Stop tracing the request, and report its operations.
+        """
+        tracing = getattr(request, 'mongo_tracing', None)
+        if tracing is None:
+            return response
+        request.mongo_tracing = None
+
+        trace = request.mongo_trace
+        view_name = getattr(request, 'view_name', 'unknown')
+        # the budget is checked when the trace ends
+        trace.name = u"View {} ({})".format(view_name, request.path)
+        trace.budget = mongo_budget(view_name)
+        tracing.__exit__(None, None, None)
+
+        tags = [u'view:{}'.format(view_name)]
+        dog_stats_api.histogram('modulestore.mongo.operations', trace.total_count, tags=tags)
+        dog_stats_api.histogram('modulestore.mongo.time', trace.total_time, tags=tags)
+        log.debug(u"%s made %d modulestore Mongo operations: %s", trace.name, trace.total_count, trace.summary())
+        return response
@@ -0,0 +1,175 @@
+"""
+Count the calls and measure the time spent in the slow parts of a request:
+SQL queries, Mongo operations, cache gets and sets, safe_exec runs and xblock
+renders.
+
+The functions doing these are wrapped once per process with `install`. The
+wrappers only measure anything while a `Profile` is active in their thread, so
+they cost one thread local lookup otherwise. Nested calls of the same kind
+(e.g. `get_many` calling `get`) count once, with the time of the outermost call.
+
+SQL queries are measured by Django's debug cursor instead: it is turned on for
+the duration of a profile.
+"""
+from contextlib import contextmanager
+from functools import wraps
+import threading
+import time
+
+from django.db import connections
+
+# The kinds of calls which are profiled.
+SQL = 'sql'
+MONGO = 'mongo'
+CACHE = 'cache'
+SAFE_EXEC = 'safe_exec'
+RENDER = 'render'
+
+CACHE_METHODS = ('get', 'set', 'add', 'delete', 'get_many', 'set_many', 'delete_many')
+
+_local = threading.local()
+_install_lock = threading.Lock()
+_installed = False
+
+
+class Profile(object):
+    """
+    The calls counts and times of one request, by kind of call.
+    """
+    def __init__(self):
+        self.start = time.time()
+        self.end = None
+        self.counts = dict.fromkeys([SQL, MONGO, CACHE, SAFE_EXEC, RENDER], 0)
+        self.times = dict.fromkeys([SQL, MONGO, CACHE, SAFE_EXEC, RENDER], 0.0)
+        self._depths = dict.fromkeys([MONGO, CACHE, SAFE_EXEC, RENDER], 0)
+        self._query_counts = {}
+        self._debug_cursors = {}
+
+    @property
+    def duration(self):
+        """
+        The time between the start of the profile and its end (or now).
+        """
+        return (self.end or time.time()) - self.start
+
+    def begin(self):
+        """
+        Make this the profile of the current thread.
+        """
+        for connection in connections.all():
+            self._debug_cursors[connection.alias] = connection.use_debug_cursor
+            self._query_counts[connection.alias] = len(connection.queries)
+            connection.use_debug_cursor = True
+        _local.profile = self
+
+    def finish(self):
+        """
+        Stop profiling the current thread, and collect the SQL queries.
+        """
+        _local.profile = None
+        self.end = time.time()
+        for connection in connections.all():
+            if connection.alias not in self._query_counts:
+                continue
+            queries = connection.queries[self._query_counts[connection.alias]:]
+            self.counts[SQL] += len(queries)
+            self.times[SQL] += sum(float(query.get('time') or 0) for query in queries)
+            if not self._debug_cursors[connection.alias]:
+                # nobody else wanted these
+                del connection.queries[self._query_counts[connection.alias]:]
+            connection.use_debug_cursor = self._debug_cursors[connection.alias]
+
+    @contextmanager
+    def measure(self, kind):
+        """
+        Count the contained code as one call of `kind`, unless it is nested
+        in another call of the same kind.
+        """
+        self._depths[kind] += 1
+        start = time.time()
+        try:
+            yield
+        finally:
+            self._depths[kind] -= 1
+            if self._depths[kind] == 0:
+                self.counts[kind] += 1
+                self.times[kind] += time.time() - start
+
+    def summary(self):
+        """
+        Return a readable summary of the profile.
+        """
+        return u", ".join(
+            u"{}: {} in {:.3f}s".format(kind, self.counts[kind], self.times[kind])
+            for kind in sorted(self.counts)
+        )
+
+
+def current_profile():
+    """
+    Return the active profile of the current thread, or None.
+    """
+    return getattr(_local, 'profile', None)
+
+
+def instrument(owner, name, kind):
+    """
+    Replace the function `name` of the module or class `owner` with a wrapper
+    which measures its calls as calls of `kind`.
+    """
+    original = vars(owner)[name]
+
+    @wraps(original)
+    def wrapper(*args, **kwargs):  # pylint: disable=missing-docstring
+        profile = getattr(_local, 'profile', None)
+        if profile is None:
+            return original(*args, **kwargs)
+        with profile.measure(kind):
+            return original(*args, **kwargs)
+
+    wrapper.profiled_original = original
+    setattr(owner, name, wrapper)
+
+
+def _instrument_if_defined(owner, name, kind):
+    """
+    Instrument `name` if `owner` defines it itself (and not already).
+    """
+    function = vars(owner).get(name)
+    if function is not None and not hasattr(function, 'profiled_original'):
+        instrument(owner, name, kind)
+
+
+def install(cache_classes=()):
+    """
+    Wrap the functions to profile, once per process.
+
+    Mongo operations are measured where pymongo sends messages to the server,
+    which all of the split MongoConnection, the old MongoModuleStore's
+    collections and the contentstore go through.
+    """
+    global _installed  # pylint: disable=global-statement
+    with _install_lock:
+        if _installed:
+            return
+
+        from pymongo.mongo_client import MongoClient
+        from pymongo.mongo_replica_set_client import MongoReplicaSetClient
+        for client_class in (MongoClient, MongoReplicaSetClient):
+            for name in ('_send_message', '_send_message_with_response'):
+                _instrument_if_defined(client_class, name, MONGO)
+
+        for cache_class in cache_classes:
+            for klass in cache_class.__mro__:
+                for name in CACHE_METHODS:
+                    _instrument_if_defined(klass, name, CACHE)
+
+        import capa.safe_exec
+        import capa.capa_problem
+        _instrument_if_defined(capa.safe_exec, 'safe_exec', SAFE_EXEC)
+        _instrument_if_defined(capa.capa_problem, 'safe_exec', SAFE_EXEC)
+
+        from xmodule.x_module import MetricsMixin
+        _instrument_if_defined(MetricsMixin, 'render', RENDER)
+
+        _installed = True
@@ -0,0 +1,39 @@
+"""
+Trace the Mongo operations of the modulestores in each celery task, like
+ModulestoreTracingMiddleware does for requests.
+"""
+from celery.signals import task_prerun, task_postrun
+from django.conf import settings
+
+from request_profiler.middleware import mongo_budget
+from xmodule.modulestore.tracing import trace_mongo_calls
+
+# The tracing context of each running task, by task id.
+_task_tracings = {}
+
+
+def start_task_tracing(task_id=None, task=None, **kwargs):  # pylint: disable=unused-argument
+    """
+    Start tracing a task.
+    """
+    tracing = trace_mongo_calls(u"Task {}".format(task.name), mongo_budget(task.name))
+    tracing.__enter__()
+    _task_tracings[task_id] = tracing
+
+
+def stop_task_tracing(task_id=None, **kwargs):  # pylint: disable=unused-argument
+    """
+    Stop tracing a task, which logs a warning if it went over its budget.
+    """
+    tracing = _task_tracings.pop(task_id, None)
+    if tracing is not None:
+        tracing.__exit__(None, None, None)
+
+
+def run():
+    """
+    Connect the task signals, if tracing is enabled.
+    """
+    if settings.FEATURES.get('ENABLE_MODULESTORE_TRACING', False):
+        task_prerun.connect(start_task_tracing, weak=False)
+        task_postrun.connect(stop_task_tracing, weak=False)
@@ -0,0 +1,129 @@
+"""
+Tests for RequestProfilerMiddleware.
+"""
+from mock import patch
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpResponse
+from django.test import TestCase
+from django.test.client import RequestFactory
+from django.test.utils import override_settings
+
+from request_profiler import profiler
+from request_profiler.middleware import RequestProfilerMiddleware, ModulestoreTracingMiddleware
+
+FEATURES_WITH_PROFILER = settings.FEATURES.copy()
+FEATURES_WITH_PROFILER['ENABLE_REQUEST_PROFILER'] = True
+
+FEATURES_WITH_TRACING = settings.FEATURES.copy()
+FEATURES_WITH_TRACING['ENABLE_MODULESTORE_TRACING'] = True
+
+
+class Renderer(object):
+    """
+    Something to profile.
+    """
+    def render(self, depth):
+        """
+        Render nested calls.
+        """
+        if depth > 0:
+            self.render(depth - 1)
+
+
+@override_settings(FEATURES=FEATURES_WITH_PROFILER, REQUEST_PROFILER_SAMPLE_RATE=1)
+class RequestProfilerMiddlewareTests(TestCase):
+    """
+    Tests of RequestProfilerMiddleware.
+    """
+    def setUp(self):
+        self.middleware = RequestProfilerMiddleware()
+        self.request = RequestFactory().get('/courses')
+        self.request.view_name = 'courses'
+
+    @override_settings(FEATURES=settings.FEATURES)
+    def test_disabled(self):
+        with self.assertRaises(MiddlewareNotUsed):
+            RequestProfilerMiddleware()
+
+    @patch('request_profiler.middleware.dog_stats_api')
+    @patch('request_profiler.middleware.log')
+    def test_request_profiled(self, mock_log, mock_dog_stats_api):
+        self.middleware.process_request(self.request)
+        User.objects.count()
+        User.objects.count()
+        cache.set('request_profiler_test', 1)
+        cache.get('request_profiler_test')
+        response = self.middleware.process_response(self.request, HttpResponse())
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNone(profiler.current_profile())
+        self.assertTrue(mock_log.info.called)
+        histograms = {
+            (call[0][0], tuple(call[1]['tags'])): call[0][1]
+            for call in mock_dog_stats_api.histogram.call_args_list
+        }
+        self.assertEqual(histograms[('request_profiler.calls', (u'view:courses', u'status:200', u'kind:sql'))], 2)
+        self.assertEqual(histograms[('request_profiler.calls', (u'view:courses', u'status:200', u'kind:cache'))], 2)
+        self.assertEqual(histograms[('request_profiler.calls', (u'view:courses', u'status:200', u'kind:mongo'))], 0)
+
+    @override_settings(REQUEST_PROFILER_SAMPLE_RATE=0)
+    @patch('request_profiler.middleware.dog_stats_api')
+    def test_request_not_sampled(self, mock_dog_stats_api):
+        self.middleware = RequestProfilerMiddleware()
+        self.middleware.process_request(self.request)
+        self.assertIsNone(profiler.current_profile())
+        self.middleware.process_response(self.request, HttpResponse())
+        self.assertFalse(mock_dog_stats_api.histogram.called)
+
+    def test_nested_calls_counted_once(self):
+        with patch.object(Renderer, 'render', Renderer.__dict__['render']):
+            profiler.instrument(Renderer, 'render', profiler.RENDER)
+            profile = profiler.Profile()
+            profile.begin()
+            try:
+                Renderer().render(3)
+                Renderer().render(0)
+            finally:
+                profile.finish()
+        self.assertEqual(profile.counts[profiler.RENDER], 2)
+
+
+@override_settings(FEATURES=FEATURES_WITH_TRACING, MODULESTORE_MONGO_BUDGETS={'default': None, 'courses': 2})
+class ModulestoreTracingMiddlewareTests(TestCase):
+    """
+    Tests of ModulestoreTracingMiddleware.
+    """
+    def setUp(self):
+        self.middleware = ModulestoreTracingMiddleware()
+        self.request = RequestFactory().get('/courses')
+
+    def _make_request(self, view_name, operations):
+        """
+        Go through the middleware with a request to `view_name` which makes
+        `operations` Mongo operations.
+        """
+        self.request.view_name = view_name
+        self.middleware.process_request(self.request)
+        for __ in range(operations):
+            self.request.mongo_trace.record('modulestore.find', 0.001)
+        self.middleware.process_response(self.request, HttpResponse())
+
+    @patch('xmodule.modulestore.tracing.log')
+    def test_over_budget(self, mock_log):
+        self._make_request('courses', 3)
+        self.assertTrue(mock_log.warning.called)
+
+    @patch('xmodule.modulestore.tracing.log')
+    def test_within_budget(self, mock_log):
+        self._make_request('courses', 2)
+        self._make_request('index', 20)
+        self.assertFalse(mock_log.warning.called)
+
+    @patch('request_profiler.middleware.dog_stats_api')
+    def test_operations_reported(self, mock_dog_stats_api):
+        self._make_request('index', 4)
+        mock_dog_stats_api.histogram.assert_any_call('modulestore.mongo.operations', 4, tags=[u'view:index'])
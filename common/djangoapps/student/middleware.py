@@ -5,7 +5,7 @@ disabled accounts from accessing the site.
 from django.http import HttpResponseForbidden
 from django.utils.translation import ugettext as _
 from django.conf import settings
-from student.models import UserStanding
+from user_api.models import UserRequestContext
 
 class UserStandingMiddleware(object):
     """
@@ -14,14 +14,8 @@ class UserStandingMiddleware(object):
     """
     def process_request(self, request):
         user = request.user
-        try:
-            user_account = UserStanding.objects.get(user=user.id)
-            # because user is a unique field in UserStanding, there will either be
-            # one or zero user_accounts associated with a UserStanding
-        except UserStanding.DoesNotExist:
-            pass
-        else:
-            if user_account.account_status == UserStanding.ACCOUNT_DISABLED:
+        if user.is_authenticated():
+            if UserRequestContext.get(user).is_disabled:
                 msg = _(
                             'Your account has been disabled. If you believe '
                             'this was done in error, please contact us at '
@@ -26,8 +26,10 @@ from django.utils import timezone
 from django.contrib.auth.models import User
 from django.contrib.auth.hashers import make_password
 from django.contrib.auth.signals import user_logged_in, user_logged_out
+from django.core.cache import cache
 from django.db import models, IntegrityError, transaction
 from django.db.models import Count
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver, Signal
 from django.core.exceptions import ObjectDoesNotExist
 from django.utils.translation import ugettext_noop
@@ -43,6 +45,7 @@ from opaque_keys import InvalidKeyError
 
 import lms.lib.comment_client as cc
 from util.query import use_read_replica_if_available
+from request_cache.middleware import RequestCache
 from xmodule_django.models import CourseKeyField, NoneToEmptyManager
 from xmodule.modulestore.exceptions import ItemNotFoundError
 from xmodule.modulestore.django import modulestore
@@ -80,6 +83,40 @@ class AnonymousUserId(models.Model):
     unique_together = (user, course_id)
 
 
+def _compute_anonymous_id(user, course_id):
+    """
+    Return the anonymous id of a (user, course) pair, and remember it on `user`.
+    """
+    # include the secret key as a salt, and to make the ids unique across different LMS installs.
+    hasher = hashlib.md5()
+    hasher.update(settings.SECRET_KEY)
+    hasher.update(unicode(user.id))
+    if course_id:
+        hasher.update(course_id.to_deprecated_string().encode('utf-8'))
+    digest = hasher.hexdigest()
+
+    if not hasattr(user, '_anonymous_id'):
+        user._anonymous_id = {}  # pylint: disable=protected-access
+
+    user._anonymous_id[course_id] = digest  # pylint: disable=protected-access
+    return digest
+
+
+def _log_anonymous_id_mismatch(user, course_id, stored, digest):
+    """
+    Log that the stored anonymous id of a (user, course) pair isn't the computed one.
+    """
+    log.error(
+        "Stored anonymous user id {stored!r} for user {user!r} "
+        "in course {course!r} doesn't match computed id {digest!r}".format(
+            user=user,
+            course=course_id,
+            stored=stored,
+            digest=digest
+        )
+    )
+
+
 def anonymous_id_for_user(user, course_id, save=True):
     """
     Return a unique id for a (user, course) pair, suitable for inserting
@@ -98,18 +135,7 @@ def anonymous_id_for_user(user, course_id, save=True):
     if cached_id is not None:
         return cached_id
 
-    # include the secret key as a salt, and to make the ids unique across different LMS installs.
-    hasher = hashlib.md5()
-    hasher.update(settings.SECRET_KEY)
-    hasher.update(unicode(user.id))
-    if course_id:
-        hasher.update(course_id.to_deprecated_string().encode('utf-8'))
-    digest = hasher.hexdigest()
-
-    if not hasattr(user, '_anonymous_id'):
-        user._anonymous_id = {}  # pylint: disable=protected-access
-
-    user._anonymous_id[course_id] = digest  # pylint: disable=protected-access
+    digest = _compute_anonymous_id(user, course_id)
 
     if save is False:
         return digest
@@ -121,15 +147,7 @@ def anonymous_id_for_user(user, course_id, save=True):
             course_id=course_id
         )
         if anonymous_user_id.anonymous_user_id != digest:
-            log.error(
-                "Stored anonymous user id {stored!r} for user {user!r} "
-                "in course {course!r} doesn't match computed id {digest!r}".format(
-                    user=user,
-                    course=course_id,
-                    stored=anonymous_user_id.anonymous_user_id,
-                    digest=digest
-                )
-            )
+            _log_anonymous_id_mismatch(user, course_id, anonymous_user_id.anonymous_user_id, digest)
     except IntegrityError:
         # Another thread has already created this entry, so
         # continue
@@ -138,6 +156,79 @@ def anonymous_id_for_user(user, course_id, save=True):
     return digest
 
 
+# the number of users whose anonymous ids are looked up and created per query
+ANONYMOUS_ID_BATCH_SIZE = 100
+
+
+def anonymous_ids_for_users(users, course_id, save=True):
+    """
+    Return the unique ids of the (user, course) pairs of many users, by user id,
+    like `anonymous_id_for_user` does for one user.
+
+    The ids are remembered on the users, so that `anonymous_id_for_user` then
+    returns them without touching the database. When `save`, the missing
+    AnonymousUserId objects are created with a couple of queries per
+    ANONYMOUS_ID_BATCH_SIZE users.
+    """
+    users = [user for user in users if not user.is_anonymous()]
+    digests = {}
+    new_users = []
+    for user in users:
+        cached_id = getattr(user, '_anonymous_id', {}).get(course_id)
+        if cached_id is not None:
+            digests[user.id] = cached_id
+        else:
+            digests[user.id] = _compute_anonymous_id(user, course_id)
+            new_users.append(user)
+
+    if save:
+        for start in xrange(0, len(new_users), ANONYMOUS_ID_BATCH_SIZE):
+            _save_anonymous_ids(new_users[start:start + ANONYMOUS_ID_BATCH_SIZE], course_id, digests)
+    return digests
+
+
+def _save_anonymous_ids(users, course_id, digests):
+    """
+    Create the AnonymousUserId objects of the `users` which don't have one in
+    the course yet, with their ids in `digests`.
+    """
+    stored_ids = dict(AnonymousUserId.objects.filter(
+        user__in=[user.id for user in users],
+        course_id=course_id,
+    ).values_list('user_id', 'anonymous_user_id'))
+    for user in users:
+        stored = stored_ids.get(user.id)
+        if stored is not None and stored != digests[user.id]:
+            _log_anonymous_id_mismatch(user, course_id, stored, digests[user.id])
+
+    missing_users = [user for user in users if user.id not in stored_ids]
+    if not missing_users:
+        return
+
+    # like get_or_create, use a savepoint to recover from an IntegrityError
+    # without losing the rest of the transaction
+    savepoint = transaction.savepoint()
+    try:
+        AnonymousUserId.objects.bulk_create([
+            AnonymousUserId(user=user, course_id=course_id, anonymous_user_id=digests[user.id])
+            for user in missing_users
+        ])
+        transaction.savepoint_commit(savepoint)
+    except IntegrityError:
+        transaction.savepoint_rollback(savepoint)
+        # Another thread has already created some of these entries, so
+        # create the others one at a time
+        for user in missing_users:
+            try:
+                AnonymousUserId.objects.get_or_create(
+                    defaults={'anonymous_user_id': digests[user.id]},
+                    user=user,
+                    course_id=course_id
+                )
+            except IntegrityError:
+                pass
+
+
 def user_by_anonymous_id(uid):
     """
     Return user by anonymous_user_id using AnonymousUserId lookup table.
@@ -1023,6 +1114,153 @@ class CourseEnrollment(models.Model):
             err_msg = u"Tried to unenroll email {} from course {}, but user not found"
             log.error(err_msg.format(email, course_id))
 
+    @classmethod
+    def _send_bulk_saved(cls, enrollments, created=False):
+        """
+        Send the post_save signal of `enrollments` updated in bulk, which
+        bypasses it.
+        """
+        for enrollment in enrollments:
+            post_save.send(sender=cls, instance=enrollment, created=created, raw=False, using=cls.objects.db)
+
+    @classmethod
+    def bulk_enroll(cls, users, course_key, mode="honor"):
+        """
+        Enroll many users in a course, like `enroll` does for one user (without
+        `check_access`), with a few queries for all of them. This saves
+        immediately.
+
+        Returns the list of the CourseEnrollments which were created, activated
+        or changed to `mode`.
+
+        Also emits relevant events for analytics purposes.
+        """
+        users = dict((user.id, user) for user in users)
+        if not users:
+            return []
+        existing = dict(
+            (enrollment.user_id, enrollment)
+            for enrollment in cls.objects.filter(course_id=course_key, user__in=users.keys())
+        )
+
+        new_enrollments = [
+            cls(user=user, course_id=course_key, mode=mode, is_active=True)
+            for user_id, user in users.iteritems() if user_id not in existing
+        ]
+        cls.objects.bulk_create(new_enrollments)
+
+        activated = [enrollment for enrollment in existing.itervalues() if not enrollment.is_active]
+        mode_changed = [enrollment for enrollment in existing.itervalues() if enrollment.mode != mode]
+        changed = list(set(activated + mode_changed))
+        if changed:
+            cls.objects.filter(pk__in=[enrollment.pk for enrollment in changed]).update(is_active=True, mode=mode)
+        for enrollment in changed:
+            enrollment.user = users[enrollment.user_id]
+            enrollment.is_active = True
+            enrollment.mode = mode
+
+        cls._send_bulk_saved(new_enrollments, created=True)
+        cls._send_bulk_saved(changed)
+        for enrollment in new_enrollments + activated:
+            enrollment.emit_event(EVENT_NAME_ENROLLMENT_ACTIVATED)
+        for enrollment in mode_changed:
+            enrollment.emit_event(EVENT_NAME_ENROLLMENT_MODE_CHANGED)
+        if new_enrollments or activated:
+            dog_stats_api.increment(
+                "common.student.enrollment",
+                len(new_enrollments) + len(activated),
+                tags=[u"org:{}".format(course_key.org),
+                      u"offering:{}".format(course_key.offering),
+                      u"mode:{}".format(mode)]
+            )
+        return new_enrollments + changed
+
+    @classmethod
+    def bulk_unenroll(cls, users, course_key):
+        """
+        Unenroll many users from a course, like `unenroll` does for one user,
+        with a few queries for all of them. This saves immediately.
+
+        Returns the list of the CourseEnrollments which were deactivated.
+
+        Also emits relevant events for analytics purposes.
+        """
+        users = dict((user.id, user) for user in users)
+        if not users:
+            return []
+        deactivated = list(cls.objects.filter(course_id=course_key, user__in=users.keys(), is_active=True))
+        if not deactivated:
+            return []
+
+        cls.objects.filter(pk__in=[enrollment.pk for enrollment in deactivated]).update(is_active=False)
+        for enrollment in deactivated:
+            enrollment.user = users[enrollment.user_id]
+            enrollment.is_active = False
+
+        cls._send_bulk_saved(deactivated)
+        modes = defaultdict(int)
+        for enrollment in deactivated:
+            UNENROLL_DONE.send(sender=None, course_enrollment=enrollment)
+            enrollment.emit_event(EVENT_NAME_ENROLLMENT_DEACTIVATED)
+            modes[enrollment.mode] += 1
+        for mode, count in modes.iteritems():
+            dog_stats_api.increment(
+                "common.student.unenrollment",
+                count,
+                tags=[u"org:{}".format(course_key.org),
+                      u"offering:{}".format(course_key.offering),
+                      u"mode:{}".format(mode)]
+            )
+        return deactivated
+
+    ENROLLMENT_MAP_CACHE_KEY = u"student.enrollments.{user_id}"
+
+    @classmethod
+    def _enrollment_key(cls, course_id):
+        """
+        Return `course_id` (a CourseKey or a course id string) as stored in
+        the course_id column.
+        """
+        if isinstance(course_id, basestring):
+            return unicode(course_id)
+        return cls._meta.get_field('course_id').get_prep_value(course_id)
+
+    @classmethod
+    def enrollment_map_for_user(cls, user):
+        """
+        Return a dict of (mode, is_active) for all the enrollment records of
+        `user`, keyed by course id as returned by `_enrollment_key`.
+
+        The map is kept in the cache and for the rest of the request, and is
+        invalidated whenever one of the user's records changes.
+        """
+        if user.id is None:
+            return {}
+        key = cls.ENROLLMENT_MAP_CACHE_KEY.format(user_id=user.id)
+        request_cache = RequestCache.get_request_cache().data
+        enrollment_map = request_cache.get(key)
+        if enrollment_map is None:
+            enrollment_map = cache.get(key)
+            if enrollment_map is None:
+                enrollment_map = dict(
+                    (cls._enrollment_key(course_id), (mode, is_active))
+                    for course_id, mode, is_active in cls.objects.filter(
+                        user=user
+                    ).values_list('course_id', 'mode', 'is_active')
+                )
+                cache.set(key, enrollment_map)
+            request_cache[key] = enrollment_map
+        return enrollment_map
+
+    @classmethod
+    def invalidate_enrollment_map(cls, user_id):
+        """
+        Forget the cached enrollment map of a user.
+        """
+        key = cls.ENROLLMENT_MAP_CACHE_KEY.format(user_id=user_id)
+        cache.delete(key)
+        RequestCache.get_request_cache().data.pop(key, None)
+
     @classmethod
     def is_enrolled(cls, user, course_key):
         """
@@ -1035,11 +1273,8 @@ class CourseEnrollment(models.Model):
 
         `course_id` is our usual course_id string (e.g. "edX/Test101/2013_Fall)
         """
-        try:
-            record = CourseEnrollment.objects.get(user=user, course_id=course_key)
-            return record.is_active
-        except cls.DoesNotExist:
-            return False
+        __, is_active = cls.enrollment_mode_for_user(user, course_key)
+        return bool(is_active)
 
     @classmethod
     def is_enrolled_by_partial(cls, user, course_id_partial):
@@ -1060,14 +1295,10 @@ class CourseEnrollment(models.Model):
         assert not course_id_partial.run  # None or empty string
         course_key = SlashSeparatedCourseKey(course_id_partial.org, course_id_partial.course, '')
         querystring = unicode(course_key.to_deprecated_string())
-        try:
-            return CourseEnrollment.objects.filter(
-                user=user,
-                course_id__startswith=querystring,
-                is_active=1
-            ).exists()
-        except cls.DoesNotExist:
-            return False
+        return any(
+            course_id.startswith(querystring) and is_active
+            for course_id, (__, is_active) in cls.enrollment_map_for_user(user).iteritems()
+        )
 
     @classmethod
     def enrollment_mode_for_user(cls, user, course_id):
@@ -1081,11 +1312,7 @@ class CourseEnrollment(models.Model):
             and is_active is whether the enrollment is active.
         Returns (None, None) if the courseenrollment record does not exist.
         """
-        try:
-            record = CourseEnrollment.objects.get(user=user, course_id=course_id)
-            return (record.mode, record.is_active)
-        except cls.DoesNotExist:
-            return (None, None)
+        return cls.enrollment_map_for_user(user).get(cls._enrollment_key(course_id), (None, None))
 
     @classmethod
     def enrollments_for_user(cls, user):
@@ -1201,6 +1428,8 @@ class CourseAccessRole(models.Model):
     without a course_id.
     """
 
+    ROLE_INDEX_CACHE_KEY = u"student.roles.{user_id}"
+
     objects = NoneToEmptyManager()
 
     user = models.ForeignKey(User)
@@ -1358,6 +1587,34 @@ def create_comments_service_user(user):
 # identifying and logging failures separately (in views).
 
 
+@receiver(post_save, sender=CourseEnrollment)
+@receiver(post_delete, sender=CourseEnrollment)
+def invalidate_enrollment_map(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Invalidate the cached enrollment map of the user whose enrollment changed.
+    """
+    CourseEnrollment.invalidate_enrollment_map(instance.user_id)
+
+
+@receiver(post_save, sender=CourseAccessRole)
+@receiver(post_delete, sender=CourseAccessRole)
+def invalidate_role_index(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Invalidate the cached role index of the user whose roles changed.
+    """
+    cache.delete(CourseAccessRole.ROLE_INDEX_CACHE_KEY.format(user_id=instance.user_id))
+
+
+@receiver(post_save, sender=User)
+def invalidate_new_user_caches(sender, instance, created, **kwargs):  # pylint: disable=unused-argument
+    """
+    Make sure that nothing cached for a previous user with the same id is used.
+    """
+    if created:
+        CourseEnrollment.invalidate_enrollment_map(instance.id)
+        cache.delete(CourseAccessRole.ROLE_INDEX_CACHE_KEY.format(user_id=instance.id))
+
+
 @receiver(user_logged_in)
 def log_successful_login(sender, request, user, **kwargs):  # pylint: disable=unused-argument
     """Handler to log when logins have occurred successfully."""
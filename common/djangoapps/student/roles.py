@@ -6,6 +6,7 @@ adding users, removing users, and listing members
 from abc import ABCMeta, abstractmethod
 
 from django.contrib.auth.models import User
+from django.core.cache import cache
 
 from student.models import CourseAccessRole
 from xmodule_django.models import CourseKeyField
@@ -13,23 +14,35 @@ from xmodule_django.models import CourseKeyField
 
 class RoleCache(object):
     """
-    A cache of the CourseAccessRoles held by a particular user
+    A cache of the CourseAccessRoles held by a particular user, indexed by
+    (role, course_id, org).
+
+    The index is kept in the django cache, and invalidated when any of the
+    user's CourseAccessRoles is saved or deleted.
     """
     def __init__(self, user):
-        self._roles = set(
-            CourseAccessRole.objects.filter(user=user).all()
-        )
+        key = CourseAccessRole.ROLE_INDEX_CACHE_KEY.format(user_id=user.id)
+        self._roles = cache.get(key)
+        if self._roles is None:
+            self._roles = frozenset(
+                self._index_key(access_role.role, access_role.course_id, access_role.org)
+                for access_role in CourseAccessRole.objects.filter(user=user).all()
+            )
+            cache.set(key, self._roles)
+
+    @staticmethod
+    def _index_key(role, course_id, org):
+        """
+        Return the index key of a role, using strings rather than CourseKeys
+        so that the index is cheap to cache.
+        """
+        return (role, None if course_id is None else unicode(course_id), org)
 
     def has_role(self, role, course_id, org):
         """
         Return whether this RoleCache contains a role with the specified role, course_id, and org
         """
-        return any(
-            access_role.role == role and
-            access_role.course_id == course_id and
-            access_role.org == org
-            for access_role in self._roles
-        )
+        return self._index_key(role, course_id, org) in self._roles
 
 
 class AccessRole(object):
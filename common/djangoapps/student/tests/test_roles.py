@@ -191,3 +191,18 @@ class RoleCacheTestCase(TestCase):
     def test_empty_cache(self, role, target):
         cache = RoleCache(self.user)
         self.assertFalse(cache.has_role(*target))
+
+    def test_index_cached(self):
+        CourseStaffRole(self.IN_KEY).add_users(self.user)
+        RoleCache(self.user)
+        with self.assertNumQueries(0):
+            cache = RoleCache(self.user)
+        self.assertTrue(cache.has_role('staff', self.IN_KEY, 'edX'))
+
+    def test_index_invalidated(self):
+        role = CourseStaffRole(self.IN_KEY)
+        self.assertFalse(RoleCache(self.user).has_role('staff', self.IN_KEY, 'edX'))
+        role.add_users(self.user)
+        self.assertTrue(RoleCache(self.user).has_role('staff', self.IN_KEY, 'edX'))
+        role.remove_users(self.user)
+        self.assertFalse(RoleCache(self.user).has_role('staff', self.IN_KEY, 'edX'))
@@ -25,7 +25,10 @@ from opaque_keys.edx.locations import SlashSeparatedCourseKey
 
 from mock import Mock, patch
 
-from student.models import anonymous_id_for_user, user_by_anonymous_id, CourseEnrollment, unique_id_for_user
+from student.models import (
+    anonymous_id_for_user, anonymous_ids_for_users, user_by_anonymous_id, CourseEnrollment, unique_id_for_user,
+    AnonymousUserId
+)
 from student.views import (process_survey_link, _cert_info,
                            change_enrollment, complete_course_mode_info)
 from student.tests.factories import UserFactory, CourseModeFactory
@@ -579,6 +582,24 @@ class EnrollInCourseTest(TestCase):
         self.assert_enrollment_mode_change_event_was_emitted(user, course_id, "honor")
 
 
+    def test_enrollment_map_cached(self):
+        user = User.objects.create(username="jill", email="jill@fake.edx.org")
+        course_id = SlashSeparatedCourseKey("edX", "Test101", "2013")
+        CourseEnrollment.enroll(user, course_id, "verified")
+
+        self.assertEqual(CourseEnrollment.enrollment_mode_for_user(user, course_id), ("verified", True))
+        with self.assertNumQueries(0):
+            self.assertTrue(CourseEnrollment.is_enrolled(user, course_id))
+            self.assertTrue(CourseEnrollment.is_enrolled_by_partial(
+                user, SlashSeparatedCourseKey("edX", "Test101", None)
+            ))
+            self.assertFalse(CourseEnrollment.is_enrolled(user, SlashSeparatedCourseKey("edX", "Test101", "2014")))
+
+        # Changes are seen right away.
+        CourseEnrollment.unenroll(user, course_id)
+        self.assertEqual(CourseEnrollment.enrollment_mode_for_user(user, course_id), ("verified", False))
+        self.assertFalse(CourseEnrollment.is_enrolled(user, course_id))
+
 @override_settings(MODULESTORE=TEST_DATA_MIXED_MODULESTORE)
 @unittest.skipUnless(settings.ROOT_URLCONF == 'lms.urls', 'Test only valid in lms')
 class ChangeEnrollmentViewTest(ModuleStoreTestCase):
@@ -731,3 +752,42 @@ class AnonymousLookupTable(ModuleStoreTestCase):
         real_user = user_by_anonymous_id(anonymous_id)
         self.assertEqual(self.user, real_user)
         self.assertEqual(anonymous_id, anonymous_id_for_user(self.user, course2.id, save=False))
+
+    def test_bulk_anonymous_ids(self):
+        users = [self.user] + [UserFactory() for __ in range(3)]
+        # one of the ids is already saved
+        existing_id = anonymous_id_for_user(users[1], self.course.id)
+        users[1] = User.objects.get(id=users[1].id)
+
+        with self.assertNumQueries(2):
+            anonymous_ids = anonymous_ids_for_users(users, self.course.id)
+        self.assertEqual(anonymous_ids[users[1].id], existing_id)
+        for user in users:
+            self.assertEqual(user, user_by_anonymous_id(anonymous_ids[user.id]))
+            self.assertEqual(
+                anonymous_ids[user.id],
+                anonymous_id_for_user(User.objects.get(id=user.id), self.course.id, save=False)
+            )
+        self.assertEqual(AnonymousUserId.objects.filter(course_id=self.course.id).count(), len(users))
+
+        # the ids are remembered on the users
+        with self.assertNumQueries(0):
+            for user in users:
+                self.assertEqual(anonymous_ids[user.id], anonymous_id_for_user(user, self.course.id))
+            anonymous_ids_for_users(users, self.course.id)
+
+    @patch('student.models.ANONYMOUS_ID_BATCH_SIZE', 2)
+    def test_bulk_anonymous_ids_batched(self):
+        users = [self.user] + [UserFactory() for __ in range(4)]
+        # two queries for each batch of 2 users
+        with self.assertNumQueries(6):
+            anonymous_ids = anonymous_ids_for_users(users, self.course.id)
+        self.assertEqual(AnonymousUserId.objects.filter(course_id=self.course.id).count(), len(users))
+        for user in users:
+            self.assertEqual(user, user_by_anonymous_id(anonymous_ids[user.id]))
+
+    def test_bulk_anonymous_ids_not_saved(self):
+        with self.assertNumQueries(0):
+            anonymous_ids = anonymous_ids_for_users([self.user], None, save=False)
+        self.assertEqual(anonymous_ids[self.user.id], unique_id_for_user(User.objects.get(id=self.user.id), save=False))
+        self.assertFalse(AnonymousUserId.objects.filter(user=self.user).exists())
@@ -1,7 +1,11 @@
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.core.validators import RegexValidator
 from django.db import models
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 
+from request_cache.middleware import RequestCache
 from xmodule_django.models import CourseKeyField
 
 # Currently, the "student" app is responsible for
@@ -11,6 +15,7 @@ from xmodule_django.models import CourseKeyField
 # certain models.  For now we will leave the models in "student" and
 # create an alias in "user_api".
 from student.models import UserProfile, Registration, PendingEmailChange  # pylint:disable=unused-import
+from student.models import UserStanding
 
 
 class UserPreference(models.Model):
@@ -59,3 +64,94 @@ class UserCourseTag(models.Model):
 
     class Meta:  # pylint: disable=missing-docstring
         unique_together = ("user", "course_id", "key")
+
+
+class UserRequestContext(object):
+    """
+    What the middlewares need to know about a user on every request: their
+    account standing, profile country, preferences and course tags.
+
+    It is loaded all at once, and kept in the cache (and for the rest of the
+    request) until one of those models is changed for the user.
+    """
+    CACHE_KEY = u"user_api.request_context.{user_id}"
+
+    def __init__(self, account_status, profile_country, preferences, course_tags):
+        self.account_status = account_status
+        self.profile_country = profile_country
+        self.preferences = preferences
+        self.course_tags = course_tags
+
+    @classmethod
+    def get(cls, user):
+        """
+        Return the request context of `user`, who must be authenticated.
+        """
+        key = cls.CACHE_KEY.format(user_id=user.id)
+        request_cache = RequestCache.get_request_cache().data
+        context = request_cache.get(key)
+        if context is None:
+            fields = cache.get(key)
+            if fields is None:
+                fields = cls._load(user.id)
+                cache.set(key, fields)
+            context = cls(**fields)
+            request_cache[key] = context
+        return context
+
+    @classmethod
+    def _load(cls, user_id):
+        """
+        Read the fields of a user's request context from the database.
+        """
+        rows = User.objects.filter(id=user_id).values('standing__account_status', 'profile__country')
+        row = rows[0] if rows else {}
+        course_tags = {}
+        for course_id, key, value in UserCourseTag.objects.filter(user=user_id).values_list('course_id', 'key', 'value'):
+            course_tags.setdefault(unicode(course_id), {})[key] = value
+        return {
+            'account_status': row.get('standing__account_status'),
+            # Country fields loaded as NULL from the database are None.
+            'profile_country': (row.get('profile__country') or u"").upper(),
+            'preferences': dict(UserPreference.objects.filter(user=user_id).values_list('key', 'value')),
+            'course_tags': course_tags,
+        }
+
+    @classmethod
+    def invalidate(cls, user_id):
+        """
+        Forget the cached request context of a user.
+        """
+        key = cls.CACHE_KEY.format(user_id=user_id)
+        cache.delete(key)
+        RequestCache.get_request_cache().data.pop(key, None)
+
+    @property
+    def is_disabled(self):
+        """
+        Whether the user's account was disabled.
+        """
+        return self.account_status == UserStanding.ACCOUNT_DISABLED
+
+    def get_course_tags(self, course_key):
+        """
+        Return the user's tags in a course, as a dict.
+        """
+        return dict(self.course_tags.get(unicode(course_key), {}))
+
+
+@receiver(post_save, sender=User)
+@receiver(post_save, sender=UserStanding)
+@receiver(post_save, sender=UserProfile)
+@receiver(post_save, sender=UserPreference)
+@receiver(post_save, sender=UserCourseTag)
+@receiver(post_delete, sender=UserStanding)
+@receiver(post_delete, sender=UserProfile)
+@receiver(post_delete, sender=UserPreference)
+@receiver(post_delete, sender=UserCourseTag)
+def invalidate_user_request_context(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Invalidate the request context of the user whose data changed.
+    """
+    user_id = instance.id if sender is User else instance.user_id
+    UserRequestContext.invalidate(user_id)
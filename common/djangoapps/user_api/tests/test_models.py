@@ -1,8 +1,11 @@
 from django.db import IntegrityError
 from django.test import TestCase
-from student.tests.factories import UserFactory
-from user_api.tests.factories import UserPreferenceFactory
-from user_api.models import UserPreference
+from request_cache.middleware import RequestCache
+from student.models import UserStanding
+from student.tests.factories import UserFactory, UserStandingFactory
+from user_api.tests.factories import UserPreferenceFactory, UserCourseTagFactory
+from user_api.models import UserPreference, UserRequestContext
+from opaque_keys.edx.locations import SlashSeparatedCourseKey
 
 
 class UserPreferenceModelTest(TestCase):
@@ -45,3 +48,56 @@ class UserPreferenceModelTest(TestCase):
         # get preference for key that doesn't exist for user
         pref = UserPreference.get_preference(user, 'testkey_none')
         self.assertIsNone(pref)
+
+
+class UserRequestContextTest(TestCase):
+    def setUp(self):
+        self.user = UserFactory.create()
+        self.course_key = SlashSeparatedCourseKey('org', 'course', 'run')
+
+    def test_load(self):
+        UserStandingFactory.create(
+            user=self.user, account_status=UserStanding.ACCOUNT_DISABLED, changed_by=self.user
+        )
+        UserPreference.set_preference(self.user, 'pref-lang', 'eo')
+        UserCourseTagFactory.create(user=self.user, course_id=self.course_key, key='group', value='a')
+        profile = self.user.profile
+        profile.country = 'us'
+        profile.save()
+
+        context = UserRequestContext.get(self.user)
+        self.assertTrue(context.is_disabled)
+        self.assertEqual(context.profile_country, 'US')
+        self.assertEqual(context.preferences, {'pref-lang': 'eo'})
+        self.assertEqual(context.get_course_tags(self.course_key), {'group': 'a'})
+        self.assertEqual(context.get_course_tags(SlashSeparatedCourseKey('other', 'course', 'run')), {})
+
+    def test_defaults(self):
+        context = UserRequestContext.get(self.user)
+        self.assertFalse(context.is_disabled)
+        self.assertEqual(context.profile_country, '')
+        self.assertEqual(context.preferences, {})
+
+    def test_cached(self):
+        UserRequestContext.get(self.user)
+        with self.assertNumQueries(0):
+            UserRequestContext.get(self.user)
+        # Also across requests.
+        RequestCache().clear_request_cache()
+        with self.assertNumQueries(0):
+            UserRequestContext.get(self.user)
+
+    def test_invalidated_on_change(self):
+        self.assertEqual(UserRequestContext.get(self.user).preferences, {})
+        UserPreference.set_preference(self.user, 'pref-lang', 'eo')
+        self.assertEqual(UserRequestContext.get(self.user).preferences, {'pref-lang': 'eo'})
+
+        UserCourseTagFactory.create(user=self.user, course_id=self.course_key, key='group', value='a')
+        self.assertEqual(UserRequestContext.get(self.user).get_course_tags(self.course_key), {'group': 'a'})
+
+        standing = UserStandingFactory.create(
+            user=self.user, account_status=UserStanding.ACCOUNT_DISABLED, changed_by=self.user
+        )
+        self.assertTrue(UserRequestContext.get(self.user).is_disabled)
+        standing.delete()
+        self.assertFalse(UserRequestContext.get(self.user).is_disabled)
@@ -1,5 +1,8 @@
 import re
 from django.conf import settings
+from django.core.cache import cache
+
+from capa.safe_exec import result_cache
 
 # We'll make assets named this be importable by Python code in the sandbox.
 PYTHON_LIB_ZIP = "python_lib.zip"
@@ -30,6 +33,14 @@ def can_execute_unsafe_code(course_id):
     return False
 
 
+def invalidate_safe_exec_results(course_id):
+    """
+    Forget the cached results of the course's sandboxed code, e.g. after
+    publishing a problem.
+    """
+    result_cache.invalidate(cache, unicode(course_id))
+
+
 def get_python_lib_zip(contentstore, course_id):
     """Return the bytes of the python_lib.zip file, if any."""
     asset_key = course_id.make_asset_key("asset", PYTHON_LIB_ZIP)
@@ -73,6 +73,10 @@ SUFFIXES = {
 }
 
 
+# Maximum number of parsed expressions kept by `ParseAugmenter.parse_algebra`.
+PARSE_CACHE_SIZE = 1000
+
+
 class UndefinedVariable(Exception):
     """
     Indicate when a student inputs a variable which was not expected.
@@ -216,6 +220,124 @@ def add_defaults(variables, functions, case_sensitive):
     return (all_variables, all_functions)
 
 
+def vector_parallel(values):
+    """
+    Like `eval_parallel`, but for numbers and arrays which broadcast together.
+
+    Return NaN wherever there is a zero among the inputs.
+    """
+    reciprocals = [1. / numpy.where(value == 0, numpy.nan, value) for value in values]
+    return 1. / sum(reciprocals)
+
+
+def compile_actions(all_variables, all_functions, casify):
+    """
+    Return the `reduce_tree` actions which compile a parse tree.
+
+    Each node is turned into a function of an environment, a dict from
+    (casified) variable name to value. Values can be numbers or NumPy arrays
+    of the same shape, in which case the expression is evaluated for all the
+    elements in one go.
+    """
+    def compile_number(parse_result):
+        """
+        Numbers are constant.
+        """
+        value = eval_number(parse_result)
+        return lambda env: value
+
+    def compile_variable(parse_result):
+        """
+        Look variables up in the environment, falling back to `all_variables`.
+        """
+        name = casify(parse_result[0])
+        default = all_variables[name]
+        return lambda env: env.get(name, default)
+
+    def compile_function(parse_result):
+        """
+        Apply the function to the compiled argument.
+        """
+        func = all_functions[casify(parse_result[0])]
+        argument = parse_result[1]
+        return lambda env: func(argument(env))
+
+    def compile_atom(parse_result):
+        """
+        Return the compiled value wrapped by the atom, ignoring parenthesis.
+        """
+        return next(k for k in parse_result if callable(k))
+
+    def compile_power(parse_result):
+        """
+        Exponentiate, right to left.
+        """
+        terms = [k for k in parse_result if callable(k)]
+        if len(terms) == 1:
+            return terms[0]
+        return lambda env: reduce(lambda a, b: b ** a, [term(env) for term in reversed(terms)])
+
+    def compile_parallel(parse_result):
+        """
+        Combine the compiled terms with the parallel resistors operator.
+        """
+        terms = [k for k in parse_result if callable(k)]
+        if len(terms) == 1:
+            return terms[0]
+        return lambda env: vector_parallel([term(env) for term in terms])
+
+    def compile_operations(initial, operations):
+        """
+        Return a compiler for a chain of binary `operations` on terms, e.g.
+        sums and products.
+        """
+        def compile_chain(parse_result):
+            """
+            Pair each compiled term with the operator preceding it.
+            """
+            chain = []
+            current_op = operations[None]
+            for token in parse_result:
+                if callable(token):
+                    chain.append((current_op, token))
+                else:
+                    current_op = operations[token]
+            if len(chain) == 1 and chain[0][0] is operations[None]:
+                return chain[0][1]
+
+            def evaluate(env):
+                """
+                Reduce the chain from left to right.
+                """
+                total = initial
+                for operation, term in chain:
+                    total = operation(total, term(env))
+                return total
+            return evaluate
+        return compile_chain
+
+    return {
+        'number': compile_number,
+        'variable': compile_variable,
+        'function': compile_function,
+        'atom': compile_atom,
+        'power': compile_power,
+        'parallel': compile_parallel,
+        'product': compile_operations(1.0, {None: operator.mul, '*': operator.mul, '/': operator.truediv}),
+        'sum': compile_operations(0.0, {None: operator.add, '+': operator.add, '-': operator.sub}),
+    }
+
+
+def _casifier(case_sensitive):
+    """
+    Return the function normalizing names for the given case sensitivity.
+    """
+    if case_sensitive:
+        return lambda x: x
+    else:
+        return lambda x: x.lower()  # Lowercase for case insens.
+
+
 def evaluator(variables, functions, math_expr, case_sensitive=False):
     """
     Evaluate an expression; that is, take a string of math and return a float.
@@ -239,10 +361,7 @@ def evaluator(variables, functions, math_expr, case_sensitive=False):
     math_interpreter.check_variables(all_variables, all_functions)
 
     # Create a recursion to evaluate the tree.
-    if case_sensitive:
-        casify = lambda x: x
-    else:
-        casify = lambda x: x.lower()  # Lowercase for case insens.
+    casify = _casifier(case_sensitive)
 
     evaluate_actions = {
         'number': eval_number,
@@ -258,6 +377,116 @@ def evaluator(variables, functions, math_expr, case_sensitive=False):
     return math_interpreter.reduce_tree(evaluate_actions)
 
 
+def evaluate_samples(variables_list, functions, math_expr, case_sensitive=False):
+    """
+    Evaluate an expression for each dict of variables in `variables_list`.
+
+    Return the same list as calling `evaluator` for every dict would, and
+    raise the same errors. The expression is parsed and compiled once, and
+    all the samples are evaluated together as NumPy arrays; if that fails in
+    any way (e.g. a division by zero, or a function which does not accept
+    arrays), fall back to evaluating each sample on its own.
+    """
+    num_samples = len(variables_list)
+    if math_expr.strip() == "" or num_samples == 0:
+        return [evaluator(variables, functions, math_expr, case_sensitive) for variables in variables_list]
+
+    sample_names = set(variables_list[0])
+    if any(set(variables) != sample_names for variables in variables_list):
+        return [evaluator(variables, functions, math_expr, case_sensitive) for variables in variables_list]
+
+    math_interpreter = ParseAugmenter(math_expr, case_sensitive)
+    math_interpreter.parse_algebra()
+
+    all_variables, all_functions = add_defaults(variables_list[0], functions, case_sensitive)
+    math_interpreter.check_variables(all_variables, all_functions)
+
+    casify = _casifier(case_sensitive)
+    env = {
+        casify(name): numpy.array([variables[name] for variables in variables_list])
+        for name in sample_names
+    }
+
+    try:
+        compiled = math_interpreter.reduce_tree(compile_actions(all_variables, all_functions, casify))
+        with numpy.errstate(divide='raise', over='raise', invalid='raise'):
+            result = compiled(env)
+        if numpy.ndim(result) == 0:
+            return [result] * num_samples
+        if numpy.shape(result) == (num_samples,):
+            return list(result)
+    except Exception:  # pylint: disable=broad-except
+        pass
+    return [evaluator(variables, functions, math_expr, case_sensitive) for variables in variables_list]
+
+
+def build_grammar():
+    """
+    Build the pyparsing grammar for algebraic expressions.
+
+    Return a parser for a whole expression string, whose result has proper
+    groupings to reflect parenthesis and order of operations. All operators
+    are left in the tree and strings of numbers are not parsed into their
+    float versions.
+    """
+    # 0.33 or 7 or .34 or 16.
+    number_part = Word(nums)
+    inner_number = (number_part + Optional("." + Optional(number_part))) | ("." + number_part)
+    # pyparsing allows spaces between tokens--`Combine` prevents that.
+    inner_number = Combine(inner_number)
+
+    # SI suffixes and percent.
+    number_suffix = MatchFirst(Literal(k) for k in SUFFIXES.keys())
+
+    # 0.33k or 17
+    plus_minus = Literal('+') | Literal('-')
+    number = Group(
+        Optional(plus_minus) +
+        inner_number +
+        Optional(CaselessLiteral("E") + Optional(plus_minus) + number_part) +
+        Optional(number_suffix)
+    )
+    number = number("number")
+
+    # Predefine recursive variables.
+    expr = Forward()
+
+    # Handle variables passed in. They must start with letters/underscores
+    # and may contain numbers afterward.
+    inner_varname = Word(alphas + "_", alphanums + "_")
+    varname = Group(inner_varname)("variable")
+
+    # Same thing for functions.
+    function = Group(inner_varname + Suppress("(") + expr + Suppress(")"))("function")
+
+    atom = number | function | varname | "(" + expr + ")"
+    atom = Group(atom)("atom")
+
+    # Do the following in the correct order to preserve order of operation.
+    pow_term = atom + ZeroOrMore("^" + atom)
+    pow_term = Group(pow_term)("power")
+
+    par_term = pow_term + ZeroOrMore('||' + pow_term)  # 5k || 4k
+    par_term = Group(par_term)("parallel")
+
+    prod_term = par_term + ZeroOrMore((Literal('*') | Literal('/')) + par_term)  # 7 * 5 / 4
+    prod_term = Group(prod_term)("product")
+
+    sum_term = Optional(plus_minus) + prod_term + ZeroOrMore(plus_minus + prod_term)  # -5 + 4 - 3
+    sum_term = Group(sum_term)("sum")
+
+    # Finish the recursion.
+    expr << sum_term  # pylint: disable=W0104
+    return expr + stringEnd
+
+
+# The grammar is only built once, on first use. See `ParseAugmenter.parse_algebra`.
+_GRAMMAR = []
+
+# Map from (math_expr, case_sensitive) to (tree, variables_used, functions_used).
+_PARSE_CACHE = {}
+
+
 class ParseAugmenter(object):
     """
     Holds the data for a particular parse.
@@ -278,23 +507,6 @@ class ParseAugmenter(object):
         self.variables_used = set()
         self.functions_used = set()
 
-        def vpa(tokens):
-            """
-            When a variable is recognized, store it in `variables_used`.
-            """
-            varname = tokens[0][0]
-            self.variables_used.add(varname)
-
-        def fpa(tokens):
-            """
-            When a function is recognized, store it in `functions_used`.
-            """
-            varname = tokens[0][0]
-            self.functions_used.add(varname)
-
-        self.variable_parse_action = vpa
-        self.function_parse_action = fpa
-
     def parse_algebra(self):
         """
         Parse an algebraic expression into a tree.
@@ -303,61 +515,46 @@ class ParseAugmenter(object):
         reflect parenthesis and order of operations. Leave all operators in the
         tree and do not parse any strings of numbers into their float versions.
 
+        Parsed trees are cached by `(math_expr, case_sensitive)` and shared
+        between instances, so they must not be modified.
+
         Adding the groups and result names makes the `repr()` of the result
         really gross. For debugging, use something like
           print OBJ.tree.asXML()
         """
-        # 0.33 or 7 or .34 or 16.
-        number_part = Word(nums)
-        inner_number = (number_part + Optional("." + Optional(number_part))) | ("." + number_part)
-        # pyparsing allows spaces between tokens--`Combine` prevents that.
-        inner_number = Combine(inner_number)
-
-        # SI suffixes and percent.
-        number_suffix = MatchFirst(Literal(k) for k in SUFFIXES.keys())
-
-        # 0.33k or 17
-        plus_minus = Literal('+') | Literal('-')
-        number = Group(
-            Optional(plus_minus) +
-            inner_number +
-            Optional(CaselessLiteral("E") + Optional(plus_minus) + number_part) +
-            Optional(number_suffix)
-        )
-        number = number("number")
-
-        # Predefine recursive variables.
-        expr = Forward()
-
-        # Handle variables passed in. They must start with letters/underscores
-        # and may contain numbers afterward.
-        inner_varname = Word(alphas + "_", alphanums + "_")
-        varname = Group(inner_varname)("variable")
-        varname.setParseAction(self.variable_parse_action)
-
-        # Same thing for functions.
-        function = Group(inner_varname + Suppress("(") + expr + Suppress(")"))("function")
-        function.setParseAction(self.function_parse_action)
-
-        atom = number | function | varname | "(" + expr + ")"
-        atom = Group(atom)("atom")
-
-        # Do the following in the correct order to preserve order of operation.
-        pow_term = atom + ZeroOrMore("^" + atom)
-        pow_term = Group(pow_term)("power")
-
-        par_term = pow_term + ZeroOrMore('||' + pow_term)  # 5k || 4k
-        par_term = Group(par_term)("parallel")
-
-        prod_term = par_term + ZeroOrMore((Literal('*') | Literal('/')) + par_term)  # 7 * 5 / 4
-        prod_term = Group(prod_term)("product")
-
-        sum_term = Optional(plus_minus) + prod_term + ZeroOrMore(plus_minus + prod_term)  # -5 + 4 - 3
-        sum_term = Group(sum_term)("sum")
-
-        # Finish the recursion.
-        expr << sum_term  # pylint: disable=W0104
-        self.tree = (expr + stringEnd).parseString(self.math_expr)[0]
+        cache_key = (self.math_expr, self.case_sensitive)
+        cached = _PARSE_CACHE.get(cache_key)
+        if cached is None:
+            if not _GRAMMAR:
+                _GRAMMAR.append(build_grammar())
+            self.tree = _GRAMMAR[0].parseString(self.math_expr)[0]
+            self.variables_used = set()
+            self.functions_used = set()
+            self._collect_names(self.tree)
+
+            if len(_PARSE_CACHE) >= PARSE_CACHE_SIZE:
+                _PARSE_CACHE.clear()
+            _PARSE_CACHE[cache_key] = (self.tree, frozenset(self.variables_used), frozenset(self.functions_used))
+        else:
+            tree, variables_used, functions_used = cached
+            self.tree = tree
+            self.variables_used = set(variables_used)
+            self.functions_used = set(functions_used)
+
+    def _collect_names(self, node):
+        """
+        Store the names of the variables and functions under `node` in
+        `variables_used` and `functions_used`.
+        """
+        if not isinstance(node, ParseResults):
+            return
+        node_name = node.getName()
+        if node_name == 'variable':
+            self.variables_used.add(node[0])
+        elif node_name == 'function':
+            self.functions_used.add(node[0])
+        for child in node:
+            self._collect_names(child)
 
     def reduce_tree(self, handle_actions, terminal_converter=None):
         """
@@ -403,10 +600,7 @@ class ParseAugmenter(object):
 
         Otherwise, raise an UndefinedVariable containing all bad variables.
         """
-        if self.case_sensitive:
-            casify = lambda x: x
-        else:
-            casify = lambda x: x.lower()  # Lowercase for case insens.
+        casify = _casifier(self.case_sensitive)
 
         # Test if casify(X) is valid, but return the actual bad input (i.e. X)
         bad_vars = set(var for var in self.variables_used
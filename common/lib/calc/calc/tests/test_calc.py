@@ -558,3 +558,73 @@ class EvaluatorTest(unittest.TestCase):
             calc.evaluator({'r1': 5}, {}, "r1+r2")
         with self.assertRaisesRegexp(calc.UndefinedVariable, 'r1 r3'):
             calc.evaluator(variables, {}, "r1*r3", case_sensitive=True)
+
+    def test_parse_cache(self):
+        """
+        Parsing the same expression twice should reuse the parse tree, but
+        still report the variables and functions used.
+        """
+        first = calc.ParseAugmenter('sin(x) + 2*y', case_sensitive=True)
+        first.parse_algebra()
+        second = calc.ParseAugmenter('sin(x) + 2*y', case_sensitive=True)
+        second.parse_algebra()
+
+        self.assertIs(first.tree, second.tree)
+        self.assertEqual(second.variables_used, set(['x', 'y']))
+        self.assertEqual(second.functions_used, set(['sin']))
+
+
+class EvaluateSamplesTest(unittest.TestCase):
+    """
+    Check that `calc.evaluate_samples` agrees with calling `calc.evaluator`
+    for every sample.
+    """
+    def assert_agrees(self, math_expr, variables_list, functions=None, case_sensitive=False):
+        """
+        Compare the vectorized results with the one-by-one results.
+        """
+        functions = functions or {}
+        expected = [
+            calc.evaluator(variables, functions, math_expr, case_sensitive)
+            for variables in variables_list
+        ]
+        result = calc.evaluate_samples(variables_list, functions, math_expr, case_sensitive)
+        self.assertEqual(len(result), len(expected))
+        for value, expected_value in zip(result, expected):
+            if numpy.isnan(expected_value):
+                self.assertTrue(numpy.isnan(value))
+            else:
+                self.assertAlmostEqual(value, expected_value)
+
+    def test_expressions(self):
+        samples = [{'x': 1.5, 'y': 2.0}, {'x': -3.0, 'y': 0.25}, {'x': 10.0, 'y': 7.0}]
+        self.assert_agrees('x + y', samples)
+        self.assert_agrees('-y^x^2', samples)
+        self.assert_agrees('x * y / 2 - 3', samples)
+        self.assert_agrees('x || y', samples)
+        self.assert_agrees('sin(x) * sec(y) + sqrt(y)', samples)
+        self.assert_agrees('X*Y + 5k', samples)
+        self.assert_agrees('(x + i)^2', samples)
+        self.assert_agrees('pi', samples)
+
+    def test_parallel_with_zero(self):
+        self.assert_agrees('x || 1', [{'x': 0.0}, {'x': 1.0}])
+
+    def test_fallback(self):
+        """
+        Errors and functions which do not take arrays should behave like they
+        do in `calc.evaluator`.
+        """
+        self.assert_agrees('fact(x)', [{'x': 3.0}, {'x': 4.0}])
+        self.assert_agrees('f(x)', [{'x': 3.0}, {'x': 4.0}], functions={'f': lambda x: float(x) + 1})
+        with self.assertRaises(ZeroDivisionError):
+            calc.evaluate_samples([{'x': 1.0}, {'x': 0.0}], {}, '1/x')
+        with self.assertRaises(ValueError):
+            calc.evaluate_samples([{'x': 2.0}, {'x': 2.5}], {}, 'fact(x)')
+        with self.assertRaisesRegexp(calc.UndefinedVariable, 'z'):
+            calc.evaluate_samples([{'x': 1.0}], {}, 'x + z')
+
+    def test_empty(self):
+        result = calc.evaluate_samples([{'x': 1.0}, {'x': 2.0}], {}, '  ')
+        self.assertEqual(len(result), 2)
+        self.assertTrue(all(numpy.isnan(value) for value in result))
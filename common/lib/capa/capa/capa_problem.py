@@ -13,6 +13,7 @@ Main module which shows problems (of "capa" type).
 This is used by capa_module.
 """
 
+from collections import OrderedDict
 from copy import deepcopy
 from datetime import datetime
 import logging
@@ -58,6 +59,112 @@ html_problem_semantics = [
 
 log = logging.getLogger(__name__)
 
+# Maximum number of parsed problems kept by `get_problem_template`.
+PROBLEM_TEMPLATE_CACHE_SIZE = 500
+
+# Map from (problem_id, problem_text) to ProblemTemplate, in LRU order.
+_problem_templates = OrderedDict()
+
+
+def _assign_response_ids(tree, problem_id):
+    """
+    Assign IDs to all the responses in `tree`, and sub-IDs to all their
+    entries (textline, schematic, etc.)
+
+    Return a list of `(response, inputfields)` pairs, in document order.
+    """
+    responses = []
+    response_id = 1
+    for response in tree.xpath('//' + "|//".join(responsetypes.registry.registered_tags())):
+        response_id_str = problem_id + "_" + str(response_id)
+        # create and save ID for this response
+        response.set('id', response_id_str)
+        response_id += 1
+
+        answer_id = 1
+        input_tags = inputtypes.registry.registered_tags()
+        inputfields = tree.xpath(
+            "|".join(['//' + response.tag + '[@id=$id]//' + x for x in (input_tags + solution_tags)]),
+            id=response_id_str
+        )
+
+        # assign one answer_id for each input type or solution type
+        for entry in inputfields:
+            entry.attrib['response_id'] = str(response_id)
+            entry.attrib['answer_id'] = str(answer_id)
+            entry.attrib['id'] = "%s_%i_%i" % (problem_id, response_id, answer_id)
+            answer_id = answer_id + 1
+
+        responses.append((response, inputfields))
+    return responses
+
+
+class ProblemTemplate(object):
+    """
+    The seed-independent part of building a LoncapaProblem: the problem XML
+    parsed into a tree, with IDs assigned to its responses and their inputs.
+
+    The tree is never modified; `instantiate` returns a copy of it for each
+    LoncapaProblem. Problems with `<include>`s depend on the filestore of
+    the problem, so their includes and IDs are handled per problem instead.
+    """
+    def __init__(self, problem_text, problem_id):
+        # Convert startouttext and endouttext to proper <text></text>
+        problem_text = re.sub(r"startouttext\s*/", "text", problem_text)
+        problem_text = re.sub(r"endouttext\s*/", "/text", problem_text)
+        self.problem_text = problem_text
+
+        # parse problem XML file into an element tree
+        self.tree = etree.XML(problem_text)
+
+        self.has_includes = bool(self.tree.findall('.//include'))
+        self.response_indices = None
+        if not self.has_includes:
+            responses = _assign_response_ids(self.tree, problem_id)
+            # Elements are found again in copies of the tree by their
+            # position in document order.
+            positions = dict((element, index) for index, element in enumerate(self.tree.iter()))
+            self.response_indices = [
+                (positions[response], [positions[field] for field in inputfields])
+                for response, inputfields in responses
+            ]
+
+    def instantiate(self):
+        """
+        Return `(tree, responses)`: a copy of the parsed tree, and the list of
+        `(response, inputfields)` pairs in it, as from `_assign_response_ids`.
+
+        If the problem has includes, `responses` is None and the IDs are not
+        assigned yet.
+        """
+        tree = deepcopy(self.tree)
+        if self.response_indices is None:
+            return tree, None
+
+        elements = list(tree.iter())
+        responses = [
+            (elements[response_index], [elements[index] for index in field_indices])
+            for response_index, field_indices in self.response_indices
+        ]
+        return tree, responses
+
+
+def get_problem_template(problem_text, problem_id):
+    """
+    Return the ProblemTemplate for `problem_text`, parsing it only if it is
+    not in the in-process cache of recently used problems.
+    """
+    key = (problem_id, problem_text)
+    template = _problem_templates.pop(key, None)
+    if template is None:
+        template = ProblemTemplate(problem_text, problem_id)
+        if template.has_includes:
+            return template
+    _problem_templates[key] = template
+    while len(_problem_templates) > PROBLEM_TEMPLATE_CACHE_SIZE:
+        _problem_templates.popitem(last=False)
+    return template
+
 #-----------------------------------------------------------------------------
 # main class for this module
 
@@ -154,25 +261,25 @@ class LoncapaProblem(object):
         self.done = state.get('done', False)
         self.input_state = state.get('input_state', {})
 
-        # Convert startouttext and endouttext to proper <text></text>
-        problem_text = re.sub(r"startouttext\s*/", "text", problem_text)
-        problem_text = re.sub(r"endouttext\s*/", "/text", problem_text)
-        self.problem_text = problem_text
-
-        # parse problem XML file into an element tree
-        self.tree = etree.XML(problem_text)
+        # Parse the problem XML, reusing the work done for earlier instances of
+        # the same problem.
+        template = get_problem_template(problem_text, self.problem_id)
+        self.problem_text = template.problem_text
+        self.tree, responses = template.instantiate()
 
-        # handle any <include file="foo"> tags
-        self._process_includes()
+        if responses is None:
+            # handle any <include file="foo"> tags
+            self._process_includes()
+            responses = _assign_response_ids(self.tree, self.problem_id)
 
         # construct script processor context (eg for customresponse problems)
         self.context = self._extract_context(self.tree)
 
-        # Pre-parse the XML tree: modifies it to add ID's and perform some in-place
+        # Pre-parse the XML tree: modifies it to perform some in-place
         # transformations.  This also creates the dict (self.responders) of Response
         # instances for each question in the problem. The dict has keys = xml subtree of
         # Response, values = Response instance
-        self._preprocess_problem(self.tree)
+        self._preprocess_problem(self.tree, responses)
 
         if not self.student_answers:  # True when student_answers is an empty dict
             self.set_initial_display()
@@ -774,39 +881,20 @@ class LoncapaProblem(object):
 
         return tree
 
-    def _preprocess_problem(self, tree):  # private
+    def _preprocess_problem(self, tree, responses):  # private
         """
-        Assign IDs to all the responses
-        Assign sub-IDs to all entries (textline, schematic, etc.)
         Annoted correctness and value
         In-place transformation
 
+        `responses` is the list of `(response, inputfields)` pairs of the tree,
+        with IDs already assigned by `_assign_response_ids`.
+
         Also create capa Response instances for each responsetype and save as self.responders
 
         Obtain all responder answers and save as self.responder_answers dict (key = response)
         """
-        response_id = 1
         self.responders = {}
-        for response in tree.xpath('//' + "|//".join(responsetypes.registry.registered_tags())):
-            response_id_str = self.problem_id + "_" + str(response_id)
-            # create and save ID for this response
-            response.set('id', response_id_str)
-            response_id += 1
-
-            answer_id = 1
-            input_tags = inputtypes.registry.registered_tags()
-            inputfields = tree.xpath(
-                "|".join(['//' + response.tag + '[@id=$id]//' + x for x in (input_tags + solution_tags)]),
-                id=response_id_str
-            )
-
-            # assign one answer_id for each input type or solution type
-            for entry in inputfields:
-                entry.attrib['response_id'] = str(response_id)
-                entry.attrib['answer_id'] = str(answer_id)
-                entry.attrib['id'] = "%s_%i_%i" % (self.problem_id, response_id, answer_id)
-                answer_id = answer_id + 1
-
+        for response, inputfields in responses:
             # instantiate capa Response
             responsetype_cls = responsetypes.registry.get_class_for_tag(response.tag)
             responder = responsetype_cls(response, inputfields, self.context, self.capa_system)
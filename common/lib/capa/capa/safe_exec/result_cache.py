@@ -0,0 +1,184 @@
+"""
+A two-tier cache for safe_exec results.
+
+safe_exec can be given any object with `get(key)` and `set(key, value)`
+methods as its `cache`. `SafeExecResultCache` is such an object, which keeps
+results in a bounded in-process LRU in front of a shared cache (e.g. a Django
+cache). Values are kept as compressed JSON in both tiers, and results too
+big are not cached at all.
+
+Results are namespaced, usually by course, and a whole namespace can be
+invalidated with `invalidate`, e.g. when a problem is published or the
+course's python_lib.zip changes.
+"""
+
+from collections import OrderedDict
+import json
+import threading
+import time
+import uuid
+import zlib
+
+from dogapi import dog_stats_api
+
+# How many results are kept in each process.
+LOCAL_CACHE_SIZE = 1000
+
+# Results bigger than this, compressed, are not cached.
+MAX_VALUE_SIZE = 500 * 1024
+
+# How long, in seconds, the shared cache keeps namespace generations. Losing
+# one only invalidates the namespace.
+GENERATION_CACHE_TIMEOUT = 30 * 24 * 60 * 60
+
+# How long, in seconds, a process trusts its copy of a namespace's generation.
+# This bounds how long `invalidate` takes to reach other processes.
+GENERATION_TIMEOUT = 60
+
+METRIC_NAME = 'capa.safe_exec.cache'
+
+
+class _LocalCache(object):
+    """
+    The in-process tier: compressed results and namespace generations.
+
+    Results are kept compressed so that each hit decodes fresh objects, which
+    the caller is free to modify.
+    """
+    def __init__(self, size):
+        self.size = size
+        self.results = OrderedDict()
+        self.generations = {}
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        """
+        Return the result for `key`, marking it as recently used, or None.
+        """
+        with self.lock:
+            value = self.results.pop(key, None)
+            if value is not None:
+                self.results[key] = value
+            return value
+
+    def set(self, key, value):
+        """
+        Store a result, evicting the least recently used ones if needed.
+        """
+        with self.lock:
+            self.results.pop(key, None)
+            self.results[key] = value
+            while len(self.results) > self.size:
+                self.results.popitem(last=False)
+
+    def clear(self):
+        """
+        Forget everything.
+        """
+        with self.lock:
+            self.results.clear()
+            self.generations.clear()
+
+
+_local = _LocalCache(LOCAL_CACHE_SIZE)
+
+
+def _generation_key(namespace):
+    """
+    Shared cache key holding the generation of `namespace`.
+    """
+    return "safe_exec.generation.{}".format(namespace)
+
+
+def invalidate(shared_cache, namespace):
+    """
+    Make all the results cached in `namespace` unreachable.
+    """
+    generation = uuid.uuid4().hex
+    shared_cache.set(_generation_key(namespace), generation, GENERATION_CACHE_TIMEOUT)
+    _local.generations[namespace] = (generation, time.time() + GENERATION_TIMEOUT)
+
+
+def compress(value):
+    """
+    Encode a safe_exec result for the shared cache.
+    """
+    return zlib.compress(json.dumps(value))
+
+
+def decompress(data):
+    """
+    Decode a safe_exec result from the shared cache.
+    """
+    emsg, cleaned_results = json.loads(zlib.decompress(data))
+    return emsg, cleaned_results
+
+
+class SafeExecResultCache(object):
+    """
+    The cache to pass to safe_exec: `shared_cache` behind an in-process LRU,
+    with all keys in `namespace`.
+    """
+    def __init__(self, shared_cache, namespace):
+        self.shared_cache = shared_cache
+        self.namespace = namespace
+
+    def _generation(self):
+        """
+        Return the current generation of our namespace.
+        """
+        generation, expires = _local.generations.get(self.namespace, (None, 0))
+        if expires < time.time():
+            key = _generation_key(self.namespace)
+            generation = self.shared_cache.get(key)
+            if generation is None:
+                generation = uuid.uuid4().hex
+                self.shared_cache.set(key, generation, GENERATION_CACHE_TIMEOUT)
+            _local.generations[self.namespace] = (generation, time.time() + GENERATION_TIMEOUT)
+        return generation
+
+    def _full_key(self, key):
+        """
+        The key of a result in both tiers. safe_exec keys are already hashed,
+        so this stays well below memcache's key length limit.
+        """
+        return "{}.{}".format(self._generation(), key)
+
+    def get(self, key):
+        """
+        Return the cached result for a safe_exec `key`, or None.
+        """
+        full_key = self._full_key(key)
+        data = _local.get(full_key)
+        if data is not None:
+            dog_stats_api.increment(METRIC_NAME, tags=['result:hit', 'tier:local'])
+            return decompress(data)
+
+        data = self.shared_cache.get(full_key)
+        if data is None:
+            dog_stats_api.increment(METRIC_NAME, tags=['result:miss'])
+            return None
+
+        _local.set(full_key, data)
+        dog_stats_api.increment(METRIC_NAME, tags=['result:hit', 'tier:shared'])
+        return decompress(data)
+
+    def set(self, key, value):
+        """
+        Cache the result of a safe_exec `key`.
+        """
+        data = compress(value)
+        dog_stats_api.histogram(METRIC_NAME + '.size', len(data))
+        if len(data) > MAX_VALUE_SIZE:
+            dog_stats_api.increment(METRIC_NAME, tags=['result:too_large'])
+            return
+
+        full_key = self._full_key(key)
+        _local.set(full_key, data)
+        self.shared_cache.set(full_key, data)
+
+    def invalidate(self):
+        """
+        Invalidate all the results in our namespace.
+        """
+        invalidate(self.shared_cache, self.namespace)
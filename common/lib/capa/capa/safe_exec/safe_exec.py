@@ -4,6 +4,7 @@ from codejail.safe_exec import safe_exec as codejail_safe_exec
 from codejail.safe_exec import not_safe_exec as codejail_not_safe_exec
 from codejail.safe_exec import json_safe, SafeExecException
 from . import lazymod
+from . import sandbox_pool
 from dogapi import dog_stats_api
 
 import hashlib
@@ -99,20 +100,32 @@ def safe_exec(
 
     `cache` is an object with .get(key) and .set(key, value) methods.  It will be used
     to cache the execution, taking into account the code, the values of the globals,
-    and the random seed.
+    the random seed and the extra files.  See `result_cache.SafeExecResultCache`.
 
     `slug` is an arbitrary string, a description that's meaningful to the
     caller, that will be used in log messages.
 
     If `unsafely` is true, then the code will actually be executed without sandboxing.
 
+    If a pool of sandbox workers is configured (see `sandbox_pool.configure`),
+    sandboxed code is run on one of its warm workers when possible.
+
     """
     # Check the cache for a previous result.
     if cache:
         safe_globals = json_safe(globals_dict)
+        # Every problem has the anonymous student id in its globals, but most
+        # code never uses it.  Leave it out of the key then, so that students
+        # with the same random seed share results.
+        shared_by_students = 'anonymous_student_id' not in code
+        if shared_by_students:
+            safe_globals.pop('anonymous_student_id', None)
         md5er = hashlib.md5()
         md5er.update(repr(code))
         update_hash(md5er, safe_globals)
+        for filename, contents in extra_files or ():
+            md5er.update(filename)
+            md5er.update(contents)
         key = "safe_exec.%r.%s" % (random_seed, md5er.hexdigest())
         cached = cache.get(key)
         if cached is not None:
@@ -130,6 +143,8 @@ def safe_exec(
     # Decide which code executor to use.
     if unsafely:
         exec_fn = codejail_not_safe_exec
+    elif sandbox_pool.can_execute(python_path, extra_files):
+        exec_fn = sandbox_pool.pool_safe_exec
     else:
         exec_fn = codejail_safe_exec
 
@@ -148,6 +163,8 @@ def safe_exec(
     # the globals dict might not be entirely serializable.
     if cache:
         cleaned_results = json_safe(globals_dict)
+        if shared_by_students:
+            cleaned_results.pop('anonymous_student_id', None)
         cache.set(key, (emsg, cleaned_results))
 
     # If an exception happened, raise it now.
@@ -0,0 +1,331 @@
+"""
+A pool of warm sandbox workers for capa's safe_exec.
+
+Starting a sandboxed Python for every execution means importing NumPy, SymPy
+and the sandbox packages every time. Instead, each worker of the pool is a
+long-running sandboxed Python (started exactly like codejail starts one)
+which imports those modules once, and then forks a fresh child for every
+execution. The problem code only ever runs in the child, so executions are
+isolated from each other and nothing they do survives them. Workers are
+recycled after a configurable number of executions.
+
+Workers are started like codejail starts a sandboxed Python, with an empty
+environment. Each child runs with all of codejail's `LIMITS` (and no
+subprocesses), in a fresh temporary directory removed after the execution.
+
+The pool is off unless `configure` is called with a positive size. It only
+handles executions without `python_path` or `extra_files`; the others still
+go through codejail.
+"""
+
+import errno
+import json
+import logging
+import os
+import Queue
+import select
+import shutil
+import signal
+import subprocess
+import tempfile
+import threading
+import time
+
+from codejail import jail_code
+from codejail.safe_exec import SafeExecException, json_safe
+
+log = logging.getLogger(__name__)
+
+# Modules imported by each worker before it forks children.
+PRELOAD_MODULES = [
+    "numpy", "math", "scipy", "sympy", "calc", "eia",
+    "chem.chemcalc", "chem.chemtools", "chem.miller", "verifiers.draganddrop",
+]
+
+# The program run by each worker, in the sandboxed Python. It reads one JSON
+# request per line on stdin: [code, globals_dict, limits, tmpdir], and answers
+# with one JSON line: {"globals": ...} or {"error": ...}. The child runs in
+# tmpdir, which the worker empties afterwards.
+WORKER_CODE = r"""
+import json, os, resource, select, shutil, signal, sys, time, traceback
+
+for name in %(preload)r:
+    try:
+        __import__(name)
+    except Exception:
+        pass
+
+def json_safe(d):
+    ok_types = (type(None), int, long, float, str, unicode, list, tuple, dict)
+    jd = {}
+    for k, v in d.iteritems():
+        if not isinstance(v, ok_types) or k == "__builtins__":
+            continue
+        try:
+            json.dumps(v)
+        except Exception:
+            continue
+        jd[k] = v
+    return json.loads(json.dumps(jd))
+
+def set_process_limits(limits):
+    # The same limits as codejail's set_process_limits: no subprocesses,
+    # CPU seconds, total virtual memory and size of written files.
+    resource.setrlimit(resource.RLIMIT_NPROC, (0, 0))
+    if limits.get("CPU"):
+        resource.setrlimit(resource.RLIMIT_CPU, (limits["CPU"], limits["CPU"]))
+    if limits.get("VMEM"):
+        resource.setrlimit(resource.RLIMIT_AS, (limits["VMEM"], limits["VMEM"]))
+    fsize = limits.get("FSIZE", 0)
+    resource.setrlimit(resource.RLIMIT_FSIZE, (fsize, fsize))
+
+def run_child(code, globals_dict, limits, write_fd, tmpdir):
+    devnull = os.open(os.devnull, os.O_RDWR)
+    os.dup2(devnull, 0)
+    os.dup2(devnull, 1)
+    os.chdir(tmpdir)
+    os.environ["TMPDIR"] = tmpdir
+    set_process_limits(limits)
+    try:
+        exec code in globals_dict
+        result = {"globals": json_safe(globals_dict)}
+    except BaseException:
+        result = {"error": traceback.format_exc()}
+    os.write(write_fd, json.dumps(result))
+    os._exit(0)
+
+def execute(code, globals_dict, limits, tmpdir):
+    try:
+        return execute_in(code, globals_dict, limits, tmpdir)
+    finally:
+        for name in os.listdir(tmpdir):
+            path = os.path.join(tmpdir, name)
+            if os.path.isdir(path) and not os.path.islink(path):
+                shutil.rmtree(path, ignore_errors=True)
+            else:
+                os.remove(path)
+
+def execute_in(code, globals_dict, limits, tmpdir):
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read_fd)
+        run_child(code, globals_dict, limits, write_fd, tmpdir)
+    os.close(write_fd)
+    chunks = []
+    deadline = time.time() + (limits.get("REALTIME") or 1e9)
+    while True:
+        remaining = deadline - time.time()
+        ready = select.select([read_fd], [], [], max(remaining, 0))[0] if remaining > 0 else []
+        if not ready:
+            os.kill(pid, signal.SIGKILL)
+            os.waitpid(pid, 0)
+            os.close(read_fd)
+            return {"error": "Execution timed out"}
+        chunk = os.read(read_fd, 65536)
+        if not chunk:
+            break
+        chunks.append(chunk)
+    os.close(read_fd)
+    os.waitpid(pid, 0)
+    if not chunks:
+        return {"error": "Execution was killed"}
+    return json.loads("".join(chunks))
+
+while True:
+    line = sys.stdin.readline()
+    if not line:
+        break
+    code, globals_dict, limits, tmpdir = json.loads(line)
+    sys.stdout.write(json.dumps(execute(code, globals_dict, limits, tmpdir)) + "\n")
+    sys.stdout.flush()
+""" % {'preload': PRELOAD_MODULES}
+
+
+class SandboxWorker(object):
+    """
+    One warm sandboxed Python process, see `WORKER_CODE`.
+    """
+    def __init__(self):
+        command = jail_code.COMMANDS['python']
+        self.user = command.get('user')
+        cmdline = []
+        if self.user:
+            cmdline.extend(['sudo', '-u', self.user])
+        cmdline.extend(command['cmdline_start'])
+        cmdline.extend(['-E', '-B', '-c', WORKER_CODE])
+        # Like codejail, give the sandbox none of our environment. The worker
+        # gets its own process group, so that it can be killed with all its
+        # children whichever user it runs as.
+        self.process = subprocess.Popen(
+            cmdline, stdin=subprocess.PIPE, stdout=subprocess.PIPE, close_fds=True,
+            cwd='/', env={}, preexec_fn=os.setsid,
+        )
+        self.executions = 0
+
+    def execute(self, code, globals_dict, timeout):
+        """
+        Run `code` in a fresh child of the worker and return the result dict.
+
+        Raise `SandboxWorkerError` if the worker does not answer within
+        `timeout` seconds or has died.
+        """
+        self.executions += 1
+        # Like codejail, make the temporary directory here, where the sandbox
+        # can use it but not create it, and let the sandbox empty it.
+        tmpdir = tempfile.mkdtemp(prefix="codejail-")
+        try:
+            os.chmod(tmpdir, 0777)
+            request = json.dumps([code, json_safe(globals_dict), jail_code.LIMITS, tmpdir])
+            try:
+                self.process.stdin.write(request + "\n")
+                self.process.stdin.flush()
+            except IOError:
+                raise SandboxWorkerError("Sandbox worker died")
+
+            ready = select.select([self.process.stdout], [], [], timeout)[0]
+            if not ready:
+                raise SandboxWorkerError("Sandbox worker timed out")
+            line = self.process.stdout.readline()
+            if not line:
+                raise SandboxWorkerError("Sandbox worker died")
+            return json.loads(line)
+        finally:
+            shutil.rmtree(tmpdir, ignore_errors=True)
+
+    def stop(self):
+        """
+        Kill the worker process and its children.
+
+        The worker runs as the sandbox user under sudo, which we can't signal,
+        so like codejail we kill its process group with `sudo pkill`.
+        """
+        pgid = self.process.pid  # the worker leads its process group, see __init__
+        killed = True
+        try:
+            if self.user:
+                status = subprocess.call(['sudo', 'pkill', '-9', '-g', str(pgid)])
+                # pkill exits with 1 when there was nothing left to kill
+                if status not in (0, 1):
+                    log.error("Couldn't kill sandbox worker group %d: pkill exited with %d", pgid, status)
+                    killed = False
+            else:
+                os.killpg(pgid, signal.SIGKILL)
+        except OSError as error:
+            if error.errno != errno.ESRCH:
+                log.error("Couldn't kill sandbox worker group %d: %s", pgid, error)
+                killed = False
+        self.process.stdin.close()
+        self.process.stdout.close()
+        if killed:
+            self.process.wait()
+
+
+class SandboxWorkerError(Exception):
+    """
+    A sandbox worker stopped working and has to be replaced.
+    """
+    pass
+
+
+class SandboxPool(object):
+    """
+    A fixed size pool of `SandboxWorker`s.
+
+    Workers are started lazily in each process using the pool, so that the
+    pool can be configured before web server processes are forked.
+    """
+    def __init__(self, size, max_executions=100, timeout=10):
+        self.size = size
+        self.max_executions = max_executions
+        self.timeout = timeout
+        self._pid = None
+        self._idle = None
+        self._lock = threading.Lock()
+
+    def _workers(self):
+        """
+        Return the queue of idle workers for this process, filling it first
+        if needed.
+        """
+        with self._lock:
+            if self._pid != os.getpid():
+                self._pid = os.getpid()
+                self._idle = Queue.Queue()
+                for _ in xrange(self.size):
+                    self._idle.put(None)
+        return self._idle
+
+    def close(self):
+        """
+        Stop the idle workers of this process.
+        """
+        if self._idle is None or self._pid != os.getpid():
+            return
+        while True:
+            try:
+                worker = self._idle.get_nowait()
+            except Queue.Empty:
+                break
+            if worker is not None:
+                worker.stop()
+
+    def execute(self, code, globals_dict, slug=None):
+        """
+        Execute `code` on a warm worker, updating `globals_dict` like
+        `codejail.safe_exec.safe_exec` does.
+        """
+        idle = self._workers()
+        worker = idle.get()
+        try:
+            if worker is None:
+                worker = SandboxWorker()
+            start = time.time()
+            result = worker.execute(code, globals_dict, self.timeout)
+            log.debug("Executed jailed code %s in %.3fs on a pooled worker", slug, time.time() - start)
+        except Exception as error:
+            if worker is not None:
+                worker.stop()
+            idle.put(None)
+            log.warning("Sandbox worker failed for %s: %s", slug, error)
+            raise SafeExecException("Couldn't execute jailed code: {}".format(error))
+
+        if worker.executions >= self.max_executions:
+            worker.stop()
+            worker = None
+        idle.put(worker)
+
+        if 'error' in result:
+            raise SafeExecException("Couldn't execute jailed code: {}".format(result['error']))
+        globals_dict.update(result['globals'])
+
+
+# The pool used by capa's safe_exec, if any.
+POOL = None
+
+
+def configure(size, max_executions=100, timeout=10):
+    """
+    Use a pool of `size` sandbox workers for safe_exec, each replaced after
+    `max_executions` executions. A worker which does not answer within
+    `timeout` seconds is killed. A size of 0 disables the pool.
+    """
+    global POOL  # pylint: disable=global-statement
+    if POOL is not None:
+        POOL.close()
+    POOL = SandboxPool(size, max_executions, timeout) if size > 0 else None
+
+
+def can_execute(python_path, extra_files):
+    """
+    Return whether the pool is on and can run code with these arguments.
+    """
+    return POOL is not None and jail_code.is_configured('python') and not python_path and not extra_files
+
+
+def pool_safe_exec(code, globals_dict, python_path=None, extra_files=None, slug=None):
+    """
+    Same as `codejail.safe_exec.safe_exec`, but on the pool. Only call this
+    if `can_execute` is true.
+    """
+    POOL.execute(code, globals_dict, slug=slug)
@@ -0,0 +1,53 @@
+"""
+Benchmark the overhead of sandboxed execution, with and without the pool of
+warm sandbox workers.
+
+Run with:
+
+    python -m capa.safe_exec.tests.benchmark_safe_exec <SANDBOX_PYTHON> [<SANDBOX_USER>]
+
+This is not a test module; it only prints timings.
+"""
+import sys
+import time
+
+from codejail import jail_code
+
+from capa.safe_exec import safe_exec, sandbox_pool
+
+# Typical problem code: uses the assumed imports and the seeded random.
+CODE = """\
+x = random.randint(1, 100)
+y = numpy.sqrt(x) + math.pi
+answer = "{:.3f}".format(y)
+"""
+
+
+def time_executions(count):
+    """
+    Return the average number of seconds per safe_exec call.
+    """
+    start = time.time()
+    for seed in xrange(count):
+        safe_exec(CODE, {}, random_seed=seed)
+    return (time.time() - start) / count
+
+
+def main(python_bin, user=None, count=50):
+    """
+    Time `count` executions in new sandboxes, then on a pool.
+    """
+    jail_code.configure('python', python_bin, user=user)
+
+    sandbox_pool.configure(0)
+    print "{:<24} {:>10.1f} ms/execution".format("codejail", time_executions(count) * 1000)
+
+    sandbox_pool.configure(1, max_executions=count * 2)
+    # Warm the worker up first, it is started on first use.
+    safe_exec(CODE, {}, random_seed=0)
+    print "{:<24} {:>10.1f} ms/execution".format("sandbox pool", time_executions(count) * 1000)
+    sandbox_pool.configure(0)
+
+
+if __name__ == '__main__':
+    main(*sys.argv[1:3])
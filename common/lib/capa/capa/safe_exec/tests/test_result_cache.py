@@ -0,0 +1,98 @@
+"""Test result_cache.py"""
+
+import unittest
+
+from capa.safe_exec import safe_exec, result_cache
+from capa.safe_exec.result_cache import SafeExecResultCache
+
+
+class SharedCache(object):
+    """A Django-like cache over a simple dict, for testing."""
+
+    def __init__(self):
+        self.cache = {}
+
+    def get(self, key):
+        # Actual cache implementations have limits on key length
+        assert len(key) <= 250
+        return self.cache.get(key)
+
+    def set(self, key, value, timeout=None):  # pylint: disable=unused-argument
+        assert len(key) <= 250
+        self.cache[key] = value
+
+
+class TestSafeExecResultCache(unittest.TestCase):
+    """Test the two-tier cache of safe_exec results."""
+
+    def setUp(self):
+        super(TestSafeExecResultCache, self).setUp()
+        result_cache._local.clear()  # pylint: disable=protected-access
+        self.addCleanup(result_cache._local.clear)  # pylint: disable=protected-access
+        self.shared = SharedCache()
+        self.cache = SafeExecResultCache(self.shared, 'course')
+
+    def test_miss_then_hit(self):
+        g = {}
+        safe_exec("a = int(math.pi)", g, cache=self.cache)
+        self.assertEqual(g['a'], 3)
+
+        # The shared cache holds compressed values.
+        data = [value for key, value in self.shared.cache.items() if 'generation' not in key]
+        self.assertEqual(len(data), 1)
+        self.assertEqual(result_cache.decompress(data[0]), (None, {'a': 3}))
+
+        # The second time comes from the cache.
+        self.shared.set = None
+        g = {}
+        safe_exec("a = int(math.pi)", g, cache=self.cache)
+        self.assertEqual(g['a'], 3)
+
+    def test_shared_tier(self):
+        self.cache.set('key', (None, {'a': [1, 2]}))
+        # Another process only has the shared cache.
+        result_cache._local.clear()  # pylint: disable=protected-access
+        self.assertEqual(self.cache.get('key'), (None, {'a': [1, 2]}))
+
+    def test_hits_are_copies(self):
+        self.cache.set('key', (None, {'a': [1, 2]}))
+        self.cache.get('key')[1]['a'].append(3)
+        self.assertEqual(self.cache.get('key'), (None, {'a': [1, 2]}))
+
+    def test_too_large(self):
+        self.cache.set('key', (None, {'a': 'x' * 100}))
+        original = result_cache.MAX_VALUE_SIZE
+        result_cache.MAX_VALUE_SIZE = 10
+        self.addCleanup(setattr, result_cache, 'MAX_VALUE_SIZE', original)
+        self.cache.set('other', (None, {'a': 'x' * 100}))
+        self.assertIsNotNone(self.cache.get('key'))
+        self.assertIsNone(self.cache.get('other'))
+
+    def test_invalidate(self):
+        other_course = SafeExecResultCache(self.shared, 'other')
+        self.cache.set('key', (None, {'a': 1}))
+        other_course.set('key', (None, {'a': 2}))
+
+        self.cache.invalidate()
+        self.assertIsNone(self.cache.get('key'))
+        self.assertEqual(other_course.get('key'), (None, {'a': 2}))
+
+    def test_anonymous_student_id_not_in_key(self):
+        g = {'anonymous_student_id': 'student1', 'seed': 3}
+        safe_exec("a = random.randint(0, 1000)", g, random_seed=3, cache=self.cache)
+
+        # A different student with the same seed gets the cached result, and
+        # keeps their own anonymous id.
+        g2 = {'anonymous_student_id': 'student2', 'seed': 3}
+        self.shared.set = None  # Would fail if the code ran again.
+        safe_exec("a = random.randint(0, 1000)", g2, random_seed=3, cache=self.cache)
+        self.assertEqual(g2['a'], g['a'])
+        self.assertEqual(g2['anonymous_student_id'], 'student2')
+
+    def test_anonymous_student_id_in_key_when_used(self):
+        code = "a = anonymous_student_id.upper()"
+        g = {'anonymous_student_id': 'student1'}
+        safe_exec(code, g, cache=self.cache)
+        g2 = {'anonymous_student_id': 'student2'}
+        safe_exec(code, g2, cache=self.cache)
+        self.assertEqual(g2['a'], 'STUDENT2')
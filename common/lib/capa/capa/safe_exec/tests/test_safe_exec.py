@@ -10,6 +10,7 @@ import unittest
 from nose.plugins.skip import SkipTest
 
 from capa.safe_exec import safe_exec, update_hash
+from capa.safe_exec import sandbox_pool
 from codejail.safe_exec import SafeExecException
 from codejail.jail_code import is_configured
 
@@ -90,6 +91,58 @@ class TestSafeOrNot(unittest.TestCase):
         self.assertEqual(g['files'], os.listdir('/'))
 
 
+class TestSandboxPool(unittest.TestCase):
+    """Test running safe_exec on a pool of warm sandbox workers."""
+
+    def setUp(self):
+        super(TestSandboxPool, self).setUp()
+        # The pool runs the CodeJail sandbox, so it needs it configured.
+        if not is_configured("python"):
+            raise SkipTest
+        sandbox_pool.configure(1, max_executions=2)
+        self.addCleanup(sandbox_pool.configure, 0)
+
+    def test_set_values(self):
+        g = {'b': 3}
+        safe_exec("a = b * random.randint(1, 1)", g, random_seed=17)
+        self.assertEqual(g['a'], 3)
+
+    def test_executions_are_isolated(self):
+        # Recycling happens after two executions, so all of these run on
+        # workers which have executed code before.
+        for _ in xrange(3):
+            g = {}
+            safe_exec("import math; seen = hasattr(math, 'leak'); math.leak = 1", g)
+            self.assertFalse(g['seen'])
+
+    def test_exceptions(self):
+        with self.assertRaises(SafeExecException) as cm:
+            safe_exec("1/0", {})
+        self.assertIn("ZeroDivisionError", cm.exception.message)
+
+    def test_cant_do_something_forbidden(self):
+        with self.assertRaises(SafeExecException) as cm:
+            safe_exec("import os; files = os.listdir('/')", {})
+        self.assertIn("Permission denied", cm.exception.message)
+
+    def test_cant_fork(self):
+        with self.assertRaises(SafeExecException) as cm:
+            safe_exec("import os; os.fork()", {})
+        self.assertIn("OSError", cm.exception.message)
+
+    def test_no_environment(self):
+        g = {}
+        safe_exec("import os; env = [name for name in os.environ if name != 'TMPDIR']", g)
+        self.assertEqual(g['env'], [])
+
+    def test_fresh_directory_per_execution(self):
+        for _ in xrange(2):
+            g = {}
+            safe_exec("import os; files = os.listdir('.'); os.mkdir('leftover'); cwd = os.getcwd()", g)
+            self.assertEqual(g['files'], [])
+            self.assertFalse(os.path.exists(g['cwd']))
+
+
 class DictCache(object):
     """A cache implementation over a simple dict, for testing."""
 
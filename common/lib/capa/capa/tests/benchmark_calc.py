@@ -0,0 +1,71 @@
+"""
+Benchmarks for the calc-backed response types and the formula preview.
+
+Run with:
+
+    python -m capa.tests.benchmark_calc [repeat]
+
+This is not a test module; it only prints timings, so that the cost of
+grading `NumericalResponse` and `FormulaResponse` problems and of rendering
+`calc.preview.latex_preview` can be compared before and after a change.
+"""
+import sys
+import timeit
+
+from calc.preview import latex_preview
+from capa.tests import new_loncapa_problem
+from capa.tests.response_xml_factory import FormulaResponseXMLFactory, NumericalResponseXMLFactory
+
+
+def numerical_response_grader():
+    """
+    Return a function grading a NumericalResponse problem.
+    """
+    xml = NumericalResponseXMLFactory().build_xml(answer="4*pi/3", tolerance="1%")
+    problem = new_loncapa_problem(xml)
+    return lambda: problem.grade_answers({'1_2_1': '4.18879'})
+
+
+def formula_response_grader(num_samples):
+    """
+    Return a function grading a FormulaResponse problem with `num_samples`.
+    """
+    xml = FormulaResponseXMLFactory().build_xml(
+        sample_dict={'x': (-10, 10), 'y': (1, 10)},
+        num_samples=num_samples,
+        tolerance=0.01,
+        answer="sin(x)^2 + cos(x)^2 + y^3/(x^2 + 1) || 2*y",
+    )
+    problem = new_loncapa_problem(xml)
+    return lambda: problem.grade_answers({'1_2_1': "1 + (y^3/(x^2+1))*2*y/(y^3/(x^2+1) + 2*y)"})
+
+
+def preview_renderer():
+    """
+    Return a function rendering the latex preview of a formula.
+    """
+    return lambda: latex_preview(
+        "sin(x)^2 + cos(x)^2 + y^3/(x^2 + 1) || 2*y", variables=['x', 'y']
+    )
+
+
+BENCHMARKS = [
+    ('NumericalResponse', numerical_response_grader),
+    ('FormulaResponse, 10 samples', lambda: formula_response_grader(10)),
+    ('FormulaResponse, 100 samples', lambda: formula_response_grader(100)),
+    ('calc.preview.latex_preview', preview_renderer),
+]
+
+
+def main(repeat=100):
+    """
+    Run every benchmark `repeat` times and print the time per call.
+    """
+    for name, make_benchmark in BENCHMARKS:
+        benchmark = make_benchmark()
+        seconds = min(timeit.repeat(benchmark, number=repeat, repeat=3))
+        print "{:<32} {:>10.3f} ms/call".format(name, seconds * 1000 / repeat)
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:2]])
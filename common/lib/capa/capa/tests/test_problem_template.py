@@ -0,0 +1,61 @@
+"""
+Tests for the cache of parsed problems used when building LoncapaProblems.
+"""
+import textwrap
+import unittest
+
+from capa import capa_problem
+from .response_xml_factory import StringResponseXMLFactory
+from . import new_loncapa_problem, test_capa_system
+
+
+class ProblemTemplateTest(unittest.TestCase):
+    """
+    Test that problems built from a cached ProblemTemplate behave like freshly
+    parsed ones.
+    """
+    def setUp(self):
+        super(ProblemTemplateTest, self).setUp()
+        capa_problem._problem_templates.clear()  # pylint: disable=protected-access
+        self.xml = StringResponseXMLFactory().build_xml(answer="Michigan", hints=[])
+
+    def test_template_is_reused(self):
+        first = new_loncapa_problem(self.xml)
+        second = new_loncapa_problem(self.xml)
+
+        template = capa_problem.get_problem_template(self.xml, '1')
+        self.assertEqual(len(capa_problem._problem_templates), 1)  # pylint: disable=protected-access
+
+        # Each problem gets its own copy of the tree.
+        self.assertIsNot(first.tree, second.tree)
+        self.assertIsNot(first.tree, template.tree)
+        self.assertEqual(first.get_html(), second.get_html())
+        self.assertEqual(first.get_answer_ids(), second.get_answer_ids())
+
+    def test_ids_assigned(self):
+        new_loncapa_problem(self.xml)
+        # This one is built from the cached template.
+        problem = new_loncapa_problem(self.xml)
+        response = problem.tree.find('.//stringresponse')
+        self.assertEqual(response.get('id'), '1_1')
+        self.assertEqual(response.find('textline').get('id'), '1_2_1')
+        self.assertIn(response, problem.responders)
+        self.assertEqual(
+            problem.grade_answers({'1_2_1': 'Michigan'}).get_correctness('1_2_1'),
+            'correct'
+        )
+
+    def test_problem_id_in_key(self):
+        new_loncapa_problem(self.xml)
+        problem = capa_problem.LoncapaProblem(self.xml, id='other', seed=1, capa_system=test_capa_system())
+        self.assertEqual(problem.tree.find('.//stringresponse').get('id'), 'other_1')
+
+    def test_includes_not_cached(self):
+        xml = textwrap.dedent("""
+            <problem>
+                <include file="missing.xml"/>
+            </problem>
+        """)
+        # The test capa system is in DEBUG mode, so the missing file is skipped.
+        new_loncapa_problem(xml)
+        self.assertEqual(len(capa_problem._problem_templates), 0)  # pylint: disable=protected-access
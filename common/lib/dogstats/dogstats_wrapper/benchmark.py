@@ -0,0 +1,42 @@
+"""
+Time the overhead of a metric call, sent straight to statsd by dog_stats_api,
+and through the metrics buffer.
+
+    $ python -m dogstats_wrapper.benchmark [calls] [distinct tags]
+
+Nothing needs to listen on the statsd port.
+"""
+import sys
+import time
+
+from dogapi.stats.dog_stats_api import DogStatsApi
+
+from .metrics_buffer import MetricsBuffer
+
+
+def run(calls=100000, distinct_tags=10):
+    """
+    Print the average time of an increment and a histogram call.
+    """
+    tags = [['course_id:course_{}'.format(index)] for index in xrange(distinct_tags)]
+
+    stats_api = DogStatsApi()
+    stats_api.start(statsd=True, flush_in_thread=False)
+    metrics_buffer = MetricsBuffer(flush_interval=10)
+
+    for name, target in [("dog_stats_api (statsd)", stats_api), ("metrics buffer", metrics_buffer)]:
+        for method in ('increment', 'histogram'):
+            call = getattr(target, method)
+            start = time.time()
+            for index in xrange(calls):
+                call('benchmark.metric', 1, tags=tags[index % distinct_tags])
+            elapsed = time.time() - start
+            print "{:<24} {:<10} {:>8.2f} us/call".format(name, method, elapsed / calls * 1e6)
+
+    start = time.time()
+    metrics_buffer.flush()
+    print "{:<24} {:<10} {:>8.2f} ms".format("metrics buffer", "flush", (time.time() - start) * 1e3)
+
+
+if __name__ == '__main__':
+    run(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,184 @@
+"""
+In-process buffer of the metrics sent to the statsd agent.
+
+dog_stats_api sends one UDP packet per metric call when it talks to statsd.
+Once started, the buffer takes over the calls of dogstats_wrapper, adds up
+the counters and samples the histograms over a flush interval, and sends them
+in as few packets as possible at the end of the interval.
+
+The buffer is flushed by the first metric call after the end of an interval
+(there is no flush thread), and when the process exits.
+"""
+import atexit
+from collections import defaultdict
+from contextlib import contextmanager
+import logging
+import random
+import socket
+import threading
+import time
+
+log = logging.getLogger(__name__)
+
+# Packets are kept small enough not to be fragmented on an ethernet network.
+MAX_PACKET_SIZE = 1432
+
+# How many values of a histogram (with the same tags) are sent per interval.
+# The others are sampled out, and the sample rate sent with the values.
+MAX_HISTOGRAM_SAMPLES = 100
+
+
+class MetricsBuffer(object):
+    """
+    Aggregates counters and histograms, and sends them to statsd in batches.
+
+    Has the same increment, histogram and timer methods as dog_stats_api.
+    """
+    def __init__(self, host='localhost', port=8125, flush_interval=10, max_histogram_samples=MAX_HISTOGRAM_SAMPLES):
+        self.address = (host, int(port))
+        self.flush_interval = flush_interval
+        self.max_histogram_samples = max_histogram_samples
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._lock = threading.Lock()
+        self._counters = defaultdict(int)
+        self._histograms = {}
+        self._last_flush = time.time()
+
+    def increment(self, metric_name, value=1, timestamp=None, tags=None, sample_rate=1):  # pylint: disable=unused-argument
+        """
+        Add `value` to the counter.
+        """
+        if sample_rate != 1:
+            if random.random() >= sample_rate:
+                return
+            value = float(value) / sample_rate
+        key = (metric_name, tuple(tags) if tags else ())
+        with self._lock:
+            self._counters[key] += value
+        self._flush_if_due()
+
+    def histogram(self, metric_name, value, timestamp=None, tags=None, sample_rate=1):  # pylint: disable=unused-argument
+        """
+        Add `value` to the histogram.
+
+        Keeps a uniform sample of at most `max_histogram_samples` values per
+        interval (reservoir sampling), so that the percentiles computed by the
+        agent are unchanged, and the count is scaled back up by the agent.
+        """
+        if sample_rate != 1 and random.random() >= sample_rate:
+            return
+        key = (metric_name, tuple(tags) if tags else (), sample_rate)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = [0, []]
+            histogram[0] += 1
+            count, values = histogram
+            if len(values) < self.max_histogram_samples:
+                values.append(value)
+            else:
+                index = random.randrange(count)
+                if index < self.max_histogram_samples:
+                    values[index] = value
+        self._flush_if_due()
+
+    @contextmanager
+    def timer(self, metric_name, sample_rate=1, tags=None):
+        """
+        Add the run time of the contained code to the histogram.
+        """
+        start = time.time()
+        try:
+            yield
+        finally:
+            self.histogram(metric_name, time.time() - start, tags=tags, sample_rate=sample_rate)
+
+    def _flush_if_due(self):
+        """
+        Flush the buffer if the interval is over.
+        """
+        if time.time() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        """
+        Send the metrics of the interval, and start a new interval.
+        """
+        with self._lock:
+            counters, self._counters = self._counters, defaultdict(int)
+            histograms, self._histograms = self._histograms, {}
+            self._last_flush = time.time()
+
+        packet = []
+        size = 0
+        for line in self._lines(counters, histograms):
+            if packet and size + len(line) + 1 > MAX_PACKET_SIZE:
+                self._send(packet)
+                packet = []
+                size = 0
+            packet.append(line)
+            size += len(line) + 1
+        if packet:
+            self._send(packet)
+
+    def _lines(self, counters, histograms):
+        """
+        Yield the statsd lines of the aggregated metrics.
+        """
+        for (metric_name, tags), value in counters.iteritems():
+            yield _statsd_line(metric_name, value, 'c', 1, tags)
+        for (metric_name, tags, sample_rate), (count, values) in histograms.iteritems():
+            sample_rate = sample_rate * len(values) / float(count)
+            for value in values:
+                yield _statsd_line(metric_name, value, 'h', sample_rate, tags)
+
+    def _send(self, lines):
+        """
+        Send one packet of statsd lines.
+        """
+        try:
+            self.socket.sendto('\n'.join(lines), self.address)
+        except Exception:  # pylint: disable=broad-except
+            log.exception("Couldn't send %d metrics to statsd", len(lines))
+
+
+def _statsd_line(metric_name, value, metric_type, sample_rate, tags):
+    """
+    Format a metric the way statsd expects it.
+    """
+    line = '%s:%s|%s' % (metric_name, value, metric_type)
+    if sample_rate != 1:
+        line += '|@%s' % sample_rate
+    if tags:
+        line += '|#' + ','.join(tags)
+    return line
+
+
+_buffer = None
+
+
+def start(host='localhost', port=8125, flush_interval=10, **kwargs):
+    """
+    Send the metrics of dogstats_wrapper through a MetricsBuffer.
+    """
+    global _buffer  # pylint: disable=global-statement
+    stop()
+    _buffer = MetricsBuffer(host, port, flush_interval, **kwargs)
+    atexit.register(_buffer.flush)
+
+
+def stop():
+    """
+    Flush the buffer, and send the metrics straight to dog_stats_api again.
+    """
+    global _buffer  # pylint: disable=global-statement
+    if _buffer is not None:
+        _buffer.flush()
+        _buffer = None
+
+
+def get_buffer():
+    """
+    Return the MetricsBuffer in use, or None.
+    """
+    return _buffer
@@ -0,0 +1,110 @@
+"""
+Tests of the metrics buffer.
+"""
+import unittest
+
+from mock import patch
+
+import dogstats_wrapper
+from dogstats_wrapper import metrics_buffer
+from dogstats_wrapper.metrics_buffer import MetricsBuffer
+
+
+class MetricsBufferTest(unittest.TestCase):
+    """
+    Tests of MetricsBuffer.
+    """
+    def setUp(self):
+        self.buffer = MetricsBuffer(flush_interval=10, max_histogram_samples=3)
+        patcher = patch.object(self.buffer.socket, 'sendto')
+        self.sendto = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def sent_lines(self):
+        """
+        Return the lines of all the packets sent.
+        """
+        return [
+            line
+            for (packet, __), __ in self.sendto.call_args_list
+            for line in packet.split('\n')
+        ]
+
+    def test_counters_aggregated(self):
+        self.buffer.increment('metric', tags=['a:1'])
+        self.buffer.increment('metric', 2, tags=['a:1'])
+        self.buffer.increment('metric', tags=['a:2'])
+        self.buffer.increment('other')
+        self.assertFalse(self.sendto.called)
+
+        self.buffer.flush()
+        self.assertEqual(self.sendto.call_count, 1)
+        self.assertItemsEqual(
+            self.sent_lines(),
+            ['metric:3|c|#a:1', 'metric:1|c|#a:2', 'other:1|c']
+        )
+
+        self.buffer.flush()
+        self.assertEqual(self.sendto.call_count, 1)
+
+    def test_histograms_sampled(self):
+        for value in range(6):
+            self.buffer.histogram('metric', value)
+        self.buffer.histogram('small', 7, tags=['a:1'])
+        self.buffer.flush()
+
+        lines = self.sent_lines()
+        self.assertIn('small:7|h|#a:1', lines)
+        sampled = [line for line in lines if line.startswith('metric:')]
+        self.assertEqual(len(sampled), 3)
+        for line in sampled:
+            self.assertTrue(line.endswith('|h|@0.5'))
+
+    def test_timer(self):
+        with self.buffer.timer('metric', tags=['a:1']):
+            pass
+        self.buffer.flush()
+        line, = self.sent_lines()
+        self.assertRegexpMatches(line, r'^metric:[0-9.e-]+\|h\|#a:1$')
+
+    def test_packets_split(self):
+        for index in range(200):
+            self.buffer.increment('metric.{}'.format(index))
+        self.buffer.flush()
+        self.assertGreater(self.sendto.call_count, 1)
+        for (packet, __), __ in self.sendto.call_args_list:
+            self.assertLessEqual(len(packet), metrics_buffer.MAX_PACKET_SIZE)
+        self.assertEqual(len(self.sent_lines()), 200)
+
+    @patch('dogstats_wrapper.metrics_buffer.time.time')
+    def test_flushed_after_interval(self, mock_time):
+        mock_time.return_value = self.buffer._last_flush  # pylint: disable=protected-access
+        self.buffer.increment('metric')
+        self.assertFalse(self.sendto.called)
+        mock_time.return_value += 10
+        self.buffer.increment('metric')
+        self.assertEqual(self.sent_lines(), ['metric:2|c'])
+
+
+class WrapperTest(unittest.TestCase):
+    """
+    Tests that the wrapper uses the buffer once it is started.
+    """
+    def tearDown(self):
+        metrics_buffer.stop()
+
+    @patch('dogstats_wrapper.wrapper.dog_stats_api')
+    def test_buffer_started(self, mock_stats_api):
+        dogstats_wrapper.increment('metric', tags=[u'a:b|c'])
+        mock_stats_api.increment.assert_called_once_with('metric', tags=['a:b_c'])
+
+        metrics_buffer.start(flush_interval=10)
+        with patch.object(metrics_buffer.get_buffer().socket, 'sendto') as sendto:
+            dogstats_wrapper.increment('metric', tags=[u'a:b|c'])
+            with dogstats_wrapper.timer('timer'):
+                pass
+            metrics_buffer.stop()
+        self.assertEqual(mock_stats_api.increment.call_count, 1)
+        self.assertFalse(mock_stats_api.timer.called)
+        packet = sendto.call_args[0][0]
+        self.assertIn('metric:1|c|#a:b_c', packet.split('\n'))
@@ -1,9 +1,13 @@
 """
 Wrapper for dog_stats_api, ensuring tags are valid.
 See: http://help.datadoghq.com/customer/portal/questions/908720-api-guidelines
+
+The metrics go through the buffer of dogstats_wrapper.metrics_buffer when it was started.
 """
 from dogapi import dog_stats_api
 
+from . import metrics_buffer
+
 
 def _clean_tags(tags):
     """
@@ -20,13 +24,20 @@ def _clean_tags(tags):
     return [clean(t) for t in tags]
 
 
+def _stats_api():
+    """
+    Return where the metrics go: the metrics buffer if it was started, else dog_stats_api.
+    """
+    return metrics_buffer.get_buffer() or dog_stats_api
+
+
 def increment(metric_name, *args, **kwargs):
     """
     Wrapper around dog_stats_api.increment that cleans any tags used.
     """
     if "tags" in kwargs:
         kwargs["tags"] = _clean_tags(kwargs["tags"])
-    dog_stats_api.increment(metric_name, *args, **kwargs)
+    _stats_api().increment(metric_name, *args, **kwargs)
 
 
 def histogram(metric_name, *args, **kwargs):
@@ -35,7 +46,7 @@ def histogram(metric_name, *args, **kwargs):
     """
     if "tags" in kwargs:
         kwargs["tags"] = _clean_tags(kwargs["tags"])
-    dog_stats_api.histogram(metric_name, *args, **kwargs)
+    _stats_api().histogram(metric_name, *args, **kwargs)
 
 
 def timer(metric_name, *args, **kwargs):
@@ -44,4 +55,4 @@ def timer(metric_name, *args, **kwargs):
     """
     if "tags" in kwargs:
         kwargs["tags"] = _clean_tags(kwargs["tags"])
-    return dog_stats_api.timer(metric_name, *args, **kwargs)
+    return _stats_api().timer(metric_name, *args, **kwargs)
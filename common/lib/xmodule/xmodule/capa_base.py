@@ -20,6 +20,7 @@ except ImportError:
 from pkg_resources import resource_string
 
 from capa.capa_problem import LoncapaProblem, LoncapaSystem
+from capa.safe_exec.result_cache import SafeExecResultCache
 from capa.responsetypes import StudentInputError, \
     ResponseError, LoncapaProblemError
 from capa.util import convert_files_to_filenames
@@ -293,10 +294,14 @@ class CapaMixin(CapaFields):
         if text is None:
             text = self.data
 
+        safe_exec_cache = None
+        if self.runtime.cache:
+            safe_exec_cache = SafeExecResultCache(self.runtime.cache, unicode(self.location.course_key))
+
         capa_system = LoncapaSystem(
             ajax_url=self.runtime.ajax_url,
             anonymous_student_id=self.runtime.anonymous_student_id,
-            cache=self.runtime.cache,
+            cache=safe_exec_cache,
             can_execute_unsafe_code=self.runtime.can_execute_unsafe_code,
             get_python_lib_zip=self.runtime.get_python_lib_zip,
             DEBUG=self.runtime.DEBUG,
@@ -28,3 +28,11 @@ def contentstore(name='default'):
         _CONTENTSTORE[name] = class_(**options)
 
     return _CONTENTSTORE[name]
+
+
+def clear_existing_contentstores():
+    """
+    Clear the existing contentstore instances, causing
+    them to be re-created when accessed again.
+    """
+    _CONTENTSTORE.clear()
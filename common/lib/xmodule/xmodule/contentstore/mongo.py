@@ -1,6 +1,8 @@
 import pymongo
 import gridfs
 from gridfs.errors import NoFile
+from datetime import datetime
+from multiprocessing.pool import ThreadPool
 
 from xmodule.contentstore.content import XASSET_LOCATION_TAG
 
@@ -18,6 +20,15 @@ from xmodule.modulestore.django import ASSET_IGNORE_REGEX
 
 class MongoContentStore(ContentStore):
 
+    # The number of assets copied at once by copy_all_course_assets
+    COPY_CONCURRENCY = 4
+
+    # The number of GridFS chunks inserted at once when copying an asset
+    COPY_CHUNK_BATCH_SIZE = 16
+
+    # The number of assets fetched at once when exporting a course
+    EXPORT_CONCURRENCY = 4
+
     # pylint: disable=W0613
     def __init__(self, host, db, port=27017, user=None, password=None, bucket='fs', collection=None, **kwargs):
         """
@@ -42,6 +53,7 @@ class MongoContentStore(ContentStore):
         self.fs = gridfs.GridFS(_db, bucket)
 
         self.fs_files = _db[bucket + ".files"]  # the underlying collection GridFS uses
+        self.fs_chunks = _db[bucket + ".chunks"]  # and the collection of the files' contents
 
     def close_connections(self):
         """
@@ -149,26 +161,58 @@ class MongoContentStore(ContentStore):
             assets_policy_file: the filename for the policy file which should be in the same
                 directory as the other policy files.
         """
-        policy = {}
-        assets, __ = self.get_all_content_for_course(course_key)
-
-        for asset in assets:
-            # TODO: On 6/19/14, I had to put a try/except around this
-            # to export a course. The course failed on JSON files in
-            # the /static/ directory placed in it with an import.
-            #
-            # If this hasn't been looked at in a while, remove this comment.
-            #
-            # When debugging course exports, this might be a good place
-            # to look. -- pmitros
-            self.export(asset['asset_key'], output_directory)
-            for attr, value in asset.iteritems():
-                if attr not in ['_id', 'md5', 'uploadDate', 'length', 'chunkSize', 'asset_key']:
-                    policy.setdefault(asset['asset_key'].name, {})[attr] = value
+        if not os.path.exists(output_directory):
+            os.makedirs(output_directory)
+        policy = self._export_assets(course_key, OSFS(output_directory))
 
         with open(assets_policy_file, 'w') as f:
             json.dump(policy, f, sort_keys=True, indent=4)
 
+    def export_all_for_course_to_fs(self, course_key, export_fs):
+        """
+        Export all of this course's assets under static/ in export_fs, a pyfilesystem object
+        (from the fs package), and all of their attributes to policies/assets.json.
+        """
+        export_fs.makedir('static', recursive=True, allow_recreate=True)
+        policy = self._export_assets(course_key, export_fs.opendir('static'))
+
+        export_fs.makedir('policies', recursive=True, allow_recreate=True)
+        with export_fs.open('policies/assets.json', 'w') as f:
+            json.dump(policy, f, sort_keys=True, indent=4)
+
+    def _export_assets(self, course_key, static_fs):
+        """
+        Write all of this course's assets into static_fs, fetching EXPORT_CONCURRENCY of them at
+        once, and return their policy: their attributes by name.
+        """
+        policy = {}
+        assets, __ = self.get_all_content_for_course(course_key)
+
+        pool = ThreadPool(self.EXPORT_CONCURRENCY)
+        try:
+            # fetch a few assets ahead of those being written, rather than all of them
+            for start in xrange(0, len(assets), 2 * self.EXPORT_CONCURRENCY):
+                batch = assets[start:start + 2 * self.EXPORT_CONCURRENCY]
+                contents = pool.map(lambda asset: self.find(asset['asset_key']), batch)
+                for asset, content in zip(batch, contents):
+                    asset_path = content.name
+                    if content.import_path is not None:
+                        asset_dir = os.path.dirname(content.import_path)
+                        if asset_dir:
+                            static_fs.makedir(asset_dir, recursive=True, allow_recreate=True)
+                            asset_path = asset_dir + '/' + content.name
+                    with static_fs.open(asset_path, 'wb') as asset_file:
+                        asset_file.write(content.data)
+
+                    for attr, value in asset.iteritems():
+                        if attr not in ['_id', 'md5', 'uploadDate', 'length', 'chunkSize', 'asset_key']:
+                            policy.setdefault(asset['asset_key'].name, {})[attr] = value
+        finally:
+            pool.close()
+            pool.join()
+
+        return policy
+
     def get_all_content_thumbnails_for_course(self, course_key):
         return self._get_all_content_for_course(course_key, get_thumbnails=True)[0]
 
@@ -291,41 +335,66 @@ class MongoContentStore(ContentStore):
         """
         See :meth:`.ContentStore.copy_all_course_assets`
 
-        This implementation fairly expensively copies all of the data
+        This implementation copies the GridFS documents of the assets as they are, without
+        reassembling the files, and copies COPY_CONCURRENCY assets at once.
         """
         source_query = query_for_course(source_course_key)
-        # it'd be great to figure out how to do all of this on the db server and not pull the bits over
-        for asset in self.fs_files.find(source_query):
-            asset_key = self.make_id_son(asset)
-            # don't convert from string until fs access
-            source_content = self.fs.get(asset_key)
-            if isinstance(asset_key, basestring):
-                asset_key = AssetKey.from_string(asset_key)
-                __, asset_key = self.asset_db_key(asset_key)
-            asset_key['org'] = dest_course_key.org
-            asset_key['course'] = dest_course_key.course
-            if getattr(dest_course_key, 'deprecated', False):  # remove the run if exists
-                if 'run' in asset_key:
-                    del asset_key['run']
-                asset_id = asset_key
-            else:  # add the run, since it's the last field, we're golden
-                asset_key['run'] = dest_course_key.run
-                asset_id = unicode(
-                    dest_course_key.make_asset_key(asset_key['category'], asset_key['name']).for_branch(None)
-                )
+        assets = list(self.fs_files.find(source_query))
+        pool = ThreadPool(self.COPY_CONCURRENCY)
+        try:
+            # map re-raises the first error of the copies
+            pool.map(lambda asset: self._copy_asset(asset, dest_course_key), assets)
+        finally:
+            pool.close()
+            pool.join()
 
-            self.fs.put(
-                source_content.read(),
-                _id=asset_id, filename=asset['filename'], content_type=asset['contentType'],
-                displayname=asset['displayname'], content_son=asset_key,
-                # thumbnail is not technically correct but will be functionally correct as the code
-                # only looks at the name which is not course relative.
-                thumbnail_location=asset['thumbnail_location'],
-                import_path=asset['import_path'],
-                # getattr b/c caching may mean some pickled instances don't have attr
-                locked=asset.get('locked', False)
+    def _copy_asset(self, asset, dest_course_key):
+        """
+        Copy the asset, a document of the files collection, and its chunks into the course
+        dest_course_key.
+        """
+        source_id = self.make_id_son(asset)
+        asset_key = source_id
+        if isinstance(asset_key, basestring):
+            asset_key = AssetKey.from_string(asset_key)
+            __, asset_key = self.asset_db_key(asset_key)
+        else:
+            asset_key = SON(asset_key)
+        asset_key['org'] = dest_course_key.org
+        asset_key['course'] = dest_course_key.course
+        if getattr(dest_course_key, 'deprecated', False):  # remove the run if exists
+            if 'run' in asset_key:
+                del asset_key['run']
+            asset_id = asset_key
+        else:  # add the run, since it's the last field, we're golden
+            asset_key['run'] = dest_course_key.run
+            asset_id = unicode(
+                dest_course_key.make_asset_key(asset_key['category'], asset_key['name']).for_branch(None)
             )
 
+        # like GridFS, insert the chunks before the file, so that the file is never read without them
+        batch = []
+        for chunk in self.fs_chunks.find({'files_id': source_id}, sort=[('n', pymongo.ASCENDING)]):
+            del chunk['_id']
+            chunk['files_id'] = asset_id
+            batch.append(chunk)
+            if len(batch) == self.COPY_CHUNK_BATCH_SIZE:
+                self.fs_chunks.insert(batch)
+                batch = []
+        if batch:
+            self.fs_chunks.insert(batch)
+
+        # thumbnail_location is not technically correct but will be functionally correct as the code
+        # only looks at the name which is not course relative.
+        asset.update({
+            '_id': asset_id,
+            'content_son': asset_key,
+            'uploadDate': datetime.utcnow(),
+            # getattr b/c caching may mean some pickled instances don't have attr
+            'locked': asset.get('locked', False),
+        })
+        self.fs_files.insert(asset)
+
     def delete_all_course_assets(self, course_key):
         """
         Delete all assets identified via this course_key. Dangerous operation which may remove assets
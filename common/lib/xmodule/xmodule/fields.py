@@ -2,7 +2,7 @@ import time
 import logging
 import re
 
-from xblock.fields import JSONField
+from xblock.fields import Dict, JSONField
 import datetime
 import dateutil.parser
 
@@ -249,3 +249,14 @@ class RelativeTime(JSONField):
             return value
 
         return self.from_json(value)
+
+
+class Counts(Dict):
+    """
+    A dict of counts by key, like the votes of each answer of a poll.
+
+    Runtimes may store Scope.user_state_summary Counts as counters, which a
+    write increments by the difference between the value written and the value
+    read, so that the writes of concurrent users add up rather than overwrite
+    each other. The counts of keys left out of the value written are kept.
+    """
@@ -614,6 +614,75 @@ class ModuleStoreWrite(ModuleStoreRead):
         pass
 
 
+class ParentIndex(object):
+    """
+    The parent and the children of every block of a course, for one version of
+    the course's structure.
+
+    Blocks are stored as (block_type, block_id) pairs, so that the index is
+    small enough to be cached, and doesn't depend on the branch or version of
+    the course key it was built for.
+    """
+    def __init__(self, course_key, children):
+        """
+        Args:
+            course_key: the course the blocks belong to
+            children: a dict of the (block_type, block_id) of each block of the
+                course, to the list of the (block_type, block_id) of its children.
+                Children which aren't blocks of the course are ignored.
+        """
+        if hasattr(course_key, 'version_agnostic'):
+            course_key = course_key.version_agnostic()
+        if hasattr(course_key, 'for_branch'):
+            course_key = course_key.for_branch(None)
+        self.course_key = course_key
+        self.children = {
+            block: [child for child in block_children if child in children]
+            for block, block_children in children.iteritems()
+        }
+
+        # Walk down from the course first, so that a block claimed by several
+        # parents gets the one it can be reached from.
+        self.parents = {}
+        queue = [block for block in self.children if block[0] == 'course']
+        while queue:
+            block = queue.pop()
+            for child in self.children[block]:
+                if child not in self.parents:
+                    self.parents[child] = block
+                    queue.append(child)
+        for block, block_children in self.children.iteritems():
+            for child in block_children:
+                self.parents.setdefault(child, block)
+
+    def _usage_key(self, block):
+        """
+        Return the usage key of the (block_type, block_id) pair `block`.
+        """
+        return self.course_key.make_usage_key(*block)
+
+    def __contains__(self, usage_key):
+        return (usage_key.block_type, usage_key.block_id) in self.children
+
+    def get_parent_location(self, usage_key):
+        """
+        Return the usage key of the parent of `usage_key`, or None if it has none.
+        """
+        parent = self.parents.get((usage_key.block_type, usage_key.block_id))
+        if parent is None:
+            return None
+        return self._usage_key(parent)
+
+    def get_children(self, usage_key):
+        """
+        Return the usage keys of the children of `usage_key`.
+        """
+        return [
+            self._usage_key(child)
+            for child in self.children.get((usage_key.block_type, usage_key.block_id), [])
+        ]
+
+
 class ModuleStoreReadBase(BulkOperationsMixin, ModuleStoreRead):
     '''
     Implement interface functionality that can be shared.
@@ -701,6 +770,68 @@ class ModuleStoreReadBase(BulkOperationsMixin, ModuleStoreRead):
                 None
             )
 
+    def get_parent_index(self, course_key, **kwargs):
+        """
+        Return a :class:`ParentIndex` of the blocks of the course, which answers
+        repeated parent and children lookups (e.g. path_to_location) without
+        going to the store.
+
+        The index is built from the course's structure in one pass, and cached
+        for the duration of the request, and across requests by the stores
+        which can tell when the structure changes.
+        """
+        cache_key, shared = self._get_parent_index_cache_key(course_key, **kwargs)
+        if cache_key is None:
+            return ParentIndex(course_key, self._get_course_children(course_key, **kwargs))
+
+        request_cache = self._get_parent_index_request_cache()
+        index = request_cache.get(cache_key)
+        if index is not None:
+            return index
+
+        children = None
+        if shared and self.metadata_inheritance_cache_subsystem is not None:
+            children = self.metadata_inheritance_cache_subsystem.get(cache_key)
+        if children is None:
+            children = self._get_course_children(course_key, **kwargs)
+            if shared and self.metadata_inheritance_cache_subsystem is not None:
+                self.metadata_inheritance_cache_subsystem.set(cache_key, children)
+
+        index = ParentIndex(course_key, children)
+        request_cache[cache_key] = index
+        return index
+
+    def _get_parent_index_cache_key(self, course_key, **kwargs):
+        """
+        Return the key of the course's parent index in the caches (or None if
+        it must not be cached), and whether it can be shared across requests.
+        By default, it is only cached for the request.
+        """
+        return u"parent_index.{}.{}".format(course_key, kwargs.get('revision')), False
+
+    def _get_parent_index_request_cache(self):
+        """
+        Return the dict of the parent indexes cached for the current request.
+        """
+        if self.request_cache is None:
+            return {}
+        return self.request_cache.data.setdefault('parent_index', {})
+
+    def _get_course_children(self, course_key, **kwargs):
+        """
+        Return a dict of the (block_type, block_id) of every block of the
+        course to the (block_type, block_id) of its children.
+
+        Stores which can read the structure without loading every block
+        should override this.
+        """
+        return {
+            (item.location.block_type, item.location.block_id): [
+                (child.block_type, child.block_id) for child in item.children
+            ] if item.has_children else []
+            for item in self.get_items(course_key, **kwargs)
+        }
+
     def has_published_version(self, xblock):
         """
         Returns True since this is a read-only store.
@@ -317,6 +317,13 @@ class MixedModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase):
         store = self._get_modulestore_for_courseid(location.course_key)
         return store.get_parent_location(location, **kwargs)
 
+    def get_parent_index(self, course_key, **kwargs):
+        """
+        Returns the parent index of the given course (see ModuleStoreReadBase.get_parent_index)
+        """
+        store = self._get_modulestore_for_courseid(course_key)
+        return store.get_parent_index(course_key, **kwargs)
+
     def get_modulestore_type(self, course_id):
         """
         Returns a type which identifies which modulestore is servicing the given course_id.
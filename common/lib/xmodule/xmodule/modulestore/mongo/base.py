@@ -44,6 +44,7 @@ from opaque_keys.edx.locator import CourseLocator
 from opaque_keys.edx.keys import UsageKey, CourseKey
 from xmodule.exceptions import HeartbeatFailure
 from xmodule.modulestore.edit_info import EditInfoRuntimeMixin
+from xmodule.modulestore.tracing import TracedCollection
 
 log = logging.getLogger(__name__)
 
@@ -458,7 +459,7 @@ class MongoModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase, Mongo
                 ),
                 db
             )
-            self.collection = self.database[collection]
+            self.collection = TracedCollection(self.database, collection)
 
             if user is not None and password is not None:
                 self.database.authenticate(user, password)
@@ -667,12 +668,36 @@ class MongoModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase, Mongo
         a runtime may mean that some objects report old values for inherited data.
         """
         course_id = course_id.for_branch(None)
+        self._clear_cached_parent_index(course_id)
         if not self._is_in_bulk_operation(course_id):
             # below is done for side effects when runtime is None
             cached_metadata = self._get_cached_metadata_inheritance_tree(course_id, force_refresh=True)
             if runtime:
                 runtime.cached_metadata = cached_metadata
 
+    def _update_cached_metadata_inheritance_tree(self, course_id, inherited_metadata, removed=()):
+        """
+        Update the cached metadata inheritance tree of the course with the metadata
+        inherited by some of its blocks (by location url), and forget the `removed`
+        location urls, rather than recomputing the whole tree like
+        refresh_cached_metadata_inheritance_tree does.
+        """
+        course_id = course_id.for_branch(None)
+        self._clear_cached_parent_index(course_id)
+        if self._is_in_bulk_operation(course_id):
+            # the tree is refreshed at the end of the bulk operation
+            return
+        if self.metadata_inheritance_cache_subsystem is None and self.request_cache is None:
+            # there is no cached tree to update
+            return
+
+        tree = self._get_cached_metadata_inheritance_tree(course_id)
+        tree.update(inherited_metadata)
+        for location_url in removed:
+            tree.pop(location_url, None)
+        if self.metadata_inheritance_cache_subsystem is not None:
+            self.metadata_inheritance_cache_subsystem.set(unicode(self.fill_in_run(course_id)), tree)
+
     def _clean_item_data(self, item):
         """
         Renames the '_id' field in item to 'location'
@@ -692,18 +717,31 @@ class MongoModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase, Mongo
         }
         return list(self.collection.find(query))
 
+    def _query_course_for_cache_children(self, course_key):
+        """
+        Return the payloads of all the items of the course, in one round-trip
+        """
+        query = self._course_key_to_son(course_key)
+        query['_id.revision'] = MongoRevisionKey.published
+        return list(self.collection.find(query))
+
     def _cache_children(self, course_key, items, depth=0):
         """
         Returns a dictionary mapping Location -> item data, populated with json data
         for all descendents of items up to the specified depth.
         (0 = no descendents, 1 = children, 2 = grandchildren, etc)
         If depth is None, will load all the children.
-        This will make a number of queries that is linear in the depth.
+        This will make a number of queries that is linear in the depth, except when
+        all the descendents of a course are wanted, where the whole course is read at once.
         """
 
         data = {}
         to_process = list(items)
         course_key = self.fill_in_run(course_key)
+        if depth is None and any(item['_id']['category'] == 'course' for item in to_process):
+            # the items given go last, so that they are the ones cached
+            to_process = self._query_course_for_cache_children(course_key) + to_process
+            depth = 0
         while to_process and depth is None or depth >= 0:
             children = []
             for item in to_process:
@@ -1378,6 +1416,64 @@ class MongoModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase, Mongo
             return as_published(parent)
         return None
 
+    def _get_parent_index_cache_key(self, course_key, revision=None, **kwargs):
+        """
+        The published structure of a course is cached across requests, and
+        forgotten in refresh_cached_metadata_inheritance_tree. The draft one
+        changes in too many ways to be, so it is only cached for the request.
+        """
+        if revision is None:
+            published = self.get_branch_setting() == ModuleStoreEnum.Branch.published_only
+        else:
+            published = revision == ModuleStoreEnum.RevisionOption.published_only
+        return self._parent_index_cache_key(course_key, published), published
+
+    def _parent_index_cache_key(self, course_key, published):
+        """
+        Return the cache key of the published or draft parent index of the course.
+        """
+        return u"parent_index.{}.{}".format(
+            course_key.for_branch(None), 'published' if published else 'draft'
+        )
+
+    def _get_course_children(self, course_key, revision=None, **kwargs):
+        """
+        Read the children of all the blocks of the course in one query,
+        preferring the draft versions unless only the published ones are asked for.
+        """
+        __, published = self._get_parent_index_cache_key(course_key, revision)
+        course_key = self.fill_in_run(course_key)
+        query = self._course_key_to_son(course_key)
+        if published:
+            query['_id.revision'] = MongoRevisionKey.published
+
+        children = {}
+        items = self.collection.find(
+            query, {'_id': True, 'definition.children': True}, sort=[SORT_REVISION_FAVOR_DRAFT]
+        )
+        for item in items:
+            block = (item['_id']['category'], item['_id']['name'])
+            if block in children:
+                # the draft version came first
+                continue
+            block_children = []
+            for child in item.get('definition', {}).get('children', []):
+                child_key = course_key.make_usage_key_from_deprecated_string(child)
+                block_children.append((child_key.block_type, child_key.block_id))
+            children[block] = block_children
+        return children
+
+    def _clear_cached_parent_index(self, course_key):
+        """
+        Forget the parent indexes of the course, after its structure changed.
+        """
+        request_cache = self._get_parent_index_request_cache()
+        for published in (True, False):
+            cache_key = self._parent_index_cache_key(course_key, published)
+            request_cache.pop(cache_key, None)
+            if self.metadata_inheritance_cache_subsystem is not None:
+                self.metadata_inheritance_cache_subsystem.delete(cache_key)
+
     def get_modulestore_type(self, course_key=None):
         """
         Returns an enumeration-like type reflecting the type of this modulestore per ModuleStoreEnum.Type
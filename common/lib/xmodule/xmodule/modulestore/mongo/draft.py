@@ -6,17 +6,22 @@ returns the i4x://org/course/cat/name@draft object if that exists,
 and otherwise returns i4x://org/course/cat/name).
 """
 
+import copy
 import pymongo
 import logging
+from datetime import datetime
+from pytz import UTC
 
 from opaque_keys.edx.locations import Location
 from xmodule.exceptions import InvalidVersionError
-from xmodule.modulestore import ModuleStoreEnum
+from xmodule.modulestore import ModuleStoreEnum, ParentIndex
 from xmodule.modulestore.exceptions import (
     ItemNotFoundError, DuplicateItemError, DuplicateCourseError, InvalidBranchSetting
 )
+from xmodule.modulestore.inheritance import InheritanceMixin
 from xmodule.modulestore.mongo.base import (
-    MongoModuleStore, MongoRevisionKey, as_draft, as_published, SORT_REVISION_FAVOR_DRAFT
+    MongoModuleStore, MongoRevisionKey, as_draft, as_published, SORT_REVISION_FAVOR_DRAFT,
+    BLOCK_TYPES_WITH_CHILDREN
 )
 from xmodule.modulestore.store_utilities import rewrite_nonportable_content_links
 from xmodule.modulestore.draft_and_published import UnsupportedRevisionError, DIRECT_ONLY_CATEGORIES
@@ -36,6 +41,123 @@ def wrap_draft(item):
     return item
 
 
+class CourseVersions(object):
+    """
+    The ids, children and inheritable metadata of the draft and published versions of the
+    items of a course, from which the subtrees of publish and revert_to_published are found
+    without going back to the database.
+
+    Items are identified by their (category, name) pairs, and looked up in `items`, a dict of
+    each revision to the items of that revision.
+    """
+    DRAFT_PREFERRED = (MongoRevisionKey.draft, MongoRevisionKey.published)
+
+    def __init__(self, course_key, items):
+        self.course_key = course_key
+        self.items = {MongoRevisionKey.draft: {}, MongoRevisionKey.published: {}}
+        for item in items:
+            self.items[item['_id']['revision']][(item['_id']['category'], item['_id']['name'])] = item
+
+    def item(self, block, revisions=DRAFT_PREFERRED):
+        """
+        Return the item of the first of `revisions` which the block has, or None.
+        """
+        for revision in revisions:
+            item = self.items[revision].get(block)
+            if item is not None:
+                return item
+        return None
+
+    def children(self, block, revisions=DRAFT_PREFERRED):
+        """
+        Return the children of the block, in the first of `revisions` which it has.
+        """
+        item = self.item(block, revisions)
+        if item is None:
+            return []
+        children = []
+        for child in item.get('definition', {}).get('children', []):
+            child_key = self.course_key.make_usage_key_from_deprecated_string(child)
+            children.append((child_key.block_type, child_key.block_id))
+        return children
+
+    def subtree(self, block, revisions=DRAFT_PREFERRED):
+        """
+        Return the block and its descendants, depth first, following the children of the first
+        of `revisions` which each item has. Items which have none of the revisions are skipped.
+        """
+        subtree = []
+        seen = set()
+        stack = [block]
+        while stack:
+            block = stack.pop()
+            if block in seen or self.item(block, revisions) is None:
+                continue
+            seen.add(block)
+            subtree.append(block)
+            stack.extend(reversed(self.children(block, revisions)))
+        return subtree
+
+    def parent_index(self):
+        """
+        Return a ParentIndex of the draft preferred structure of the course.
+        """
+        blocks = set(self.items[MongoRevisionKey.draft]) | set(self.items[MongoRevisionKey.published])
+        return ParentIndex(self.course_key, {block: self.children(block) for block in blocks})
+
+    def ancestors(self, block):
+        """
+        Return the ancestors of the block in the draft preferred structure, from its parent up.
+        """
+        parents = self.parent_index().parents
+        ancestors = []
+        parent = parents.get(block)
+        while parent is not None and parent not in ancestors:
+            ancestors.append(parent)
+            parent = parents.get(parent)
+        return ancestors
+
+    def location_url(self, block):
+        """
+        Return the url of the block's location, which keys the metadata inheritance tree.
+        """
+        return unicode(self.course_key.make_usage_key(*block))
+
+    def inherited_metadata(self, block):
+        """
+        Return the metadata which the block and its descendants inherit in the draft preferred
+        structure, by location url, as MongoModuleStore._compute_metadata_inheritance_tree
+        computes it for the whole course. Blocks which aren't in the course tree inherit nothing.
+        """
+        ancestors = self.ancestors(block)
+        course = ancestors[-1] if ancestors else block
+        if course[0] != 'course':
+            return {}
+
+        inherited_metadata = {}
+
+        def _inherit(block, metadata):
+            """
+            Record the metadata inherited by the block and its descendants.
+            """
+            item = self.item(block)
+            if item is None or block[0] not in BLOCK_TYPES_WITH_CHILDREN:
+                inherited_metadata[self.location_url(block)] = metadata
+                return
+            block_metadata = copy.deepcopy(metadata)
+            block_metadata.update(item.get('metadata', {}))
+            if block[0] != 'course':
+                inherited_metadata[self.location_url(block)] = block_metadata
+            for child in self.children(block):
+                _inherit(child, block_metadata)
+
+        metadata = {}
+        for ancestor in reversed(ancestors):
+            metadata.update(self.item(ancestor).get('metadata', {}))
+        _inherit(block, metadata)
+        return inherited_metadata
+
+
 class DraftModuleStore(MongoModuleStore):
     """
     This mixin modifies a modulestore to give it draft semantics.
@@ -180,55 +302,61 @@ class DraftModuleStore(MongoModuleStore):
         # clone the assets
         super(DraftModuleStore, self).clone_course(source_course_id, dest_course_id, user_id, fields)
 
-        # get the whole old course
-        new_course = self.get_course(dest_course_id)
-        if new_course is None:
-            # create_course creates the about overview
-            new_course = self.create_course(
-                dest_course_id.org, dest_course_id.course, dest_course_id.run, user_id, fields=fields
-            )
-        else:
-            # update fields on existing course
+        # copy the published and draft items of the old course in one bulk write, replacing the
+        # course and about items if the new course was already created
+        now = datetime.now(UTC)
+        bulk = self.collection.initialize_ordered_bulk_op()
+        for item in self.collection.find(self._course_key_to_son(source_course_id)):
+            item = self._clone_item(item, source_course_id, dest_course_id, user_id, now)
+            bulk.find({'_id': item['_id']}).upsert().replace_one(item)
+        bulk.execute()
+        self.refresh_cached_metadata_inheritance_tree(dest_course_id)
+
+        if fields:
+            new_course = self.get_course(dest_course_id)
             for key, value in fields.iteritems():
                 setattr(new_course, key, value)
             self.update_item(new_course, user_id)
 
-        # Get all modules under this namespace which is (tag, org, course) tuple
-        modules = self.get_items(source_course_id, revision=ModuleStoreEnum.RevisionOption.published_only)
-        self._clone_modules(modules, dest_course_id, user_id)
-        course_location = dest_course_id.make_usage_key('course', dest_course_id.run)
-        self.publish(course_location, user_id)
-
-        modules = self.get_items(source_course_id, revision=ModuleStoreEnum.RevisionOption.draft_only)
-        self._clone_modules(modules, dest_course_id, user_id)
-
         return True
 
-    def _clone_modules(self, modules, dest_course_id, user_id):
-        """Clones each module into the given course"""
-        for module in modules:
-            original_loc = module.location
-            module.location = module.location.map_into_course(dest_course_id)
-            if module.location.category == 'course':
-                module.location = module.location.replace(name=module.location.run)
-
-            log.info("Cloning module %s to %s....", original_loc, module.location)
-
-            if 'data' in module.fields and module.fields['data'].is_set_on(module) and isinstance(module.data, basestring):
-                module.data = rewrite_nonportable_content_links(
-                    original_loc.course_key, dest_course_id, module.data
-                )
-
-            # repoint children
-            if module.has_children:
-                new_children = []
-                for child_loc in module.children:
-                    child_loc = child_loc.map_into_course(dest_course_id)
-                    new_children.append(child_loc)
+    def _clone_item(self, item, source_course_id, dest_course_id, user_id, now):
+        """
+        Map the raw `item` of the source course into the destination course, as edited by
+        `user_id` at `now`, and return it.
+        """
+        item['_id'] = self._id_dict_to_son(dict(item['_id'], org=dest_course_id.org, course=dest_course_id.course))
+        if item['_id']['category'] == 'course':
+            item['_id']['name'] = dest_course_id.run
+        log.info("Cloning item %s to %s....", item['_id'], dest_course_id)
+
+        definition = item.get('definition', {})
+        data = definition.get('data')
+        if isinstance(data, basestring):
+            definition['data'] = rewrite_nonportable_content_links(source_course_id, dest_course_id, data)
+        elif isinstance(data, dict) and isinstance(data.get('data'), basestring):
+            data['data'] = rewrite_nonportable_content_links(
+                source_course_id, dest_course_id, data['data']
+            )
 
-                module.children = new_children
+        # repoint children
+        if 'children' in definition:
+            definition['children'] = [
+                Location.from_deprecated_string(child).map_into_course(dest_course_id).to_deprecated_string()
+                for child in definition['children']
+            ]
 
-            self.update_item(module, user_id, allow_not_found=True)
+        edit_info = item.setdefault('edit_info', {})
+        edit_info.update({
+            'edited_on': now,
+            'edited_by': user_id,
+            'subtree_edited_on': now,
+            'subtree_edited_by': user_id,
+        })
+        if item['_id']['revision'] == MongoRevisionKey.published:
+            edit_info['published_date'] = now
+            edit_info['published_by'] = user_id
+        return item
 
     def _get_raw_parent_locations(self, location, key_revision):
         """
@@ -402,38 +530,58 @@ class DraftModuleStore(MongoModuleStore):
         if location.category in DIRECT_ONLY_CATEGORIES:
             raise InvalidVersionError(location)
 
-        def convert_item(item, to_be_deleted):
-            """
-            Convert the subtree
-            """
-            # collect the children's ids for future processing
-            next_tier = []
-            for child in item.get('definition', {}).get('children', []):
-                child_loc = Location.from_deprecated_string(child)
-                next_tier.append(child_loc.to_deprecated_son())
-
-            # insert a new DRAFT version of the item
-            item['_id']['revision'] = MongoRevisionKey.draft
-            # ensure keys are in fixed and right order before inserting
-            item['_id'] = self._id_dict_to_son(item['_id'])
-            bulk_record = self._get_bulk_ops_record(location.course_key)
+        # read the subtree tier by tier, with the drafts which already exist, and make
+        # all of its drafts at once
+        to_be_inserted = []
+        to_be_deleted = []
+        tier = [location]
+        while tier:
+            query = []
+            for usage_key in tier:
+                query.append(usage_key.to_deprecated_son())
+                query.append(as_draft(usage_key).to_deprecated_son())
+            published_items = []
+            existing_drafts = set()
+            for item in self.collection.find({'_id': {'$in': query}}):
+                if item['_id']['revision'] == MongoRevisionKey.draft:
+                    existing_drafts.add((item['_id']['category'], item['_id']['name']))
+                else:
+                    published_items.append(item)
+
+            tier = []
+            for item in published_items:
+                # collect the children's ids for future processing
+                for child in item.get('definition', {}).get('children', []):
+                    tier.append(Location.from_deprecated_string(child))
+
+                published_id = self._id_dict_to_son(item['_id'])
+                item['_id']['revision'] = MongoRevisionKey.draft
+                # ensure keys are in fixed and right order before inserting
+                item['_id'] = self._id_dict_to_son(item['_id'])
+                if (item['_id']['category'], item['_id']['name']) in existing_drafts:
+                    # prevent re-creation of DRAFT versions, unless explicitly requested to ignore
+                    if not ignore_if_draft:
+                        raise DuplicateItemError(item['_id'], self, 'collection')
+                else:
+                    to_be_inserted.append(item)
+
+                # delete the old PUBLISHED version if requested
+                if delete_published:
+                    to_be_deleted.append(published_id)
+
+        bulk_record = self._get_bulk_ops_record(location.course_key)
+        if to_be_inserted:
             bulk_record.dirty = True
             try:
-                self.collection.insert(item)
+                self.collection.insert(to_be_inserted, continue_on_error=True)
             except pymongo.errors.DuplicateKeyError:
-                # prevent re-creation of DRAFT versions, unless explicitly requested to ignore
+                # a draft was made since the subtree was read
                 if not ignore_if_draft:
-                    raise DuplicateItemError(item['_id'], self, 'collection')
-
-            # delete the old PUBLISHED version if requested
-            if delete_published:
-                item['_id']['revision'] = MongoRevisionKey.published
-                to_be_deleted.append(item['_id'])
-
-            return next_tier
-
-        # convert the subtree using the original item as the root
-        self._breadth_first(convert_item, [location])
+                    raise DuplicateItemError(location, self, 'collection')
+        if to_be_deleted:
+            bulk_record.dirty = True
+            self.collection.remove({'_id': {'$in': to_be_deleted}}, safe=self.collection.safe)
+            self._clear_cached_parent_index(location.course_key)
 
     def update_item(self, xblock, user_id, allow_not_found=False, force=False, isPublish=False, **kwargs):
         """
@@ -596,6 +744,19 @@ class DraftModuleStore(MongoModuleStore):
             bulk_record = self._get_bulk_ops_record(root_usages[0].course_key)
             bulk_record.dirty = True
             self.collection.remove({'_id': {'$in': to_be_deleted}}, safe=self.collection.safe)
+            self._clear_cached_parent_index(root_usages[0].course_key)
+
+    def _get_course_versions(self, course_key):
+        """
+        Read the ids, children and inheritable metadata of both versions of every item of
+        the course in one query.
+        """
+        course_key = self.fill_in_run(course_key)
+        record_filter = {'_id': True, 'definition.children': True}
+        for field_name in InheritanceMixin.fields:
+            record_filter['metadata.{0}'.format(field_name)] = True
+        items = self.collection.find(self._course_key_to_son(course_key), record_filter)
+        return CourseVersions(course_key, items)
 
     @MongoModuleStore.memoize_request_cache
     def has_changes(self, xblock):
@@ -624,75 +785,94 @@ class DraftModuleStore(MongoModuleStore):
         Treats the publishing of non-draftable items as merely a subtree selection from
         which to descend.
 
+        The subtree is read with a query for the structure of the course and one for its
+        drafts, and written with one bulk operation.
+
         Raises:
             ItemNotFoundError: if any of the draft subtree nodes aren't found
         """
-        # NOTE: cannot easily use self._breadth_first b/c need to get pub'd and draft as pairs
-        # (could do it by having 2 breadth first scans, the first to just get all published children
-        # and the second to do the publishing on the drafts looking for the published in the cached
-        # list of published ones.)
-        to_be_deleted = []
-
-        def _internal_depth_first(item_location, is_root):
-            """
-            Depth first publishing from the given location
-            """
-            try:
-                # handle child does not exist w/o killing publish
-                item = self.get_item(item_location)
-            except ItemNotFoundError:
-                log.warning('Cannot find: %s', item_location)
-                return
-
-            # publish the children first
-            if item.has_children:
-                for child_loc in item.children:
-                    _internal_depth_first(child_loc, False)
-
-            if item_location.category in DIRECT_ONLY_CATEGORIES or not getattr(item, 'is_draft', False):
-                # ignore noop attempt to publish something that can't be or isn't currently draft
-                return
-
-            # try to find the originally PUBLISHED version, if it exists
-            try:
-                original_published = super(DraftModuleStore, self).get_item(item_location)
-            except ItemNotFoundError:
-                original_published = None
-
-            # if the category of this item allows having children
-            if item.has_children:
-                if original_published is not None:
-                    # see if previously published children were deleted. 2 reasons for children lists to differ:
-                    #   Case 1: child deleted
-                    #   Case 2: child moved
-                    for orig_child in original_published.children:
-                        if orig_child not in item.children:
-                            published_parent = self.get_parent_location(orig_child)
-                            if published_parent == item_location:
-                                # Case 1: child was deleted in draft parent item
-                                # So, delete published version of the child now that we're publishing the draft parent
-                                self._delete_subtree(orig_child, [as_published])
-                            else:
-                                # Case 2: child was moved to a new draft parent item
-                                # So, do not delete the child.  It will be published when the new parent is published.
-                                pass
-
-            # update the published (not draft) item (ignoring that item is "draft"). The published
-            # may not exist; (if original_published is None); so, allow_not_found
-            super(DraftModuleStore, self).update_item(
-                item, user_id, isPublish=True, is_publish_root=is_root, allow_not_found=True
-            )
-            to_be_deleted.append(as_draft(item_location).to_deprecated_son())
-
         # verify input conditions
         self._verify_branch_setting(ModuleStoreEnum.Branch.draft_preferred)
         _verify_revision_is_published(location)
 
-        _internal_depth_first(location, True)
-        if len(to_be_deleted) > 0:
-            bulk_record = self._get_bulk_ops_record(location.course_key)
-            bulk_record.dirty = True
-            self.collection.remove({'_id': {'$in': to_be_deleted}})
+        course_key = location.course_key
+        versions = self._get_course_versions(course_key)
+        root = (location.block_type, location.block_id)
+        # ignore the items which can't be or aren't currently draft
+        to_be_published = [
+            block for block in versions.subtree(root)
+            if block[0] not in DIRECT_ONLY_CATEGORIES and block in versions.items[MongoRevisionKey.draft]
+        ]
+        if not to_be_published:
+            return self.get_item(as_published(location))
+
+        parents = versions.parent_index().parents
+        now = datetime.now(UTC)
+        bulk = self.collection.initialize_ordered_bulk_op()
+        to_be_deleted = []
+        removed = []
+        query = [
+            self._id_dict_to_son(versions.items[MongoRevisionKey.draft][block]['_id'])
+            for block in to_be_published
+        ]
+        for item in self.collection.find({'_id': {'$in': query}}):
+            block = (item['_id']['category'], item['_id']['name'])
+            draft_children = versions.children(block)
+            # see if previously published children were deleted. 2 reasons for children lists to differ:
+            #   Case 1: child deleted
+            #   Case 2: child moved
+            for orig_child in versions.children(block, revisions=(MongoRevisionKey.published,)):
+                if orig_child in draft_children or orig_child in parents:
+                    # Case 2: child was moved to a new draft parent item. It will be published
+                    # when the new parent is published.
+                    continue
+                # Case 1: child was deleted in draft parent item. So, delete the published
+                # version of its subtree now that we're publishing the draft parent
+                for deleted in versions.subtree(orig_child, revisions=(MongoRevisionKey.published,)):
+                    if deleted not in to_be_published:
+                        deleted_item = versions.items[MongoRevisionKey.published][deleted]
+                        to_be_deleted.append(self._id_dict_to_son(deleted_item['_id']))
+                        removed.append(deleted)
+
+            # replace the published item (which may not exist) by the draft
+            to_be_deleted.append(self._id_dict_to_son(item['_id']))
+            item['_id']['revision'] = MongoRevisionKey.published
+            item['_id'] = self._id_dict_to_son(item['_id'])
+            item['edit_info'] = {
+                'edited_on': now,
+                'edited_by': user_id,
+                'subtree_edited_on': now,
+                'subtree_edited_by': user_id,
+                'published_date': now,
+                'published_by': user_id,
+            }
+            bulk.find({'_id': item['_id']}).upsert().replace_one(item)
+
+        # update subtree edited info for ancestors of the publish root
+        if root in to_be_published and not self._is_in_bulk_operation(course_key):
+            ancestor_payload = {
+                'edit_info.subtree_edited_on': now,
+                'edit_info.subtree_edited_by': user_id
+            }
+            for ancestor in versions.ancestors(root):
+                ancestor_id = self._id_dict_to_son(versions.item(ancestor)['_id'])
+                bulk.find({'_id': ancestor_id}).update_one({'$set': ancestor_payload})
+
+        bulk.find({'_id': {'$in': to_be_deleted}}).remove()
+        bulk_record = self._get_bulk_ops_record(course_key)
+        bulk_record.dirty = True
+        bulk.execute()
+
+        # patch the metadata inheritance tree of the published subtree
+        for block in to_be_published:
+            versions.items[MongoRevisionKey.published][block] = versions.items[MongoRevisionKey.draft].pop(block)
+        for block in removed:
+            versions.items[MongoRevisionKey.published].pop(block, None)
+        self._update_cached_metadata_inheritance_tree(
+            course_key,
+            versions.inherited_metadata(root),
+            [versions.location_url(removed_block) for removed_block in removed if versions.item(removed_block) is None]
+        )
         return self.get_item(as_published(location))
 
     def unpublish(self, location, user_id, **kwargs):
@@ -721,34 +901,56 @@ class DraftModuleStore(MongoModuleStore):
         if location.category in DIRECT_ONLY_CATEGORIES:
             return
 
-        if not self.has_item(location, revision=ModuleStoreEnum.RevisionOption.published_only):
+        course_key = location.course_key
+        versions = self._get_course_versions(course_key)
+        root = (location.block_type, location.block_id)
+        if root not in versions.items[MongoRevisionKey.published]:
             raise InvalidVersionError(location)
 
-        def delete_draft_only(root_location):
-            """
-            Helper function that calls delete on the specified location if a draft version of the item exists.
-            If no draft exists, this function recursively calls itself on the children of the item.
-            """
-            query = root_location.to_deprecated_son(prefix='_id.')
-            del query['_id.revision']
-            versions_found = self.collection.find(
-                query, {'_id': True, 'definition.children': True}, sort=[SORT_REVISION_FAVOR_DRAFT]
-            )
-            # If 2 versions versions exist, we can assume one is a published version. Go ahead and do the delete
-            # of the draft version.
-            if versions_found.count() > 1:
-                self._delete_subtree(root_location, [as_draft])
-            elif versions_found.count() == 1:
-                # Since this method cannot be called on something in DIRECT_ONLY_CATEGORIES and we call
-                # delete_subtree as soon as we find an item with a draft version, if there is only 1 version
-                # it must be published (since adding a child to a published item creates a draft of the parent).
-                item = versions_found[0]
-                assert item.get('_id').get('revision') != MongoRevisionKey.draft
-                for child in item.get('definition', {}).get('children', []):
-                    child_loc = Location.from_deprecated_string(child)
-                    delete_draft_only(child_loc)
+        # Delete the draft subtrees of the highest items which have both a draft and a published
+        # version, descending into the items which only have a published version. Since this method
+        # cannot be called on something in DIRECT_ONLY_CATEGORIES, no item of the subtree only has a
+        # draft version (adding a child to a published item creates a draft of the parent).
+        reverted = []
+        to_be_deleted = []
+        stack = [root]
+        while stack:
+            block = stack.pop()
+            if block not in versions.items[MongoRevisionKey.published]:
+                continue
+            if block not in versions.items[MongoRevisionKey.draft]:
+                stack.extend(versions.children(block, revisions=(MongoRevisionKey.published,)))
+                continue
+            reverted.append(block)
+            to_be_deleted.extend(versions.subtree(block, revisions=(MongoRevisionKey.draft,)))
+
+        if not to_be_deleted:
+            return
+
+        bulk_record = self._get_bulk_ops_record(course_key)
+        bulk_record.dirty = True
+        self.collection.remove(
+            {'_id': {'$in': [
+                self._id_dict_to_son(versions.items[MongoRevisionKey.draft][draft_block]['_id'])
+                for draft_block in to_be_deleted
+            ]}},
+            safe=self.collection.safe
+        )
 
-        delete_draft_only(location)
+        # patch the metadata inheritance tree of the reverted subtrees
+        for block in to_be_deleted:
+            versions.items[MongoRevisionKey.draft].pop(block, None)
+        inherited_metadata = {}
+        for block in reverted:
+            inherited_metadata.update(versions.inherited_metadata(block))
+        self._update_cached_metadata_inheritance_tree(
+            course_key,
+            inherited_metadata,
+            [
+                versions.location_url(deleted_block)
+                for deleted_block in to_be_deleted if versions.item(deleted_block) is None
+            ]
+        )
 
     def _query_children_for_cache_children(self, course_key, items):
         # first get non-draft in a round-trip
@@ -786,6 +988,27 @@ class DraftModuleStore(MongoModuleStore):
 
         return queried_children
 
+    def _query_course_for_cache_children(self, course_key):
+        if self.get_branch_setting() != ModuleStoreEnum.Branch.draft_preferred:
+            return super(DraftModuleStore, self)._query_course_for_cache_children(course_key)
+
+        # get the published and the draft items in the same round-trip, and then,
+        # as in _query_children_for_cache_children, replace the published items by their drafts
+        to_process_dict = {}
+        drafts = []
+        for item in self.collection.find(self._course_key_to_son(course_key)):
+            if item['_id']['revision'] == MongoRevisionKey.draft:
+                drafts.append(item)
+            else:
+                to_process_dict[Location._from_deprecated_son(item['_id'], course_key.run)] = item
+
+        for draft in drafts:
+            draft_as_non_draft_loc = as_published(Location._from_deprecated_son(draft['_id'], course_key.run))
+            if draft_as_non_draft_loc in to_process_dict:
+                to_process_dict[draft_as_non_draft_loc] = draft
+
+        return to_process_dict.values()
+
     def has_published_version(self, xblock):
         """
         Returns True if this xblock has an existing published version regardless of whether the
@@ -24,55 +24,31 @@ def path_to_location(modulestore, usage_key):
     of this location under that sequence.
     '''
 
-    def flatten(xs):
-        '''Convert lisp-style (a, (b, (c, ()))) list into a python list.
-        Not a general flatten function. '''
-        p = []
-        while xs != ():
-            p.append(xs[0])
-            xs = xs[1]
-        return p
-
-    def find_path_to_course():
-        '''Find a path up the location graph to a node with the
-        specified category.
+    def find_path_to_course(index):
+        '''Find a path up the location graph to the course.
 
         If no path exists, return None.
 
-        If a path exists, return it as a list with target location first, and
-        the starting location last.
+        If a path exists, return it as a list with the course first, and
+        the target location last.
         '''
-        # Standard DFS
-
-        # To keep track of where we came from, the work queue has
-        # tuples (location, path-so-far).  To avoid lots of
-        # copying, the path-so-far is stored as a lisp-style
-        # list--nested hd::tl tuples, and flattened at the end.
-        queue = [(usage_key, ())]
-        while len(queue) > 0:
-            (next_usage, path) = queue.pop()  # Takes from the end
-
-            # get_parent_location raises ItemNotFoundError if location isn't found
-            parent = modulestore.get_parent_location(next_usage)
-
-            # print 'Processing loc={0}, path={1}'.format(next_usage, path)
-            if next_usage.block_type == "course":
-                # Found it!
-                path = (next_usage, path)
-                return flatten(path)
-            elif parent is None:
+        path = [index.course_key.make_usage_key(usage_key.block_type, usage_key.block_id)]
+        while path[0].block_type != "course":
+            parent = index.get_parent_location(path[0])
+            if parent is None or parent in path:
                 # Orphaned item.
                 return None
-
-            # otherwise, add parent locations at the end
-            newpath = (next_usage, path)
-            queue.append((parent, newpath))
+            path.insert(0, parent)
+        return path
 
     with modulestore.bulk_operations(usage_key.course_key):
-        if not modulestore.has_item(usage_key):
+        # One pass over the course's structure answers all the parent and
+        # children lookups below.
+        index = modulestore.get_parent_index(usage_key.course_key)
+        if usage_key not in index:
             raise ItemNotFoundError(usage_key)
 
-        path = find_path_to_course()
+        path = find_path_to_course(index)
         if path is None:
             raise NoPathToItem(usage_key)
 
@@ -95,10 +71,9 @@ def path_to_location(modulestore, usage_key):
             for path_index in range(2, n - 1):
                 category = path[path_index].block_type
                 if category == 'sequential' or category == 'videosequence':
-                    section_desc = modulestore.get_item(path[path_index])
-                    # this calls get_children rather than just children b/c old mongo includes private children
-                    # in children but not in get_children
-                    child_locs = [c.location for c in section_desc.get_children()]
+                    # the index leaves out the children which aren't in the branch (e.g. the
+                    # private children old mongo keeps in the published parent), like get_children
+                    child_locs = index.get_children(path[path_index])
                     # positions are 1-indexed, and should be strings to be consistent with
                     # url parsing.
                     position_list.append(str(child_locs.index(path[path_index + 1]) + 1))
@@ -184,19 +184,21 @@ class CachingDescriptorSystem(MakoDescriptorSystem, EditInfoRuntimeMixin):
             block_id=block_key.id,
         )
 
-        converted_fields = self.modulestore.convert_references_to_keys(
-            block_locator.course_key, class_, json_data.get('fields', {}), self.course_entry.structure['blocks'],
-        )
         if block_key in self._parent_map:
             parent_key = self._parent_map[block_key]
             parent = course_key.make_usage_key(parent_key.type, parent_key.id)
         else:
             parent = None
+        # the fields are only deserialized when they are accessed, as most uses of a block access few of them
+        mixed_class = self.modulestore.mixologist.mix(class_)
         kvs = SplitMongoKVS(
             definition_loader,
-            converted_fields,
+            json_data.get('fields', {}),
             parent=parent,
-            field_decorator=kwargs.get('field_decorator')
+            field_decorator=kwargs.get('field_decorator'),
+            field_converter=lambda field_name, value: self.modulestore.convert_reference_to_key(
+                block_locator.course_key, mixed_class, field_name, value
+            ),
         )
 
         if InheritanceMixin in self.modulestore.xblock_mixins:
@@ -13,6 +13,7 @@ from functools import wraps
 from pymongo.errors import AutoReconnect
 from xmodule.exceptions import HeartbeatFailure
 from xmodule.modulestore.split_mongo import BlockKey
+from xmodule.modulestore.tracing import TracedCollection
 import datetime
 import pytz
 
@@ -117,9 +118,9 @@ class MongoConnection(object):
         if user is not None and password is not None:
             self.database.authenticate(user, password)
 
-        self.course_index = self.database[collection + '.active_versions']
-        self.structures = self.database[collection + '.structures']
-        self.definitions = self.database[collection + '.definitions']
+        self.course_index = TracedCollection(self.database, collection + '.active_versions')
+        self.structures = TracedCollection(self.database, collection + '.structures')
+        self.definitions = TracedCollection(self.database, collection + '.definitions')
 
         # every app has write access to the db (v having a flag to indicate r/o v write)
         # Force mongo to report errors, at the expense of performance
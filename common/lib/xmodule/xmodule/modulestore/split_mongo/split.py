@@ -946,24 +946,38 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
 
         if settings is None:
             settings = {}
+        if 'category' in qualifiers:
+            qualifiers['block_type'] = qualifiers.pop('category')
+
+        blocks = course.structure['blocks']
+        if 'block_type' in qualifiers:
+            # only look at the blocks of the matching types
+            block_type = qualifiers.pop('block_type')
+            block_type_index = self._get_block_type_index(course)
+            block_keys = [
+                block_key
+                for matching_type in block_type_index
+                if self._value_matches(matching_type, block_type)
+                for block_key in block_type_index[matching_type]
+            ]
+        else:
+            block_keys = blocks.keys()
+
         if 'name' in qualifiers:
             # odd case where we don't search just confirm
             block_name = qualifiers.pop('name')
             block_ids = []
-            for block_id, block in course.structure['blocks'].iteritems():
-                if block_name == block_id.id and _block_matches_all(block):
+            for block_id in block_keys:
+                if block_name == block_id.id and _block_matches_all(blocks[block_id]):
                     block_ids.append(block_id)
 
             return self._load_items(course, block_ids, lazy=True, **kwargs)
 
-        if 'category' in qualifiers:
-            qualifiers['block_type'] = qualifiers.pop('category')
-
         # don't expect caller to know that children are in fields
         if 'children' in qualifiers:
             settings['children'] = qualifiers.pop('children')
-        for block_id, value in course.structure['blocks'].iteritems():
-            if _block_matches_all(value):
+        for block_id in block_keys:
+            if _block_matches_all(blocks[block_id]):
                 items.append(block_id)
 
         if len(items) > 0:
@@ -993,6 +1007,59 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
             block_id=parent_id.id,
         )
 
+    def _is_unsaved_structure(self, course_key, structure):
+        """
+        Return whether the structure is being edited by a bulk operation, and
+        so may still change under the same id.
+        """
+        bulk_write_record = self._get_bulk_ops_record(course_key)
+        return bulk_write_record.active and structure['_id'] not in bulk_write_record.structures_in_db
+
+    def _get_block_type_index(self, course):
+        """
+        Return a dict of the block types of the course's structure to the keys
+        of its blocks of that type.
+
+        The index is built on first use, and cached for the request, unless the
+        structure is being edited.
+        """
+        structure = course.structure
+        cache = None
+        if self.request_cache is not None and not self._is_unsaved_structure(course.course_key, structure):
+            cache = self.request_cache.data.setdefault('block_type_index', {})
+            block_type_index = cache.get(structure['_id'])
+            if block_type_index is not None:
+                return block_type_index
+
+        block_type_index = defaultdict(list)
+        for block_key in structure['blocks']:
+            block_type_index[block_key.type].append(block_key)
+        block_type_index = dict(block_type_index)
+        if cache is not None:
+            cache[structure['_id']] = block_type_index
+        return block_type_index
+
+    def _get_parent_index_cache_key(self, course_key, **kwargs):
+        """
+        Saved structures are never modified, so the index of a structure is
+        cached across requests under the structure's id. The structure being
+        edited by a bulk operation isn't saved yet, and isn't cached.
+        """
+        course = self._lookup_course(course_key)
+        if self._is_unsaved_structure(course_key, course.structure):
+            return None, False
+        return u"parent_index.{}".format(course.structure['_id']), True
+
+    def _get_course_children(self, course_key, **kwargs):
+        """
+        Read the children of the blocks from the course's structure.
+        """
+        course = self._lookup_course(course_key)
+        return {
+            tuple(block_key): [tuple(child) for child in value['fields'].get('children', [])]
+            for block_key, value in course.structure['blocks'].iteritems()
+        }
+
     def get_orphans(self, course_key, **kwargs):
         """
         Return an array of all of the orphans in the course.
@@ -2143,6 +2210,19 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
         and converting them.
         :param jsonfields: the serialized copy of the xblock's fields
         """
+        xblock_class = self.mixologist.mix(xblock_class)
+        # Make a shallow copy, so that we aren't manipulating a cached field dictionary
+        output_fields = dict(jsonfields)
+        for field_name, value in output_fields.iteritems():
+            output_fields[field_name] = self.convert_reference_to_key(course_key, xblock_class, field_name, value)
+        return output_fields
+
+    def convert_reference_to_key(self, course_key, xblock_class, field_name, value):
+        """
+        Convert the given serialized value of the field to the deserialized value if the field
+        is a reference, and return it. Does not change the given value.
+        :param xblock_class: the xblock class, mixed in with the modulestore's mixins
+        """
         @contract(block_key="BlockUsageLocator | seq[2]")
         def robust_usage_key(block_key):
             """
@@ -2166,22 +2246,15 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
             except KeyError:
                 return course_key.make_usage_key('unknown', block_key.id)
 
-        xblock_class = self.mixologist.mix(xblock_class)
-        # Make a shallow copy, so that we aren't manipulating a cached field dictionary
-        output_fields = dict(jsonfields)
-        for field_name, value in output_fields.iteritems():
-            if value:
-                field = xblock_class.fields.get(field_name)
-                if field is None:
-                    continue
-                elif isinstance(field, Reference):
-                    output_fields[field_name] = robust_usage_key(value)
-                elif isinstance(field, ReferenceList):
-                    output_fields[field_name] = [robust_usage_key(ele) for ele in value]
-                elif isinstance(field, ReferenceValueDict):
-                    for key, subvalue in value.iteritems():
-                        value[key] = robust_usage_key(subvalue)
-        return output_fields
+        if value:
+            field = xblock_class.fields.get(field_name)
+            if isinstance(field, Reference):
+                return robust_usage_key(value)
+            elif isinstance(field, ReferenceList):
+                return [robust_usage_key(ele) for ele in value]
+            elif isinstance(field, ReferenceValueDict):
+                return {key: robust_usage_key(subvalue) for key, subvalue in value.iteritems()}
+        return value
 
     def _get_index_if_valid(self, course_key, force=False):
         """
@@ -19,14 +19,18 @@ class SplitMongoKVS(InheritanceKeyValueStore):
     """
 
     @contract(parent="BlockUsageLocator | None")
-    def __init__(self, definition, initial_values, parent, field_decorator=None):
+    def __init__(self, definition, initial_values, parent, field_decorator=None, field_converter=None):
         """
 
         :param definition: either a lazyloader or definition id for the definition
         :param initial_values: a dictionary of the locally set values
+        :param field_converter: a function (field_name, value) -> value deserializing the initial values,
+            if they are serialized. Each initial value is deserialized when its field is first accessed.
         """
-        # deepcopy so that manipulations of fields does not pollute the source
-        super(SplitMongoKVS, self).__init__(copy.deepcopy(initial_values))
+        super(SplitMongoKVS, self).__init__({})
+        # the initial values whose fields haven't been accessed yet
+        self._unconverted_fields = dict(initial_values)
+        self._field_converter = field_converter
         self._definition = definition  # either a DefinitionLazyLoader or the db id of the definition.
         # if the db id, then the definition is presumed to be loaded into _fields
 
@@ -39,7 +43,19 @@ class SplitMongoKVS(InheritanceKeyValueStore):
         self.parent = parent
 
 
+    def _convert_field(self, field_name):
+        """
+        Move the initial value of the field, if it has one which hasn't been used yet, into _fields
+        """
+        if field_name in self._unconverted_fields:
+            value = self._unconverted_fields.pop(field_name)
+            if self._field_converter is not None:
+                value = self._field_converter(field_name, value)
+            # deepcopy so that manipulations of fields does not pollute the source
+            self._fields[field_name] = copy.deepcopy(value)
+
     def get(self, key):
+        self._convert_field(key.field_name)
         # load the field, if needed
         if key.field_name not in self._fields:
             # parent undefined in editing runtime (I think)
@@ -73,6 +89,7 @@ class SplitMongoKVS(InheritanceKeyValueStore):
             raise InvalidScopeError(key)
         if key.scope == Scope.content:
             self._load_definition()
+        self._unconverted_fields.pop(key.field_name, None)
 
         # set the field
         self._fields[key.field_name] = value
@@ -90,6 +107,7 @@ class SplitMongoKVS(InheritanceKeyValueStore):
             raise InvalidScopeError(key)
         if key.scope == Scope.content:
             self._load_definition()
+        self._unconverted_fields.pop(key.field_name, None)
 
         # delete the field value
         if key.field_name in self._fields:
@@ -113,7 +131,7 @@ class SplitMongoKVS(InheritanceKeyValueStore):
 
         # it's not clear whether inherited values should return True. Right now they don't
         # if someone changes it so that they do, then change any tests of field.name in xx._field_data
-        return key.field_name in self._fields
+        return key.field_name in self._fields or key.field_name in self._unconverted_fields
 
     def _load_definition(self):
         """
@@ -124,5 +142,7 @@ class SplitMongoKVS(InheritanceKeyValueStore):
             if persisted_definition is not None:
                 fields = self._definition.field_converter(persisted_definition.get('fields'))
                 self._fields.update(fields)
+                for field_name in fields:
+                    self._unconverted_fields.pop(field_name, None)
                 # do we want to cache any of the edit_info?
             self._definition = None  # already loaded
@@ -0,0 +1,106 @@
+"""
+Benchmark of loading the outline of a large split course.
+
+Run, with a Mongo server (see `xmodule.modulestore.tests.mongo_connection`), with:
+
+    python -m xmodule.modulestore.tests.benchmark_split_outline [fanout] [repeat]
+
+This is not a test module; it only prints the time taken and the number of
+objects allocated to load every block of a course, `fanout` children deep on
+each of 4 levels, and to read the fields an outline shows (`display_name` and
+`children`), so that they can be compared before and after a change.
+"""
+import gc
+import sys
+import time
+import uuid
+
+import mock
+
+from xmodule.modulestore import ModuleStoreEnum
+from xmodule.modulestore.inheritance import InheritanceMixin
+from xmodule.modulestore.split_mongo.split import SplitMongoModuleStore
+from xmodule.modulestore.tests.mongo_connection import MONGO_PORT_NUM, MONGO_HOST
+
+OUTLINE_BLOCK_TYPES = ['chapter', 'sequential', 'vertical', 'html']
+
+
+def create_course(store, fanout):
+    """
+    Create a course with `fanout` children on each level of OUTLINE_BLOCK_TYPES,
+    and return its key.
+    """
+    user_id = ModuleStoreEnum.UserID.test
+    course = store.create_course('bench', 'outline', uuid.uuid4().hex[:8], user_id)
+    with store.bulk_operations(course.id):
+        parents = [course.location]
+        for block_type in OUTLINE_BLOCK_TYPES:
+            children = []
+            for parent in parents:
+                for index in range(fanout):
+                    child = store.create_child(
+                        user_id, parent, block_type,
+                        fields={'display_name': u'{} {}'.format(block_type, index)}
+                    )
+                    children.append(child.location)
+            parents = children
+    return course.id
+
+
+def load_outline(store, course_key):
+    """
+    Load every block of the course, reading its display_name and children, and
+    return them all.
+    """
+    blocks = []
+    to_visit = [store.get_course(course_key, depth=None)]
+    while to_visit:
+        block = to_visit.pop()
+        blocks.append((block, block.display_name))
+        if block.has_children:
+            to_visit.extend(block.get_children())
+    return blocks
+
+
+def main(fanout=8, repeat=3):
+    """
+    Load the outline of the course `repeat` times and print the best time, and the
+    number of objects the loaded outline holds.
+    """
+    store = SplitMongoModuleStore(
+        None,
+        {
+            'host': MONGO_HOST,
+            'port': MONGO_PORT_NUM,
+            'db': 'benchmark_split_outline',
+            'collection': 'modulestore{}'.format(uuid.uuid4().hex[:5]),
+        },
+        default_class='xmodule.raw_module.RawDescriptor',
+        fs_root='',
+        render_template=mock.Mock(return_value=""),
+        xblock_mixins=(InheritanceMixin,),
+    )
+    try:
+        course_key = create_course(store, fanout)
+
+        seconds = []
+        for __ in range(repeat):
+            start = time.time()
+            load_outline(store, course_key)
+            seconds.append(time.time() - start)
+
+        gc.collect()
+        objects_before = len(gc.get_objects())
+        blocks = load_outline(store, course_key)
+        gc.collect()
+        objects = len(gc.get_objects()) - objects_before
+
+        print "{} blocks".format(len(blocks))
+        print "{:<16} {:>10.3f} s".format('load time', min(seconds))
+        print "{:<16} {:>10d} ({:.1f} per block)".format('objects', objects, float(objects) / len(blocks))
+    finally:
+        store._drop_database()  # pylint: disable=protected-access
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:3]])
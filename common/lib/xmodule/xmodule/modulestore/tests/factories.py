@@ -10,6 +10,7 @@ from opaque_keys.edx.locations import Location
 from opaque_keys.edx.keys import UsageKey
 from xblock.core import XBlock
 from xmodule.tabs import StaticTab
+from xmodule.modulestore.tracing import trace_mongo_calls
 from decorator import contextmanager
 from mock import Mock, patch
 from nose.tools import assert_less_equal, assert_greater_equal
@@ -318,3 +319,26 @@ def check_mongo_calls(num_finds=0, num_sends=None):
                 yield
         else:
             yield
+
+
+@contextmanager
+def check_mongo_operations(max_operations, min_operations=0):
+    """
+    Traces the Mongo operations of the modulestores made in the with statement (see
+    xmodule.modulestore.tracing), and checks that there are between min_operations and
+    max_operations of them. Unlike check_mongo_calls, a find counts once however many
+    batches of results it fetches.
+    """
+    with trace_mongo_calls('check_mongo_operations') as trace:
+        yield
+
+    if not min_operations <= trace.total_count <= max_operations:
+        print "Expected between {} and {} operations, {} were made: {}".format(
+            min_operations,
+            max_operations,
+            trace.total_count,
+            trace.summary(),
+        )
+
+    assert_greater_equal(trace.total_count, min_operations)
+    assert_less_equal(trace.total_count, max_operations)
@@ -191,7 +191,7 @@ class TestContentstore(unittest.TestCase):
             dest_key = dest_course.make_asset_key('asset', filename)
             source = self.contentstore.find(asset_key)
             copied = self.contentstore.find(dest_key)
-            for propname in ['name', 'content_type', 'length', 'locked']:
+            for propname in ['name', 'content_type', 'length', 'locked', 'data']:
                 self.assertEqual(getattr(source, propname), getattr(copied, propname))
 
         __, count = self.contentstore.get_all_content_for_course(dest_course)
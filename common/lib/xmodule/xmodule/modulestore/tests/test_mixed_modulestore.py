@@ -32,7 +32,7 @@ from xmodule.modulestore.exceptions import ItemNotFoundError, DuplicateCourseErr
 from xmodule.modulestore.mixed import MixedModuleStore
 from xmodule.modulestore.search import path_to_location
 from xmodule.modulestore.tests.factories import check_mongo_calls, check_exact_number_of_calls, \
-    mongo_uses_error_check
+    mongo_uses_error_check, check_mongo_operations
 from xmodule.modulestore.tests.mongo_connection import MONGO_PORT_NUM, MONGO_HOST
 from xmodule.tests import DATA_DIR, CourseComparisonTest
 
@@ -954,23 +954,9 @@ class TestMixedModuleStore(CourseComparisonTest):
             (child_to_delete_location, None, ModuleStoreEnum.RevisionOption.published_only),
         ])
 
-    # Draft:
-    #   Problem path:
-    #    1. Get problem
-    #    2-3. count matches definition.children called 2x?
-    #    4. get parent via definition.children query
-    #    5-7. 2 counts and 1 get grandparent via definition.children
-    #    8-10. ditto for great-grandparent
-    #    11-13. ditto for next ancestor
-    #    14. fail count query looking for parent of course (unnecessary)
-    #    15. get course record direct query (not via definition.children) (already fetched in 13)
-    #    16. get items for inheritance computation
-    #    17. get vertical (parent of problem)
-    #    18. get items for inheritance computation (why? caching should handle)
-    #    19-20. get vertical_x1b (? why? this is the only ref in trace) & items for inheritance computation
-    #   Chapter path: get chapter, count parents 2x, get parents, count non-existent grandparents
+    # Draft: read the children of all the published blocks of the course for the parent index
     # Split: active_versions & structure
-    @ddt.data(('draft', [20, 5], 0), ('split', [2, 2], 0))
+    @ddt.data(('draft', [1, 1], 0), ('split', [2, 2], 0))
     @ddt.unpack
     def test_path_to_location(self, default_ms, num_finds, num_sends):
         """
@@ -991,8 +977,10 @@ class TestMixedModuleStore(CourseComparisonTest):
 
             for location, expected in should_work:
                 # each iteration has different find count, pop this iter's find count
-                with check_mongo_calls(num_finds.pop(0), num_sends):
-                    self.assertEqual(path_to_location(self.store, location), expected)
+                expected_finds = num_finds.pop(0)
+                with check_mongo_calls(expected_finds, num_sends):
+                    with check_mongo_operations(expected_finds, expected_finds):
+                        self.assertEqual(path_to_location(self.store, location), expected)
 
         not_found = (
             course_key.make_usage_key('video', 'WelcomeX'),
@@ -1040,6 +1028,33 @@ class TestMixedModuleStore(CourseComparisonTest):
             with self.assertRaises(ItemNotFoundError):
                 path_to_location(self.store, location)
 
+    @ddt.data('draft', 'split')
+    def test_parent_index(self, default_ms):
+        """
+        Make sure that the parent index agrees with get_parent_location, and
+        that it follows the changes to the course's structure
+        """
+        self.initdb(default_ms)
+        self._create_block_hierarchy()
+
+        index = self.store.get_parent_index(self.course.id)
+        for location in (self.problem_x1a_2, self.vertical_x1b, self.sequential_x2, self.chapter_y):
+            self.assertIn(location, index)
+            self.assertEqual(index.get_parent_location(location), self.store.get_parent_location(location))
+        self.assertIsNone(index.get_parent_location(self.course.location))
+        self.assertEqual(
+            index.get_children(self.vertical_x1a),
+            [self.problem_x1a_1, self.problem_x1a_2, self.problem_x1a_3, self.html_x1a_1]
+        )
+
+        problem = self.store.create_child(self.user_id, self.vertical_x1b, 'problem', block_id='Problem_x1b_1')
+        index = self.store.get_parent_index(self.course.id)
+        self.assertEqual(index.get_parent_location(problem.location), self.vertical_x1b)
+        self.assertEqual(index.get_children(self.vertical_x1b), [problem.location])
+
+        self.store.delete_item(problem.location, self.user_id)
+        self.assertNotIn(problem.location, self.store.get_parent_index(self.course.id))
+
     @ddt.data('draft', 'split')
     def test_revert_to_published_root_draft(self, default_ms):
         """
@@ -1130,6 +1145,42 @@ class TestMixedModuleStore(CourseComparisonTest):
         # It does not discard the child vertical, even though that child is a draft (with no published version)
         self.assertEqual(num_children, len(reverted_parent.children))
 
+    @ddt.data('draft', 'split')
+    def test_publish_inherited_settings(self, default_ms):
+        """
+        Test that publishing a vertical publishes the settings its children inherit.
+        """
+        self.initdb(default_ms)
+        self._create_block_hierarchy()
+        self.store.publish(self.course.location, self.user_id)
+
+        vertical = self.store.get_item(self.vertical_x1a)
+        vertical.visible_to_staff_only = True
+        self.store.update_item(vertical, self.user_id)
+        problem = self.store.get_item(self.problem_x1a_1, revision=ModuleStoreEnum.RevisionOption.published_only)
+        self.assertFalse(problem.visible_to_staff_only)
+
+        self.store.publish(self.vertical_x1a, self.user_id)
+        problem = self.store.get_item(self.problem_x1a_1, revision=ModuleStoreEnum.RevisionOption.published_only)
+        self.assertTrue(problem.visible_to_staff_only)
+
+    @ddt.data('draft', 'split')
+    def test_revert_to_published_inherited_settings(self, default_ms):
+        """
+        Test that reverting a vertical reverts the settings its children inherit.
+        """
+        self.initdb(default_ms)
+        self._create_block_hierarchy()
+        self.store.publish(self.course.location, self.user_id)
+
+        vertical = self.store.get_item(self.vertical_x1a)
+        vertical.visible_to_staff_only = True
+        self.store.update_item(vertical, self.user_id)
+        self.assertTrue(self.store.get_item(self.problem_x1a_1).visible_to_staff_only)
+
+        self.store.revert_to_published(self.vertical_x1a, self.user_id)
+        self.assertFalse(self.store.get_item(self.problem_x1a_1).visible_to_staff_only)
+
     # Draft: get all items which can be or should have parents
     # Split: active_versions, structure
     @ddt.data(('draft', 1, 0), ('split', 2, 0))
@@ -1301,16 +1352,15 @@ class TestMixedModuleStore(CourseComparisonTest):
         self.assertEqual(len(self.store.get_courses_for_wiki('no_such_wiki')), 0)
 
     # Draft:
-    #    Find: find vertical, find children
+    #    Find: find both versions of the vertical, then of its children
     #    Sends:
-    #      1. delete all of the published nodes in subtree
-    #      2. insert vertical as published (deleted in step 1) w/ the deleted problems as children
-    #      3-6. insert the 3 problems and 1 html as published
+    #      1. insert the drafts of the vertical, the 3 problems and 1 html
+    #      2. delete all of the published nodes in subtree
     # Split: active_versions, 2 structures (pre & post published?)
     # Sends:
     #    - insert structure
     #    - write index entry
-    @ddt.data(('draft', 2, 6), ('split', 3, 2))
+    @ddt.data(('draft', 2, 2), ('split', 3, 2))
     @ddt.unpack
     def test_unpublish(self, default_ms, max_find, max_send):
         """
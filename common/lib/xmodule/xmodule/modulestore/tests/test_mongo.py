@@ -8,11 +8,13 @@ from path import path
 import pymongo
 import logging
 import shutil
+import tarfile
 from tempfile import mkdtemp
 from uuid import uuid4
 from datetime import datetime
 from pytz import UTC
 import unittest
+from mock import patch
 from xblock.core import XBlock
 
 from xblock.fields import Scope, Reference, ReferenceList, ReferenceValueDict
@@ -27,7 +29,7 @@ from xmodule.modulestore.mongo import MongoKeyValueStore
 from xmodule.modulestore.draft import DraftModuleStore
 from opaque_keys.edx.locations import SlashSeparatedCourseKey, AssetLocation
 from opaque_keys.edx.keys import UsageKey
-from xmodule.modulestore.xml_exporter import export_to_xml
+from xmodule.modulestore.xml_exporter import export_to_xml, export_to_tar
 from xmodule.modulestore.xml_importer import import_from_xml, perform_xlint
 from xmodule.contentstore.mongo import MongoContentStore
 
@@ -215,6 +217,27 @@ class TestMongoModuleStore(unittest.TestCase):
             self.draft_store.get_item(Location('edX', 'toy', '2012_Fall', 'video', 'Welcome')),
         )
 
+    def test_cache_course_descendants(self):
+        """
+        Test that caching all the descendants of a course reads the course in one round-trip,
+        and caches the same items as reading them level by level
+        """
+        for course_number in ['toy', 'simple_with_draft']:
+            course_key = SlashSeparatedCourseKey('edX', course_number, '2012_Fall')
+            course_location = course_key.make_usage_key('course', '2012_Fall')
+            with patch.object(self.draft_store, '_query_children_for_cache_children') as query_children:
+                data = self.draft_store._cache_children(
+                    course_key, [self.draft_store._find_one(course_location)], depth=None
+                )
+                assert_false(query_children.called)
+
+            by_level = self.draft_store._cache_children(
+                course_key, [self.draft_store._find_one(course_location)], depth=100
+            )
+            assert_greater(len(by_level), 1)
+            for location, item in by_level.iteritems():
+                assert_equals(data[location], item)
+
     def test_unicode_loads(self):
         """
         Test that getting items from the test_unicode course works
@@ -505,6 +528,33 @@ class TestMongoModuleStore(unittest.TestCase):
         finally:
             shutil.rmtree(root_dir)
 
+    def test_export_to_tar(self):
+        """
+        Make sure that exporting straight into a tar file writes the same files as exporting
+        into a directory
+        """
+        course_key = SlashSeparatedCourseKey('edX', 'toy', '2012_Fall')
+        root_dir = path(mkdtemp())
+        try:
+            export_to_xml(self.draft_store, self.content_store, course_key, root_dir, 'test_export')
+            with tarfile.open(root_dir / 'test_export.tar.gz', 'w:gz') as tar_file:
+                export_to_tar(self.draft_store, self.content_store, course_key, tar_file, 'test_export')
+
+            exported = {
+                root_dir.relpathto(filepath): filepath.bytes()
+                for filepath in (root_dir / 'test_export').walkfiles()
+            }
+            with tarfile.open(root_dir / 'test_export.tar.gz') as tar_file:
+                tarred = {
+                    member.name: tar_file.extractfile(member).read()
+                    for member in tar_file.getmembers()
+                }
+            assert_in('test_export/course.xml', tarred)
+            assert_in('test_export/policies/assets.json', tarred)
+            assert_equals(exported, tarred)
+        finally:
+            shutil.rmtree(root_dir)
+
     def _create_test_tree(self, name, user_id=None):
         """
         Creates and returns a tree with the following structure:
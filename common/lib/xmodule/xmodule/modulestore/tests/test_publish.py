@@ -90,24 +90,19 @@ class TestPublish(SplitWMongoCourseBoostrapper):
         vert_location = self.old_course_key.make_usage_key('vertical', block_id='Vert1')
         item = self.draft_mongo.get_item(vert_location, 2)
         # Finds:
-        #   1 get draft vert,
-        #   2-10 for each child: (3 children x 3 queries each)
-        #      get draft and then published child
-        #      compute inheritance
-        #   11 get published vert
-        #   12-15 get each ancestor (count then get): (2 x 2),
-        #   16 then fail count of course parent (1)
-        #   17 compute inheritance
-        #   18-19 get draft and published vert
-        # Sends:
-        #   delete the subtree of drafts (1 call),
-        #   update the published version of each node in subtree (4 calls),
-        #   update the ancestors up to course (2 calls)
+        #   1 get the structure of the course
+        #   2 get the drafts of the subtree
+        #   3-4 get draft and published vert
+        #   5 compute inheritance
+        # Sends (in one bulk operation):
+        #   replace the published version of each node in subtree (4 calls) and update the
+        #   ancestors up to course (2 calls)
+        #   delete the subtree of drafts (1 call)
         if mongo_uses_error_check(self.draft_mongo):
-            max_find = 20
+            max_find = 6
         else:
-            max_find = 19
-        with check_mongo_calls(max_find, 7):
+            max_find = 5
+        with check_mongo_calls(max_find, 2):
             self.draft_mongo.publish(item.location, self.user_id)
 
         # verify status
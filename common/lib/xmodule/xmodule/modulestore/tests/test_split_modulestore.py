@@ -8,6 +8,7 @@ import unittest
 import uuid
 from contracts import contract
 from importlib import import_module
+from mock import Mock, patch
 from path import path
 
 from xblock.fields import Reference, ReferenceList, ReferenceValueDict
@@ -911,6 +912,29 @@ class SplitModuleItemTests(SplitModuleTest):
         )
         self.assertEqual(len(matches), 2)
 
+    def test_get_items_block_type_index(self):
+        """
+        get_items only looks at the blocks of the matching types, and indexes them once per request
+        """
+        locator = CourseLocator(org='testx', course='GreekHero', run="run", branch=BRANCH_NAME_DRAFT)
+        request_cache = Mock(data={})
+        with patch.object(modulestore(), 'request_cache', request_cache):
+            matches = modulestore().get_items(locator, qualifiers={'category': re.compile(r'^(chapter|course)$')})
+            self.assertEqual(len(matches), 4)
+            matches = modulestore().get_items(
+                locator, qualifiers={'category': lambda block_type: block_type != 'chapter'}
+            )
+            self.assertEqual(len(matches), 3)
+            matches = modulestore().get_items(locator, qualifiers={'category': 'chapter', 'name': 'chapter1'})
+            self.assertEqual([match.location.block_id for match in matches], ['chapter1'])
+
+            self.assertEqual(len(request_cache.data['block_type_index']), 1)
+            block_type_index = request_cache.data['block_type_index'].values()[0]
+            self.assertEqual(
+                sorted(block_key.id for block_key in block_type_index['chapter']),
+                ['chapter1', 'chapter2', 'chapter3']
+            )
+
     def test_get_parents(self):
         '''
         get_parent_location(locator): BlockUsageLocator
@@ -0,0 +1,55 @@
+"""
+Tests for SplitMongoKVS.
+"""
+import unittest
+
+from mock import Mock
+from xblock.fields import Scope
+from xblock.runtime import KeyValueStore
+
+from opaque_keys.edx.locator import CourseLocator
+from xmodule.modulestore.split_mongo.split_mongo_kvs import SplitMongoKVS
+
+
+class TestSplitMongoKVS(unittest.TestCase):
+    """
+    Tests of the lazy deserialization of the fields of SplitMongoKVS.
+    """
+    def setUp(self):
+        course_key = CourseLocator('org', 'course', 'run', branch='draft')
+        self.children = [['vertical', 'a'], ['vertical', 'b']]
+        self.converter = Mock(side_effect=lambda field_name, value: (
+            [course_key.make_usage_key(*child) for child in value] if field_name == 'children' else value
+        ))
+        self.kvs = SplitMongoKVS(
+            None,
+            {'display_name': 'Chapter', 'children': self.children},
+            parent=None,
+            field_converter=self.converter,
+        )
+        self.children_key = KeyValueStore.Key(Scope.children, None, None, 'children')
+        self.display_name_key = KeyValueStore.Key(Scope.settings, None, None, 'display_name')
+
+    def test_converted_on_access(self):
+        self.assertTrue(self.kvs.has(self.children_key))
+        self.assertFalse(self.converter.called)
+
+        self.assertEqual(self.kvs.get(self.display_name_key), 'Chapter')
+        self.converter.assert_called_once_with('display_name', 'Chapter')
+
+        children = self.kvs.get(self.children_key)
+        self.assertEqual([child.block_id for child in children], ['a', 'b'])
+        self.kvs.get(self.children_key)
+        self.assertEqual(self.converter.call_count, 2)
+
+    def test_source_not_changed(self):
+        kvs = SplitMongoKVS(None, {'children': self.children}, parent=None)
+        kvs.get(self.children_key).append(['vertical', 'c'])
+        self.assertEqual(self.children, [['vertical', 'a'], ['vertical', 'b']])
+
+    def test_set_and_delete_without_converting(self):
+        self.kvs.set(self.display_name_key, 'Renamed')
+        self.assertEqual(self.kvs.get(self.display_name_key), 'Renamed')
+        self.kvs.delete(self.children_key)
+        self.assertFalse(self.kvs.has(self.children_key))
+        self.assertFalse(self.converter.called)
@@ -3,6 +3,7 @@ Tests around our XML modulestore, including importing
 well-formed and not-well-formed XML.
 """
 import os.path
+import threading
 import unittest
 from glob import glob
 from mock import patch
@@ -113,3 +114,71 @@ class TestXMLModuleStore(unittest.TestCase):
             with store.branch_setting(ModuleStoreEnum.Branch.draft_preferred, course_key):
                 # verify that the above context manager raises a ValueError
                 pass  # pragma: no cover
+
+    def test_lazy_loading(self):
+        """
+        Test that a lazy store only loads the courses which are asked for
+        """
+        toy_key = SlashSeparatedCourseKey('edX', 'toy', '2012_Fall')
+        simple_key = SlashSeparatedCourseKey('edX', 'simple', '2012_Fall')
+        with patch.object(XMLModuleStore, 'load_course', autospec=True, side_effect=XMLModuleStore.load_course) as load:
+            store = XMLModuleStore(DATA_DIR, course_dirs=['toy', 'simple'], lazy=True)
+            self.assertFalse(load.called)
+
+            self.assertIsNone(store.has_course(SlashSeparatedCourseKey('edX', 'unknown', '2012_Fall')))
+            self.assertFalse(load.called)
+
+            self.assertEqual(store.get_course(toy_key).id, toy_key)
+            self.assertEqual([call[0][1] for call in load.call_args_list], ['toy'])
+            self.assertTrue(store.has_item(toy_key.make_usage_key('chapter', 'Overview')))
+            self.assertEqual(load.call_count, 1)
+
+            self.assertItemsEqual([course.id for course in store.get_courses()], [toy_key, simple_key])
+            self.assertEqual([call[0][1] for call in load.call_args_list], ['toy', 'simple'])
+
+    def test_lazy_loading_concurrent(self):
+        """
+        Test that a caller asking for a course which another thread is loading waits for it
+        """
+        toy_key = SlashSeparatedCourseKey('edX', 'toy', '2012_Fall')
+        loading = threading.Event()
+        proceed = threading.Event()
+
+        def load_course(store, *args, **kwargs):
+            """ Load the course once the other caller is waiting for it """
+            loading.set()
+            proceed.wait()
+            return XMLModuleStore.load_course(store, *args, **kwargs)
+
+        store = XMLModuleStore(DATA_DIR, course_dirs=['toy'], lazy=True)
+        courses = {}
+
+        def get_course(name):
+            """ Get the toy course in a thread """
+            courses[name] = store.get_course(toy_key)
+
+        with patch.object(XMLModuleStore, 'load_course', autospec=True, side_effect=load_course) as load:
+            first = threading.Thread(target=get_course, args=('first',))
+            first.start()
+            loading.wait()
+            second = threading.Thread(target=get_course, args=('second',))
+            second.start()
+            second.join(0.1)
+            self.assertTrue(second.is_alive())
+            proceed.set()
+            first.join()
+            second.join()
+        self.assertEqual(load.call_count, 1)
+        self.assertEqual(courses['first'].id, toy_key)
+        self.assertIs(courses['second'], courses['first'])
+
+    def test_lazy_loading_unknown_course_id(self):
+        """
+        Test that a lazy store loads the courses whose id can't be read beforehand when a
+        course is asked for
+        """
+        toy_key = SlashSeparatedCourseKey('edX', 'toy', '2012_Fall')
+        with patch.object(XMLModuleStore, '_read_course_id', return_value=None):
+            store = XMLModuleStore(DATA_DIR, course_dirs=['toy', 'simple'], lazy=True)
+        self.assertEqual(store.get_course(toy_key).id, toy_key)
+        self.assertTrue(store.has_item(toy_key.make_usage_key('chapter', 'Overview')))
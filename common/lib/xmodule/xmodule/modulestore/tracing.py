@@ -0,0 +1,258 @@
+"""
+Tracing of the Mongo operations of the modulestores.
+
+The Mongo modulestores (the split MongoConnection's collections and the old
+MongoModuleStore's collection) are TracedCollections, which count and time
+their operations into the traces active in the current thread. The
+application opens a trace per request or task (see request_profiler), and
+tests can open their own:
+
+    with trace_mongo_calls('my test') as trace:
+        modulestore().get_item(location)
+    print trace.counts
+
+A find counts as one operation, whose time includes fetching its results.
+Operations made by other operations (e.g. the find of a find_one) aren't
+counted.
+"""
+from collections import defaultdict
+from contextlib import contextmanager
+import logging
+import threading
+import time
+
+import pymongo.collection
+
+log = logging.getLogger(__name__)
+
+_local = threading.local()
+
+
+class MongoTrace(object):
+    """
+    The Mongo operations made while the trace was active, by operation name
+    ("<collection>.<method>").
+    """
+    def __init__(self, name, budget=None):
+        """
+        Args:
+            name: what is traced (e.g. the name of the view or task)
+            budget: the number of operations above which a warning is logged,
+                or None
+        """
+        self.name = name
+        self.budget = budget
+        self.counts = defaultdict(int)
+        self.times = defaultdict(float)
+
+    def record(self, operation, duration, count=1):
+        """
+        Record `count` calls of `operation`, which took `duration` seconds.
+        """
+        self.counts[operation] += count
+        self.times[operation] += duration
+
+    @property
+    def total_count(self):
+        """
+        The number of operations.
+        """
+        return sum(self.counts.itervalues())
+
+    @property
+    def total_time(self):
+        """
+        The time spent in operations, in seconds.
+        """
+        return sum(self.times.itervalues())
+
+    def over_budget(self):
+        """
+        Return whether more operations than the budget were made.
+        """
+        return self.budget is not None and self.total_count > self.budget
+
+    def summary(self):
+        """
+        Return a readable summary of the operations, the most frequent first.
+        """
+        return u", ".join(
+            u"{}: {} in {:.3f}s".format(operation, self.counts[operation], self.times[operation])
+            for operation in sorted(self.counts, key=self.counts.get, reverse=True)
+        )
+
+
+def _active_traces():
+    """
+    Return the list of the traces active in the current thread.
+    """
+    traces = getattr(_local, 'traces', None)
+    if traces is None:
+        traces = _local.traces = []
+    return traces
+
+
+@contextmanager
+def trace_mongo_calls(name, budget=None):
+    """
+    Trace the Mongo operations of the modulestores made by the contained code,
+    and log a warning if there are more than `budget`.
+
+    Traces can be nested: the operations are recorded in all the active traces.
+    The name and budget of the trace can be changed until it ends.
+    """
+    trace = MongoTrace(name, budget)
+    traces = _active_traces()
+    traces.append(trace)
+    try:
+        yield trace
+    finally:
+        traces.remove(trace)
+        if trace.over_budget():
+            log.warning(
+                u"%s made %d modulestore Mongo operations (budget %d) in %.3fs: %s",
+                trace.name, trace.total_count, trace.budget, trace.total_time, trace.summary()
+            )
+
+
+@contextmanager
+def _traced(operation, count=1):
+    """
+    Record the contained code as `operation` in the active traces, unless it
+    is nested in another traced operation.
+    """
+    traces = getattr(_local, 'traces', None)
+    if not traces or getattr(_local, 'tracing', False):
+        yield
+        return
+
+    _local.tracing = True
+    start = time.time()
+    try:
+        yield
+    finally:
+        _local.tracing = False
+        duration = time.time() - start
+        for trace in traces:
+            trace.record(operation, duration, count)
+
+
+def _traced_method(method_name):
+    """
+    Return a method which traces the `method_name` method of Collection.
+    """
+    method = getattr(pymongo.collection.Collection, method_name)
+
+    def traced_method(self, *args, **kwargs):  # pylint: disable=missing-docstring
+        with _traced(u"{}.{}".format(self.name, method_name)):
+            return method(self, *args, **kwargs)
+    traced_method.__name__ = method_name
+    traced_method.__doc__ = method.__doc__
+    return traced_method
+
+
+class TracedCursor(object):
+    """
+    Wraps a Cursor, to trace its query as one operation, with the time
+    spent fetching its results.
+    """
+    CHAINED_METHODS = ('sort', 'limit', 'skip', 'batch_size', 'hint', 'max_scan', 'where', 'rewind')
+
+    def __init__(self, cursor, operation):
+        self._cursor = cursor
+        self._operation = operation
+        self._counted = False
+
+    def __getattr__(self, name):
+        attr = getattr(self._cursor, name)
+        if name not in self.CHAINED_METHODS:
+            return attr
+
+        def chained(*args, **kwargs):  # pylint: disable=missing-docstring
+            attr(*args, **kwargs)
+            return self
+        return chained
+
+    def __iter__(self):
+        return self
+
+    def __getitem__(self, index):
+        result = self._cursor[index]
+        return self if result is self._cursor else result
+
+    def next(self):
+        """
+        Return the next document, tracing the time it took.
+        """
+        with _traced(self._operation, count=0 if self._counted else 1):
+            self._counted = True
+            return self._cursor.next()
+
+    def count(self, *args, **kwargs):
+        """
+        Count the documents matching the query.
+        """
+        with _traced(u"{}.count".format(self._cursor.collection.name)):
+            return self._cursor.count(*args, **kwargs)
+
+
+class TracedBulkOperation(object):
+    """
+    Wraps a BulkOperationBuilder, to trace its execution as one operation.
+    """
+    def __init__(self, bulk, operation):
+        self._bulk = bulk
+        self._operation = operation
+
+    def __getattr__(self, name):
+        return getattr(self._bulk, name)
+
+    def execute(self, *args, **kwargs):
+        """
+        Execute the operations, tracing the time it took.
+        """
+        with _traced(self._operation):
+            return self._bulk.execute(*args, **kwargs)
+
+
+class TracedCollection(pymongo.collection.Collection):
+    """
+    A Collection which traces its operations.
+    """
+    def find(self, *args, **kwargs):
+        """
+        Return a TracedCursor of the query.
+        """
+        return TracedCursor(
+            super(TracedCollection, self).find(*args, **kwargs),
+            u"{}.find".format(self.name)
+        )
+
+    find_one = _traced_method('find_one')
+    insert = _traced_method('insert')
+    save = _traced_method('save')
+    update = _traced_method('update')
+    remove = _traced_method('remove')
+    find_and_modify = _traced_method('find_and_modify')
+    count = _traced_method('count')
+
+    def initialize_ordered_bulk_op(self):
+        """
+        Return a TracedBulkOperation of ordered operations.
+        """
+        return TracedBulkOperation(
+            super(TracedCollection, self).initialize_ordered_bulk_op(),
+            u"{}.bulk_write".format(self.name)
+        )
+
+    def initialize_unordered_bulk_op(self):
+        """
+        Return a TracedBulkOperation of unordered operations.
+        """
+        return TracedBulkOperation(
+            super(TracedCollection, self).initialize_unordered_bulk_op(),
+            u"{}.bulk_write".format(self.name)
+        )
+
+    aggregate = _traced_method('aggregate')
+    distinct = _traced_method('distinct')
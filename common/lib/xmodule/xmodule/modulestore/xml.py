@@ -6,8 +6,9 @@ import os
 import re
 import sys
 import glob
+import threading
 
-from collections import defaultdict
+from collections import defaultdict, OrderedDict
 from cStringIO import StringIO
 from fs.osfs import OSFS
 from importlib import import_module
@@ -207,7 +208,7 @@ class ImportSystem(XMLParsingSystem, MakoDescriptorSystem):
 
             descriptor.data_dir = course_dir
 
-            xmlstore.modules[course_id][descriptor.scope_ids.usage_id] = descriptor
+            xmlstore._modules[course_id][descriptor.scope_ids.usage_id] = descriptor  # pylint: disable=protected-access
 
             if descriptor.has_children:
                 for child in descriptor.get_children():
@@ -370,7 +371,7 @@ class XMLModuleStore(ModuleStoreReadBase):
     """
     def __init__(
         self, data_dir, default_class=None, course_dirs=None, course_ids=None,
-        load_error_modules=True, i18n_service=None, fs_service=None, **kwargs
+        load_error_modules=True, i18n_service=None, fs_service=None, lazy=False, **kwargs
     ):
         """
         Initialize an XMLModuleStore from data_dir
@@ -383,16 +384,20 @@ class XMLModuleStore(ModuleStoreReadBase):
 
             course_dirs or course_ids (list of str): If specified, the list of course_dirs or course_ids to load. Otherwise,
                 load all courses. Note, providing both
+
+            lazy (bool): If True, only read the ids of the courses here, and load each course the
+                first time it is asked for (all of them when they are listed).
         """
         super(XMLModuleStore, self).__init__(**kwargs)
 
         self.data_dir = path(data_dir)
-        self.modules = defaultdict(dict)  # course_id -> dict(location -> XBlock)
-        self.courses = {}  # course_dir -> XBlock for the course
+        self._modules = defaultdict(dict)  # course_id -> dict(location -> XBlock)
+        self._courses = {}  # course_dir -> XBlock for the course
         self.errored_courses = {}  # course_dir -> errorlog, for dirs that failed to load
 
         if course_ids is not None:
             course_ids = [SlashSeparatedCourseKey.from_deprecated_string(course_id) for course_id in course_ids]
+        self._course_ids = course_ids
 
         self.load_error_modules = load_error_modules
 
@@ -419,8 +424,79 @@ class XMLModuleStore(ModuleStoreReadBase):
         if course_dirs is None:
             course_dirs = sorted([d for d in os.listdir(self.data_dir) if
                                   os.path.exists(self.data_dir / d / "course.xml")])
+        # course_dir -> course_id (None if it can't be read without loading the course), for the
+        # dirs of the courses which are not loaded yet
+        self._unloaded_course_dirs = OrderedDict()
+        self._load_lock = threading.RLock()
+        self._loading_course_dirs = set()
         for course_dir in course_dirs:
-            self.try_load_course(course_dir, course_ids)
+            if lazy:
+                course_id = self._read_course_id(course_dir)
+                if course_ids is None or course_id is None or course_id in course_ids:
+                    self._unloaded_course_dirs[course_dir] = course_id
+            else:
+                self.try_load_course(course_dir, course_ids)
+
+    @property
+    def modules(self):
+        """
+        course_id -> dict(location -> XBlock), for all the courses, which are loaded if need be
+        """
+        self._load_courses()
+        return self._modules
+
+    @property
+    def courses(self):
+        """
+        course_dir -> XBlock for the course, for all the courses, which are loaded if need be
+        """
+        self._load_courses()
+        return self._courses
+
+    def _read_course_id(self, course_dir):
+        """
+        Return the id of the course in course_dir, read from the root element of its course.xml
+        the way load_course reads it, or None if it can't be read.
+        """
+        try:
+            with open(self.data_dir / course_dir / "course.xml") as course_file:
+                course_file = StringIO(clean_out_mako_templating(course_file.read()))
+                __, course_data = next(etree.iterparse(course_file, events=('start',)))
+            url_name = course_data.get('url_name', course_data.get('slug'))
+            if not url_name and course_data.get('name'):
+                url_name = Location.clean(course_data.get('name'))
+            if not url_name:
+                return None
+            return SlashSeparatedCourseKey(
+                course_data.get('org', 'edx'), course_data.get('course', course_dir), url_name
+            )
+        except Exception:  # pylint: disable=broad-except
+            # load_course will report what is wrong with the course
+            return None
+
+    def _load_courses(self, course_id=None):
+        """
+        Load the courses which are not loaded yet (see `lazy`): the course course_id, or all of
+        them if course_id is None. The courses whose id couldn't be read before loading them
+        may be course_id, so they are loaded too.
+        """
+        # a course dir is only removed once its course is loaded, so that the callers wait for
+        # the courses being loaded by another thread
+        if not self._unloaded_course_dirs:
+            return
+        with self._load_lock:
+            for course_dir, unloaded_id in self._unloaded_course_dirs.items():
+                if course_id is not None and unloaded_id is not None and unloaded_id != course_id:
+                    continue
+                # the course may have been loaded, or be being loaded by this thread, while
+                # loading another one
+                if course_dir in self._unloaded_course_dirs and course_dir not in self._loading_course_dirs:
+                    self._loading_course_dirs.add(course_dir)
+                    try:
+                        self.try_load_course(course_dir, self._course_ids)
+                    finally:
+                        self._loading_course_dirs.discard(course_dir)
+                        del self._unloaded_course_dirs[course_dir]
 
     def try_load_course(self, course_dir, course_ids=None):
         '''
@@ -449,7 +525,7 @@ class XMLModuleStore(ModuleStoreReadBase):
             # Didn't load course.  Instead, save the errors elsewhere.
             self.errored_courses[course_dir] = errorlog
         else:
-            self.courses[course_dir] = course_descriptor
+            self._courses[course_dir] = course_descriptor
             self._course_errors[course_descriptor.id] = errorlog
             self.parent_trackers[course_descriptor.id].make_known(course_descriptor.scope_ids.usage_id)
 
@@ -458,7 +534,7 @@ class XMLModuleStore(ModuleStoreReadBase):
         String representation - for debugging
         '''
         return '<XMLModuleStore data_dir=%r, %d courses, %d modules>' % (
-            self.data_dir, len(self.courses), len(self.modules)
+            self.data_dir, len(self._courses), len(self._modules)
         )
 
     def load_policy(self, policy_path, tracker):
@@ -692,7 +768,7 @@ class XMLModuleStore(ModuleStoreReadBase):
                         module.data_dir = course_dir
                         module.save()
 
-                        self.modules[course_descriptor.id][module.scope_ids.usage_id] = module
+                        self._modules[course_descriptor.id][module.scope_ids.usage_id] = module
                 except Exception as exc:  # pylint: disable=broad-except
                     logging.exception("Failed to load %s. Skipping... \
                             Exception: %s", filepath, unicode(exc))
@@ -702,7 +778,8 @@ class XMLModuleStore(ModuleStoreReadBase):
         """
         Returns True if location exists in this ModuleStore.
         """
-        return usage_key in self.modules[usage_key.course_key]
+        self._load_courses(usage_key.course_key)
+        return usage_key in self._modules[usage_key.course_key]
 
     def get_item(self, usage_key, depth=0, **kwargs):
         """
@@ -716,8 +793,9 @@ class XMLModuleStore(ModuleStoreReadBase):
 
         usage_key: a UsageKey that matches the module we are looking for.
         """
+        self._load_courses(usage_key.course_key)
         try:
-            return self.modules[usage_key.course_key][usage_key]
+            return self._modules[usage_key.course_key][usage_key]
         except KeyError:
             raise ItemNotFoundError(usage_key)
 
@@ -765,7 +843,8 @@ class XMLModuleStore(ModuleStoreReadBase):
                 for fields in [settings, content, qualifiers]
             )
 
-        for mod_loc, module in self.modules[course_id].iteritems():
+        self._load_courses(course_id)
+        for mod_loc, module in self._modules[course_id].iteritems():
             if _block_matches_all(mod_loc, module):
                 items.append(module)
 
@@ -787,11 +866,40 @@ class XMLModuleStore(ModuleStoreReadBase):
         """
         return self.courses.values()
 
+    def get_course(self, course_id, depth=0, **kwargs):
+        """
+        Returns the course descriptor of course_id, or None if there is no such course,
+        loading only that course if need be.
+        """
+        self._load_courses(course_id)
+        for course in self._courses.itervalues():
+            if course.id == course_id:
+                return course
+        return None
+
+    def has_course(self, course_id, ignore_case=False, **kwargs):
+        """
+        Returns the course_id of the course if it was found, else None.
+        See ModuleStoreRead.has_course.
+        """
+        if ignore_case:
+            return super(XMLModuleStore, self).has_course(course_id, ignore_case, **kwargs)
+        course = self.get_course(course_id)
+        return course.id if course is not None else None
+
+    def get_course_errors(self, course_key):
+        """
+        Return list of errors for this :class:`.CourseKey`, if any.
+        """
+        self._load_courses(course_key)
+        return super(XMLModuleStore, self).get_course_errors(course_key)
+
     def get_errored_courses(self):
         """
         Return a dictionary of course_dir -> [(msg, exception_str)], for each
         course_dir where course loading failed.
         """
+        self._load_courses()
         return dict((k, self.errored_courses[k].errors) for k in self.errored_courses)
 
     def get_orphans(self, course_key, **kwargs):
@@ -807,6 +915,7 @@ class XMLModuleStore(ModuleStoreReadBase):
         '''Find the location that is the parent of this location in this
         course.  Needed for path_to_location().
         '''
+        self._load_courses(location.course_key)
         if not self.parent_trackers[location.course_key].is_known(location):
             raise ItemNotFoundError("{0} not in {1}".format(location, location.course_key))
 
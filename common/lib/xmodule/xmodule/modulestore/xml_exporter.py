@@ -4,6 +4,10 @@ Methods for exporting course data to XML
 
 import logging
 import lxml.etree
+import posixpath
+import tarfile
+import time
+from StringIO import StringIO
 from xblock.fields import Scope, Reference, ReferenceList, ReferenceValueDict
 from xmodule.contentstore.content import StaticContent
 from xmodule.exceptions import NotFoundError
@@ -26,6 +30,74 @@ EXPORT_VERSION_KEY = "export_format"
 DEFAULT_CONTENT_FIELDS = ['metadata', 'data']
 
 
+class TarExportFS(object):
+    """
+    A write only filesystem which adds the files written into it to an open
+    `tarfile.TarFile`, under `base_path`.
+
+    It implements the part of the pyfilesystem API (from the fs package) which
+    exporting a course uses, so that a course can be exported straight into a
+    tar file rather than into a directory which is then archived.
+    """
+    def __init__(self, tar_file, base_path=''):
+        self.tar_file = tar_file
+        self.base_path = base_path
+
+    def _tar_path(self, path):
+        """
+        Return the path in the tar file of `path`.
+        """
+        return posixpath.normpath(posixpath.join(self.base_path, path.lstrip('/')))
+
+    def makedir(self, path, recursive=False, allow_recreate=False):  # pylint: disable=unused-argument
+        """
+        Directories are implied by the paths of the files in the tar file, so do nothing.
+        """
+        pass
+
+    def makeopendir(self, path, recursive=False):  # pylint: disable=unused-argument
+        """
+        Return the filesystem of the directory `path`.
+        """
+        return TarExportFS(self.tar_file, self._tar_path(path))
+
+    opendir = makeopendir
+
+    def open(self, path, mode='r', **kwargs):  # pylint: disable=unused-argument
+        """
+        Return a file which is added to the tar file at `path` when it's closed.
+        """
+        if 'w' not in mode:
+            raise IOError(u"Can't read from a tar export: {}".format(path))
+        return _TarExportFile(self.tar_file, self._tar_path(path))
+
+
+class _TarExportFile(StringIO):
+    """
+    A file of a TarExportFS, kept in memory until it's closed and added to the tar file.
+    """
+    def __init__(self, tar_file, tar_path):
+        StringIO.__init__(self)
+        self.tar_file = tar_file
+        self.tar_path = tar_path
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        if self.closed:
+            return
+        info = tarfile.TarInfo(self.tar_path)
+        info.size = self.len
+        info.mtime = time.time()
+        self.seek(0)
+        self.tar_file.addfile(info, self)
+        StringIO.close(self)
+
+
 def export_to_xml(modulestore, contentstore, course_key, root_dir, course_dir):
     """
     Export all modules from `modulestore` and content from `contentstore` as xml to `root_dir`.
@@ -36,12 +108,30 @@ def export_to_xml(modulestore, contentstore, course_key, root_dir, course_dir):
     `root_dir`: The directory to write the exported xml to
     `course_dir`: The name of the directory inside `root_dir` to write the course content to
     """
+    fsm = OSFS(root_dir)
+    _export_to_fs(modulestore, contentstore, course_key, fsm.makeopendir(course_dir))
+
+
+def export_to_tar(modulestore, contentstore, course_key, tar_file, course_dir):
+    """
+    Export the course like `export_to_xml`, but straight into `tar_file`, an open
+    `tarfile.TarFile` (e.g. of mode 'w:gz'), without writing it to disk first.
+
+    `course_dir`: The name of the directory of the tar file to write the course content to
+    """
+    _export_to_fs(modulestore, contentstore, course_key, TarExportFS(tar_file, course_dir))
+
+
+def _export_to_fs(modulestore, contentstore, course_key, export_fs):
+    """
+    Export all modules from `modulestore` and content from `contentstore` as xml to
+    `export_fs`, a pyfilesystem object (from the fs package).
+    """
 
     with modulestore.bulk_operations(course_key):
 
         course = modulestore.get_course(course_key, depth=None)  # None means infinite
-        fsm = OSFS(root_dir)
-        export_fs = course.runtime.export_fs = fsm.makeopendir(course_dir)
+        course.runtime.export_fs = export_fs
 
         root = lxml.etree.Element('unknown')
 
@@ -59,11 +149,7 @@ def export_to_xml(modulestore, contentstore, course_key, root_dir, course_dir):
         # export the static assets
         policies_dir = export_fs.makeopendir('policies')
         if contentstore:
-            contentstore.export_all_for_course(
-                course_key,
-                root_dir + '/' + course_dir + '/static/',
-                root_dir + '/' + course_dir + '/policies/assets.json',
-            )
+            contentstore.export_all_for_course_to_fs(course_key, export_fs)
 
             # If we are using the default course image, export it to the
             # legacy location to support backwards compatibility.
@@ -78,10 +164,8 @@ def export_to_xml(modulestore, contentstore, course_key, root_dir, course_dir):
                 except NotFoundError:
                     pass
                 else:
-                    output_dir = root_dir + '/' + course_dir + '/static/images/'
-                    if not os.path.isdir(output_dir):
-                        os.makedirs(output_dir)
-                    with OSFS(output_dir).open('course_image.jpg', 'wb') as course_image_file:
+                    export_fs.makedir('static/images', recursive=True, allow_recreate=True)
+                    with export_fs.open('static/images/course_image.jpg', 'wb') as course_image_file:
                         course_image_file.write(course_image.data)
 
         # export the static tabs
@@ -15,11 +15,12 @@ from collections import OrderedDict
 from lxml import etree
 from pkg_resources import resource_string
 
+from xmodule.fields import Counts
 from xmodule.x_module import XModule
 from xmodule.stringify import stringify_children
 from xmodule.mako_module import MakoModuleDescriptor
 from xmodule.xml_module import XmlDescriptor
-from xblock.fields import Scope, String, Dict, Boolean, List
+from xblock.fields import Scope, String, Boolean, List
 
 log = logging.getLogger(__name__)
 
@@ -30,7 +31,7 @@ class PollFields(object):
 
     voted = Boolean(help="Whether this student has voted on the poll", scope=Scope.user_state, default=False)
     poll_answer = String(help="Student answer", scope=Scope.user_state, default='')
-    poll_answers = Dict(help="Poll answers from all students", scope=Scope.user_state_summary)
+    poll_answers = Counts(help="Poll answers from all students", scope=Scope.user_state_summary)
 
     # List of answers, in the form {'id': 'some id', 'text': 'the answer text'}
     answers = List(help="Poll answers from xml", scope=Scope.content, default=[])
@@ -58,33 +59,32 @@ class PollModule(PollFields, XModule):
         Returns:
             json string
         """
-        if dispatch in self.poll_answers and not self.voted:
-            # FIXME: fix this, when xblock will support mutable types.
-            # Now we use this hack.
-            temp_poll_answers = self.poll_answers
-            temp_poll_answers[dispatch] += 1
-            self.poll_answers = temp_poll_answers
+        if dispatch in self.all_poll_answers() and not self.voted:
+            # Change a copy of the counts, so that only the change is written.
+            poll_answers = dict(self.poll_answers or {})
+            poll_answers[dispatch] = poll_answers.get(dispatch, 0) + 1
+            self.poll_answers = poll_answers
 
             self.voted = True
             self.poll_answer = dispatch
-            return json.dumps({'poll_answers': self.poll_answers,
-                               'total': sum(self.poll_answers.values()),
+            poll_answers = self.all_poll_answers()
+            return json.dumps({'poll_answers': poll_answers,
+                               'total': sum(poll_answers.values()),
                                'callback': {'objectName': 'Conditional'}
                                })
         elif dispatch == 'get_state':
+            poll_answers = self.all_poll_answers()
             return json.dumps({'poll_answer': self.poll_answer,
-                               'poll_answers': self.poll_answers,
-                               'total': sum(self.poll_answers.values())
+                               'poll_answers': poll_answers,
+                               'total': sum(poll_answers.values())
                                })
         elif dispatch == 'reset_poll' and self.voted and \
                 self.descriptor.xml_attributes.get('reset', 'True').lower() != 'false':
             self.voted = False
 
-            # FIXME: fix this, when xblock will support mutable types.
-            # Now we use this hack.
-            temp_poll_answers = self.poll_answers
-            temp_poll_answers[self.poll_answer] -= 1
-            self.poll_answers = temp_poll_answers
+            poll_answers = dict(self.poll_answers or {})
+            poll_answers[self.poll_answer] = poll_answers.get(self.poll_answer, 0) - 1
+            self.poll_answers = poll_answers
 
             self.poll_answer = ''
             return json.dumps({'status': 'success'})
@@ -102,37 +102,32 @@ class PollModule(PollFields, XModule):
         self.content = self.system.render_template('poll.html', params)
         return self.content
 
+    def all_poll_answers(self):
+        """
+        Return the counts of the answers of all students, including the
+        answers nobody chose yet.
+        """
+        poll_answers = dict((answer['id'], 0) for answer in self.answers)
+        poll_answers.update(self.poll_answers or {})
+        return poll_answers
+
     def dump_poll(self):
         """Dump poll information.
 
         Returns:
             string - Serialize json.
         """
-        # FIXME: hack for resolving caching `default={}` during definition
-        # poll_answers field
-        if self.poll_answers is None:
-            self.poll_answers = {}
-
         answers_to_json = OrderedDict()
-
-        # FIXME: fix this, when xblock support mutable types.
-        # Now we use this hack.
-        temp_poll_answers = self.poll_answers
-
-         # Fill self.poll_answers, prepare data for template context.
         for answer in self.answers:
-            # Set default count for answer = 0.
-            if answer['id'] not in temp_poll_answers:
-                temp_poll_answers[answer['id']] = 0
             answers_to_json[answer['id']] = cgi.escape(answer['text'])
-        self.poll_answers = temp_poll_answers
+        poll_answers = self.all_poll_answers()
 
         return json.dumps({'answers': answers_to_json,
             'question': cgi.escape(self.question),
             # to show answered poll after reload:
             'poll_answer': self.poll_answer,
-            'poll_answers': self.poll_answers if self.voted else {},
-            'total': sum(self.poll_answers.values()) if self.voted else 0,
+            'poll_answers': poll_answers if self.voted else {},
+            'total': sum(poll_answers.values()) if self.voted else 0,
             'reset': str(self.descriptor.xml_attributes.get('reset', 'true')).lower()})
 
 
@@ -13,6 +13,7 @@ from pkg_resources import resource_string
 from xmodule.raw_module import EmptyDataRawDescriptor
 from xmodule.editing_module import MetadataOnlyEditingDescriptor
 from xmodule.x_module import XModule
+from xmodule.fields import Counts
 
 from xblock.fields import Scope, Dict, Boolean, List, Integer, String
 
@@ -72,10 +73,11 @@ class WordCloudFields(object):
         scope=Scope.user_state,
         default=[]
     )
-    all_words = Dict(
+    all_words = Counts(
         help=_("All possible words from all students."),
         scope=Scope.user_state_summary
     )
+    # No longer written: the top words are computed from all_words.
     top_words = Dict(
         help=_("Top num_top_words words for word cloud."),
         scope=Scope.user_state_summary
@@ -108,7 +110,10 @@ class WordCloudModule(WordCloudFields, XModule):
                     word: self.all_words[word] for word in self.student_words
                 },
                 'total_count': total_count,
-                'top_words': self.prepare_words(self.top_words, total_count)
+                'top_words': self.prepare_words(
+                    self.top_dict(self.all_words, self.num_top_words),
+                    total_count
+                )
             })
         else:
             return json.dumps({
@@ -200,26 +205,15 @@ class WordCloudModule(WordCloudFields, XModule):
 
             self.student_words = student_words
 
-            # FIXME: fix this, when xblock will support mutable types.
-            # Now we use this hack.
-            # speed issues
-            temp_all_words = self.all_words
+            # Write a copy of all_words, so that the runtime can count
+            # the words added by this student.
+            all_words = dict(self.all_words or {})
+            for word in student_words:
+                all_words[word] = all_words.get(word, 0) + 1
+            self.all_words = all_words
 
             self.submitted = True
 
-            # Save in all_words.
-            for word in self.student_words:
-                temp_all_words[word] = temp_all_words.get(word, 0) + 1
-
-            # Update top_words.
-            self.top_words = self.top_dict(
-                temp_all_words,
-                self.num_top_words
-            )
-
-            # Save all_words in database.
-            self.all_words = temp_all_words
-
             return self.get_state()
         elif dispatch == 'get_state':
             return self.get_state()
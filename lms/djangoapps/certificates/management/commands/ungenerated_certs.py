@@ -28,6 +28,9 @@ class Command(BaseCommand):
 
     Use the --noop option to test without actually putting certificates on the
     queue to be generated.
+
+    Use the --batch-size option to request the certificates of several students
+    at a time, which is faster for large courses.
     """
 
     option_list = BaseCommand.option_list + (
@@ -55,6 +58,13 @@ class Command(BaseCommand):
                     'whose entry in the certificate table matches STATUS. '
                     'STATUS can be generating, unavailable, deleted, error '
                     'or notpassing.'),
+        make_option('-b', '--batch-size',
+                    metavar='SIZE',
+                    dest='batch_size',
+                    type='int',
+                    default=0,
+                    help='Grade students and send their certificate requests '
+                    'in batches of SIZE students, rather than one at a time'),
     )
 
     def handle(self, *args, **options):
@@ -97,6 +107,7 @@ class Command(BaseCommand):
             total = enrolled_students.count()
             count = 0
             start = datetime.datetime.now(UTC)
+            batch = []
 
             for student in enrolled_students:
                 count += 1
@@ -114,8 +125,27 @@ class Command(BaseCommand):
 
                 if certificate_status_for_student(
                         student, course_key)['status'] in valid_statuses:
-                    if not options['noop']:
+                    if options['noop']:
+                        continue
+                    if options['batch_size']:
+                        batch.append(student)
+                        if len(batch) >= options['batch_size']:
+                            self._add_certs(xq, batch, course_key, course)
+                            batch = []
+                    else:
                         # Add the certificate request to the queue
                         ret = xq.add_cert(student, course_key, course=course)
                         if ret == 'generating':
                             print '{0} - {1}'.format(student, ret)
+
+            if batch:
+                self._add_certs(xq, batch, course_key, course)
+
+    def _add_certs(self, xq, students, course_key, course):
+        """
+        Add the certificate requests of a batch of students to the queue.
+        """
+        statuses = xq.add_certs(students, course_key, course=course)
+        for student in students:
+            if statuses[student.id] == 'generating':
+                print '{0} - {1}'.format(student, statuses[student.id])
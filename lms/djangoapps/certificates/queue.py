@@ -8,6 +8,7 @@ from django.test.client import RequestFactory
 from capa.xqueue_interface import XQueueInterface
 from capa.xqueue_interface import make_xheader, make_hashkey
 from django.conf import settings
+from requests.adapters import HTTPAdapter
 from requests.auth import HTTPBasicAuth
 from student.models import UserProfile, CourseEnrollment
 from verify_student.models import SoftwareSecurePhotoVerification
@@ -16,6 +17,7 @@ import json
 import random
 import logging
 import lxml.html
+from multiprocessing.pool import ThreadPool
 from lxml.etree import XMLSyntaxError, ParserError
 
 
@@ -53,6 +55,13 @@ class XQueueCertInterface(object):
 
     """
 
+    # Statuses from which a new certificate can be requested.
+    VALID_STATUSES = [status.generating,
+                      status.unavailable,
+                      status.deleted,
+                      status.error,
+                      status.notpassing]
+
     def __init__(self, request=None):
 
         # Get basic auth (username/password) for
@@ -153,17 +162,11 @@ class XQueueCertInterface(object):
         Returns the student's status
         """
 
-        VALID_STATUSES = [status.generating,
-                          status.unavailable,
-                          status.deleted,
-                          status.error,
-                          status.notpassing]
-
         cert_status = certificate_status_for_student(student, course_id)['status']
 
         new_status = cert_status
 
-        if cert_status in VALID_STATUSES:
+        if cert_status in self.VALID_STATUSES:
             # grade the student
 
             # re-use the course passed in optionally so we don't have to re-fetch everything
@@ -171,81 +174,183 @@ class XQueueCertInterface(object):
             if course is None:
                 course = courses.get_course_by_id(course_id)
             profile = UserProfile.objects.get(user=student)
-            profile_name = profile.name
 
             # Needed
             self.request.user = student
             self.request.session = {}
 
-            course_name = course.display_name or course_id.to_deprecated_string()
-            is_whitelisted = self.whitelist.filter(user=student, course_id=course_id, whitelist=True).exists()
             grade = grades.grade(student, self.request, course)
             enrollment_mode, __ = CourseEnrollment.enrollment_mode_for_user(student, course_id)
-            mode_is_verified = (enrollment_mode == GeneratedCertificate.MODES.verified)
-            user_is_verified = SoftwareSecurePhotoVerification.user_is_verified(student)
-            user_is_reverified = SoftwareSecurePhotoVerification.user_is_reverified_for_all(course_id, student)
-            cert_mode = enrollment_mode
-            if (mode_is_verified and user_is_verified and user_is_reverified):
-                template_pdf = "certificate-template-{id.org}-{id.course}-verified.pdf".format(id=course_id)
-            elif (mode_is_verified and not (user_is_verified and user_is_reverified)):
-                template_pdf = "certificate-template-{id.org}-{id.course}.pdf".format(id=course_id)
-                cert_mode = GeneratedCertificate.MODES.honor
-            else:
-                # honor code and audit students
-                template_pdf = "certificate-template-{id.org}-{id.course}.pdf".format(id=course_id)
-            if forced_grade:
-                grade['grade'] = forced_grade
-
-            cert, __ = GeneratedCertificate.objects.get_or_create(user=student, course_id=course_id)
-
-            cert.mode = cert_mode
-            cert.user = student
-            cert.grade = grade['percent']
-            cert.course_id = course_id
-            cert.name = profile_name
-            # Strip HTML from grade range label
-            grade_contents = grade.get('grade', None)
+            new_status, contents, key = self._update_cert(
+                student, course_id, course, grade,
+                profile_name=profile.name,
+                enrollment_mode=enrollment_mode,
+                is_whitelisted=self.whitelist.filter(user=student, course_id=course_id, whitelist=True).exists(),
+                is_restricted=self.restricted.filter(user=student).exists(),
+                forced_grade=forced_grade,
+                template_file=template_file,
+            )
+            if contents is not None:
+                self._send_to_xqueue(contents, key)
+
+        return new_status
+
+    def add_certs(self, students, course_id, course=None, forced_grade=None, template_file=None):
+        """
+        Request new certificates for a batch of students, like `add_cert`
+        does for each of them.
+
+        The data `add_cert` looks up for each student is fetched once for the
+        whole batch, all students are graded with the same course descriptor
+        (and all its loaded modules), and the requests are sent to the queue
+        concurrently, over the interface's session, with at most
+        settings.CERT_XQUEUE_CONCURRENCY requests in flight.
+
+        Students who could not be graded keep their status, and students whose
+        request could not be put on the queue get the 'error' status.
+
+        Returns a dict of the students' new statuses, keyed by user id.
+        """
+        students = list(students)
+        if course is None:
+            course = courses.get_course_by_id(course_id)
+        user_ids = [student.id for student in students]
+
+        cert_statuses = dict(
+            GeneratedCertificate.objects.filter(
+                user__in=user_ids, course_id=course_id
+            ).values_list('user', 'status')
+        )
+        profile_names = dict(UserProfile.objects.filter(user__in=user_ids).values_list('user', 'name'))
+        whitelisted = set(
+            self.whitelist.filter(
+                user__in=user_ids, course_id=course_id, whitelist=True
+            ).values_list('user', flat=True)
+        )
+        restricted = set(self.restricted.filter(user__in=user_ids).values_list('user', flat=True))
+        enrollment_modes = dict(
+            CourseEnrollment.objects.filter(
+                user__in=user_ids, course_id=course_id
+            ).values_list('user', 'mode')
+        )
+
+        new_statuses = {}
+        to_grade = []
+        for student in students:
+            cert_status = cert_statuses.get(student.id, status.unavailable)
+            new_statuses[student.id] = cert_status
+            if cert_status in self.VALID_STATUSES:
+                to_grade.append(student)
+
+        concurrency = settings.CERT_XQUEUE_CONCURRENCY
+        self.xqueue_interface.session.mount(
+            self.xqueue_interface.url, HTTPAdapter(pool_maxsize=concurrency)
+        )
+        pool = ThreadPool(concurrency)
+        pending = []
+        try:
+            for student, grade, err_msg in grades.iterate_grades_for(course_id, to_grade, course=course):
+                if err_msg:
+                    continue
+                new_status, contents, key = self._update_cert(
+                    student, course_id, course, grade,
+                    profile_name=profile_names.get(student.id),
+                    enrollment_mode=enrollment_modes.get(student.id),
+                    is_whitelisted=student.id in whitelisted,
+                    is_restricted=student.id in restricted,
+                    forced_grade=forced_grade,
+                    template_file=template_file,
+                )
+                new_statuses[student.id] = new_status
+                if contents is not None:
+                    pending.append((student, pool.apply_async(self._send_to_xqueue, (contents, key))))
+        finally:
+            pool.close()
+            pool.join()
+
+        for student, result in pending:
             try:
-                grade_contents = lxml.html.fromstring(grade_contents).text_content()
-            except (TypeError, XMLSyntaxError, ParserError) as e:
-                #   Despite blowing up the xml parser, bad values here are fine
-                grade_contents = None
-
-            if is_whitelisted or grade_contents is not None:
-
-                # check to see whether the student is on the
-                # the embargoed country restricted list
-                # otherwise, put a new certificate request
-                # on the queue
-
-                if self.restricted.filter(user=student).exists():
-                    new_status = status.restricted
-                    cert.status = new_status
-                    cert.save()
-                else:
-                    key = make_hashkey(random.random())
-                    cert.key = key
-                    contents = {
-                        'action': 'create',
-                        'username': student.username,
-                        'course_id': course_id.to_deprecated_string(),
-                        'course_name': course_name,
-                        'name': profile_name,
-                        'grade': grade_contents,
-                        'template_pdf': template_pdf,
-                    }
-                    if template_file:
-                        contents['template_pdf'] = template_file
-                    new_status = status.generating
-                    cert.status = new_status
-                    cert.save()
-                    self._send_to_xqueue(contents, key)
+                result.get()
+            except Exception:  # pylint: disable=broad-except
+                GeneratedCertificate.objects.filter(user=student, course_id=course_id).update(status=status.error)
+                new_statuses[student.id] = status.error
+
+        return new_statuses
+
+    def _update_cert(self, student, course_id, course, grade, profile_name, enrollment_mode,
+                     is_whitelisted, is_restricted, forced_grade=None, template_file=None):
+        """
+        Update the certificate of a graded student, and return a tuple of
+        (new status, queue request contents, queue request key). The contents
+        and key are None if nothing has to be put on the queue.
+        """
+        course_name = course.display_name or course_id.to_deprecated_string()
+        mode_is_verified = (enrollment_mode == GeneratedCertificate.MODES.verified)
+        user_is_verified = SoftwareSecurePhotoVerification.user_is_verified(student)
+        user_is_reverified = SoftwareSecurePhotoVerification.user_is_reverified_for_all(course_id, student)
+        cert_mode = enrollment_mode
+        if (mode_is_verified and user_is_verified and user_is_reverified):
+            template_pdf = "certificate-template-{id.org}-{id.course}-verified.pdf".format(id=course_id)
+        elif (mode_is_verified and not (user_is_verified and user_is_reverified)):
+            template_pdf = "certificate-template-{id.org}-{id.course}.pdf".format(id=course_id)
+            cert_mode = GeneratedCertificate.MODES.honor
+        else:
+            # honor code and audit students
+            template_pdf = "certificate-template-{id.org}-{id.course}.pdf".format(id=course_id)
+        if forced_grade:
+            grade['grade'] = forced_grade
+
+        cert, __ = GeneratedCertificate.objects.get_or_create(user=student, course_id=course_id)
+
+        cert.mode = cert_mode
+        cert.user = student
+        cert.grade = grade['percent']
+        cert.course_id = course_id
+        cert.name = profile_name
+        # Strip HTML from grade range label
+        grade_contents = grade.get('grade', None)
+        try:
+            grade_contents = lxml.html.fromstring(grade_contents).text_content()
+        except (TypeError, XMLSyntaxError, ParserError) as e:
+            #   Despite blowing up the xml parser, bad values here are fine
+            grade_contents = None
+
+        contents = None
+        key = None
+        if is_whitelisted or grade_contents is not None:
+
+            # check to see whether the student is on the
+            # the embargoed country restricted list
+            # otherwise, put a new certificate request
+            # on the queue
+
+            if is_restricted:
+                new_status = status.restricted
+                cert.status = new_status
+                cert.save()
             else:
-                cert_status = status.notpassing
-                cert.status = cert_status
+                key = make_hashkey(random.random())
+                cert.key = key
+                contents = {
+                    'action': 'create',
+                    'username': student.username,
+                    'course_id': course_id.to_deprecated_string(),
+                    'course_name': course_name,
+                    'name': profile_name,
+                    'grade': grade_contents,
+                    'template_pdf': template_pdf,
+                }
+                if template_file:
+                    contents['template_pdf'] = template_file
+                new_status = status.generating
+                cert.status = new_status
                 cert.save()
+        else:
+            new_status = status.notpassing
+            cert.status = new_status
+            cert.save()
 
-        return new_status
+        return new_status, contents, key
 
     def _send_to_xqueue(self, contents, key):
 
@@ -0,0 +1,124 @@
+"""
+Background tasks that request certificates for all the students of a course.
+
+The main task, run by instructor_task, splits the enrolled students into
+batches of settings.CERTIFICATES_STUDENTS_PER_TASK, and queues one subtask per
+batch.  Each subtask grades its students and puts their certificate requests on
+the xqueue with `XQueueCertInterface.add_certs`.
+"""
+import json
+
+from celery import task
+from celery.utils.log import get_task_logger
+from celery.states import SUCCESS, FAILURE
+
+from django.conf import settings
+from django.contrib.auth.models import User
+
+from certificates.models import CertificateStatuses
+from certificates.queue import XQueueCertInterface
+from courseware.courses import get_course_by_id
+from instructor_task.models import InstructorTask
+from instructor_task.subtasks import (
+    SubtaskStatus,
+    queue_subtasks_for_query,
+    check_subtask_is_valid,
+    update_subtask_status,
+)
+from util.query import use_read_replica_if_available
+
+log = get_task_logger(__name__)
+
+
+def perform_delegate_certificate_batches(entry_id, course_id, task_input, action_name):  # pylint: disable=unused-argument
+    """
+    Delegates certificate generation by querying for the students enrolled in
+    the course, chopping them up into batches of no more than
+    settings.CERTIFICATES_STUDENTS_PER_TASK in size, and queueing up worker jobs.
+    """
+    entry = InstructorTask.objects.get(pk=entry_id)
+    task_id = entry.task_id
+
+    if course_id != entry.course_id:
+        format_msg = u"Course id conflict: explicit value %r does not match task value %r"
+        log.warning(u"Task %s: " + format_msg, task_id, course_id, entry.course_id)
+        raise ValueError(format_msg % (course_id, entry.course_id))
+
+    # As for bulk email, don't queue a second set of subtasks if the task
+    # is run again after they were queued.
+    if len(entry.subtasks) > 0 and len(entry.task_output) > 0:
+        log.warning(u"Task %s has already been processed!  InstructorTask = %s", task_id, entry)
+        return json.loads(entry.task_output)
+
+    def _create_generate_certificates_subtask(to_list, initial_subtask_status):
+        """Creates a subtask to request the certificates of a list of students."""
+        subtask_id = initial_subtask_status.task_id
+        return generate_certificates_for_students.subtask(
+            (
+                entry_id,
+                to_list,
+                initial_subtask_status.to_dict(),
+            ),
+            task_id=subtask_id,
+            routing_key=settings.GRADES_DOWNLOAD_ROUTING_KEY,
+        )
+
+    students = use_read_replica_if_available(
+        User.objects.filter(courseenrollment__course_id=course_id, courseenrollment__is_active=True)
+    )
+
+    log.info(u"Task %s: Preparing to queue subtasks for generating certificates for course %s", task_id, course_id)
+
+    return queue_subtasks_for_query(
+        entry,
+        action_name,
+        _create_generate_certificates_subtask,
+        students,
+        [],
+        settings.CERTIFICATES_STUDENTS_PER_TASK,
+    )
+
+
+@task(routing_key=settings.GRADES_DOWNLOAD_ROUTING_KEY)  # pylint: disable=E1102
+def generate_certificates_for_students(entry_id, to_list, subtask_status_dict):
+    """
+    Requests certificates for a list of students.
+
+    Inputs are:
+      * `entry_id`: id of the InstructorTask object to which progress should be recorded.
+      * `to_list`: list of students, each represented as a dict with a 'pk' key.
+      * `subtask_status_dict`: dict containing values representing current status,
+        as for `bulk_email.tasks.send_course_email`.
+
+    Students whose certificate request was put on the queue count as
+    succeeded, students who cannot get a certificate (not passing, restricted,
+    or with a certificate already) as skipped, and students whose request
+    failed as failed.
+    """
+    subtask_status = SubtaskStatus.from_dict(subtask_status_dict)
+    current_task_id = subtask_status.task_id
+    check_subtask_is_valid(entry_id, current_task_id, subtask_status)
+
+    entry = InstructorTask.objects.get(pk=entry_id)
+    try:
+        course = get_course_by_id(entry.course_id, depth=None)
+        students = User.objects.filter(pk__in=[item['pk'] for item in to_list])
+        new_statuses = XQueueCertInterface().add_certs(students, entry.course_id, course=course)
+    except Exception:
+        log.exception("Certificate task %s for course %s: failed unexpectedly!", current_task_id, entry.course_id)
+        subtask_status.increment(failed=len(to_list), state=FAILURE)
+        update_subtask_status(entry_id, current_task_id, subtask_status)
+        raise
+
+    for new_status in new_statuses.values():
+        if new_status == CertificateStatuses.generating:
+            subtask_status.increment(succeeded=1)
+        elif new_status == CertificateStatuses.error:
+            subtask_status.increment(failed=1)
+        else:
+            subtask_status.increment(skipped=1)
+    subtask_status.increment(state=SUCCESS)
+    update_subtask_status(entry_id, current_task_id, subtask_status)
+
+    log.info("Certificate task %s for course %s: returning status %s", current_task_id, entry.course_id, subtask_status)
+    return subtask_status.to_dict()
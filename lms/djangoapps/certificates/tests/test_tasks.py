@@ -0,0 +1,113 @@
+"""
+Unit tests for the background task requesting certificates for a course.
+"""
+import json
+from uuid import uuid4
+
+from mock import patch
+from celery.states import SUCCESS
+
+from django.test.utils import override_settings
+
+from certificates.models import CertificateStatuses
+from instructor_task.models import InstructorTask
+from instructor_task.tasks import generate_certificates
+from instructor_task.tests.test_base import InstructorTaskCourseTestCase
+from instructor_task.tests.factories import InstructorTaskFactory
+
+
+@override_settings(CERTIFICATES_STUDENTS_PER_TASK=2)
+class TestGenerateCertificatesInstructorTask(InstructorTaskCourseTestCase):
+    """Tests the instructor task that requests certificates."""
+
+    def setUp(self):
+        super(TestGenerateCertificatesInstructorTask, self).setUp()
+        self.initialize_course()
+        # the instructor is enrolled too, so 5 students, in 3 subtasks
+        self.instructor = self.create_instructor('instructor')
+        self.students = [self.create_student('robot%d' % i) for i in xrange(4)]
+        self.new_statuses = {
+            self.instructor.id: CertificateStatuses.generating,
+            self.students[0].id: CertificateStatuses.generating,
+            self.students[1].id: CertificateStatuses.notpassing,
+            self.students[2].id: CertificateStatuses.error,
+            self.students[3].id: CertificateStatuses.generating,
+        }
+
+    def _create_input_entry(self):
+        """Creates a InstructorTask entry for testing."""
+        return InstructorTaskFactory.create(
+            course_id=self.course.id,
+            requester=self.instructor,
+            task_type='generate_certificates',
+            task_input=json.dumps({}),
+            task_key='',
+            task_id=str(uuid4()),
+        )
+
+    def _run_task(self, task_entry):
+        """
+        Run the task, with the certificate requests of each student answered
+        with their status in self.new_statuses, and return its status and the
+        students of each call to add_certs.
+        """
+        with patch('certificates.tasks.XQueueCertInterface') as mock_interface:
+            mock_interface.return_value.add_certs.side_effect = (
+                lambda students, course_id, course=None: {student.id: self.new_statuses[student.id] for student in students}
+            )
+            parent_status = generate_certificates.apply([task_entry.id, {}], task_id=task_entry.task_id).get()
+        batches = [
+            sorted(student.id for student in call[0][0])
+            for call in mock_interface.return_value.add_certs.call_args_list
+        ]
+        return parent_status, batches
+
+    def test_successful(self):
+        task_entry = self._create_input_entry()
+        parent_status, batches = self._run_task(task_entry)
+
+        self.assertEquals(parent_status.get('total'), 5)
+        self.assertEquals(parent_status.get('action_name'), 'certified')
+
+        # the students are split into subtasks of CERTIFICATES_STUDENTS_PER_TASK
+        self.assertEquals([len(batch) for batch in batches], [2, 2, 1])
+        self.assertItemsEqual(sum(batches, []), self.new_statuses.keys())
+
+        entry = InstructorTask.objects.get(id=task_entry.id)
+        self.assertEquals(entry.task_state, SUCCESS)
+        status = json.loads(entry.task_output)
+        self.assertEquals(status.get('total'), 5)
+        self.assertEquals(status.get('attempted'), 4)
+        self.assertEquals(status.get('succeeded'), 3)
+        self.assertEquals(status.get('failed'), 1)
+        self.assertEquals(status.get('skipped'), 1)
+
+        subtask_info = json.loads(entry.subtasks)
+        self.assertEquals(subtask_info.get('total'), 3)
+        self.assertEquals(subtask_info.get('succeeded'), 3)
+        self.assertEquals(subtask_info.get('failed'), 0)
+        for subtask_status in subtask_info['status'].itervalues():
+            self.assertEquals(subtask_status.get('state'), SUCCESS)
+
+    def test_successful_twice(self):
+        task_entry = self._create_input_entry()
+        self._run_task(task_entry)
+
+        # running the same task a second time doesn't request the certificates again
+        parent_status, batches = self._run_task(task_entry)
+        self.assertEquals(batches, [])
+        self.assertEquals(parent_status.get('total'), 5)
+        self.assertEquals(parent_status.get('succeeded'), 3)
+
+    def test_subtask_failure(self):
+        task_entry = self._create_input_entry()
+        with patch('certificates.tasks.XQueueCertInterface') as mock_interface:
+            mock_interface.return_value.add_certs.side_effect = Exception("xqueue is down")
+            generate_certificates.apply([task_entry.id, {}], task_id=task_entry.task_id)
+
+        entry = InstructorTask.objects.get(id=task_entry.id)
+        status = json.loads(entry.task_output)
+        self.assertEquals(status.get('failed'), 5)
+        self.assertEquals(status.get('succeeded'), 0)
+        subtask_info = json.loads(entry.subtasks)
+        self.assertEquals(subtask_info.get('failed'), 3)
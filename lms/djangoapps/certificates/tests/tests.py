@@ -1,14 +1,19 @@
 """
 Tests for the certificates models.
 """
+import json
 
 from django.test import TestCase
+from mock import patch
 
 from xmodule.modulestore.tests.factories import CourseFactory
 from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
 
+from capa.xqueue_interface import XQueueInterface
+from student.models import CourseEnrollment
 from student.tests.factories import UserFactory
 from certificates.models import CertificateStatuses, GeneratedCertificate, certificate_status_for_student
+from certificates.queue import XQueueCertInterface
 
 
 class CertificatesModelTest(ModuleStoreTestCase):
@@ -23,3 +28,61 @@ class CertificatesModelTest(ModuleStoreTestCase):
         certificate_status = certificate_status_for_student(student, course.id)
         self.assertEqual(certificate_status['status'], CertificateStatuses.unavailable)
         self.assertEqual(certificate_status['mode'], GeneratedCertificate.MODES.honor)
+
+
+class AddCertsTest(ModuleStoreTestCase):
+    """
+    Tests for XQueueCertInterface.add_certs
+    """
+
+    def setUp(self):
+        super(AddCertsTest, self).setUp()
+        self.course = CourseFactory.create(org='edx', number='certs', display_name='Certificates Course')
+        self.students = [UserFactory() for _ in range(3)]
+        for student in self.students:
+            CourseEnrollment.enroll(student, self.course.id)
+
+    def _add_certs(self, grades, send_errors=()):
+        """
+        Call add_certs for self.students, with the given grades, and with a
+        queue that fails for the usernames in `send_errors`.
+        """
+        def send_to_queue(header, body):  # pylint: disable=unused-argument
+            """Fail for the students in send_errors"""
+            if json.loads(body)['username'] in send_errors:
+                return (1, 'error')
+            return (0, 'ok')
+
+        graded = [(student, grade, None) for student, grade in zip(self.students, grades)]
+        with patch('certificates.queue.grades.iterate_grades_for', return_value=graded):
+            with patch.object(XQueueInterface, 'send_to_queue', side_effect=send_to_queue) as mock_send:
+                statuses = XQueueCertInterface().add_certs(self.students, self.course.id, course=self.course)
+        return statuses, mock_send
+
+    def test_add_certs(self):
+        grades = [
+            {'grade': 'Pass', 'percent': 0.9},
+            {'grade': None, 'percent': 0.1},
+            {'grade': 'Pass', 'percent': 0.8},
+        ]
+        statuses, mock_send = self._add_certs(grades, send_errors=[self.students[2].username])
+        self.assertEqual(statuses, {
+            self.students[0].id: CertificateStatuses.generating,
+            self.students[1].id: CertificateStatuses.notpassing,
+            self.students[2].id: CertificateStatuses.error,
+        })
+        self.assertEqual(mock_send.call_count, 2)
+        for student in self.students:
+            self.assertEqual(certificate_status_for_student(student, self.course.id)['status'], statuses[student.id])
+
+    def test_skips_invalid_statuses(self):
+        GeneratedCertificate.objects.create(
+            user=self.students[0], course_id=self.course.id, status=CertificateStatuses.downloadable
+        )
+        grades = [{'grade': 'Pass', 'percent': 0.9}] * 2
+        with patch('certificates.queue.grades.iterate_grades_for') as mock_iterate:
+            mock_iterate.return_value = [(student, grade, None) for student, grade in zip(self.students[1:], grades)]
+            with patch.object(XQueueInterface, 'send_to_queue', return_value=(0, 'ok')):
+                statuses = XQueueCertInterface().add_certs(self.students, self.course.id, course=self.course)
+        self.assertEqual(mock_iterate.call_args[0][1], self.students[1:])
+        self.assertEqual(statuses[self.students[0].id], CertificateStatuses.downloadable)
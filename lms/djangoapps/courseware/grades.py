@@ -1,6 +1,7 @@
 # Compute grades using real division, with no integer truncation
 from __future__ import division
 from collections import defaultdict
+from itertools import islice
 import json
 import random
 import logging
@@ -14,7 +15,7 @@ import dogstats_wrapper as dog_stats_api
 
 from courseware import courses
 from courseware.model_data import FieldDataCache
-from student.models import anonymous_id_for_user
+from student.models import ANONYMOUS_ID_BATCH_SIZE, anonymous_id_for_user, anonymous_ids_for_users
 from xmodule import graders
 from xmodule.graders import Score
 from xmodule.modulestore.django import modulestore
@@ -496,7 +497,23 @@ def manual_transaction():
         transaction.commit()
 
 
-def iterate_grades_for(course_id, students):
+def _students_with_anonymous_ids(course_id, students):
+    """
+    Yield the `students`, having got their anonymous ids in the course (used
+    to get their scores from the submissions API) in batches, rather than one
+    at a time while grading them.
+    """
+    students = iter(students)
+    while True:
+        batch = list(islice(students, ANONYMOUS_ID_BATCH_SIZE))
+        if not batch:
+            return
+        anonymous_ids_for_users(batch, course_id)
+        for student in batch:
+            yield student
+
+
+def iterate_grades_for(course_id, students, course=None):
     """Given a course_id and an iterable of students (User), yield a tuple of:
 
     (student, gradeset, err_msg) for every student enrolled in the course.
@@ -513,15 +530,19 @@ def iterate_grades_for(course_id, students):
     - grade_breakdown : A breakdown of the major components that
         make up the final grade. (For display)
     - raw_scores: contains scores for every graded module
+
+    `course` can be given to re-use an already loaded course descriptor, and
+    all its loaded modules, for grading.
     """
-    course = courses.get_course_by_id(course_id)
+    if course is None:
+        course = courses.get_course_by_id(course_id)
 
     # We make a fake request because grading code expects to be able to look at
     # the request. We have to attach the correct user to the request before
     # grading that student.
     request = RequestFactory().get('/')
 
-    for student in students:
+    for student in _students_with_anonymous_ids(course_id, students):
         with dog_stats_api.timer('lms.grades.iterate_grades_for', tags=[u'action:{}'.format(course_id)]):
             try:
                 request.user = student
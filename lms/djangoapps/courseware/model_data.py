@@ -7,6 +7,7 @@ from collections import defaultdict
 from itertools import chain
 from .models import (
     StudentModule,
+    XModuleUserStateSummaryCounter,
     XModuleUserStateSummaryField,
     XModuleStudentPrefsField,
     XModuleStudentInfoField
@@ -16,11 +17,13 @@ from opaque_keys.edx.locations import SlashSeparatedCourseKey, Location
 from opaque_keys.edx.keys import CourseKey, UsageKey
 
 from django.db import DatabaseError
+from django.db.models import Sum
 from django.contrib.auth.models import User
 
 from xblock.runtime import KeyValueStore
 from xblock.exceptions import KeyValueMultiSaveError, InvalidScopeError
 from xblock.fields import Scope, UserScope
+from xmodule.fields import Counts
 from xmodule.modulestore.django import modulestore
 
 log = logging.getLogger(__name__)
@@ -67,10 +70,15 @@ class FieldDataCache(object):
         self.course_id = course_id
         self.user = user
 
+        # The counts of the Scope.user_state_summary Counts fields of the
+        # descriptors, rolled up from their shards, by cache key
+        self.counts = {}
+
         if user.is_authenticated():
             for scope, fields in self._fields_to_cache().items():
                 for field_object in self._retrieve_fields(scope, fields):
                     self.cache[self._cache_key_from_field_object(scope, field_object)] = field_object
+            self._retrieve_counts()
 
     @classmethod
     def cache_for_descriptor_descendents(cls, course_id, user, descriptor, depth=None,
@@ -176,6 +184,33 @@ class FieldDataCache(object):
         else:
             return []
 
+    def _retrieve_counts(self):
+        """
+        Queries the database for the sums of the shards of the counters of the
+        descriptors' Scope.user_state_summary Counts fields
+        """
+        counter_fields = set()
+        for descriptor in self.descriptors:
+            for field in descriptor.fields.values():
+                if field.scope == Scope.user_state_summary and isinstance(field, Counts):
+                    usage_id = descriptor.scope_ids.usage_id.map_into_course(self.course_id)
+                    self.counts[(Scope.user_state_summary, usage_id, field.name)] = {}
+                    counter_fields.add((descriptor.scope_ids.usage_id, field.name))
+        if not counter_fields:
+            return
+
+        usage_id_field = XModuleUserStateSummaryCounter._meta.get_field('usage_id')
+        for chunk in chunks(counter_fields, 500):
+            sums = XModuleUserStateSummaryCounter.objects.filter(
+                usage_id__in=set(usage_id for usage_id, __ in chunk),
+                field_name__in=set(field_name for __, field_name in chunk),
+            ).values('usage_id', 'field_name', 'key').annotate(count=Sum('count'))
+            for row in sums:
+                usage_id = usage_id_field.to_python(row['usage_id']).map_into_course(self.course_id)
+                counts = self.counts.get((Scope.user_state_summary, usage_id, row['field_name']))
+                if counts is not None:
+                    counts[row['key']] = int(row['count'])
+
     def _fields_to_cache(self):
         """
         Returns a map of scopes to fields in that scope that should be cached
@@ -228,6 +263,57 @@ class FieldDataCache(object):
 
         return self.cache.get(self._cache_key_from_kvs_key(key))
 
+    def is_counter(self, key):
+        '''
+        Return whether the field selected by the `DjangoKeyValueStore.Key` `key`
+        is stored as counters (see xmodule.fields.Counts)
+        '''
+        return self._cache_key_from_kvs_key(key) in self.counts
+
+    def find_counts(self, key):
+        '''
+        Return the counts of the counter field selected by `key`: those of
+        the value stored before the field was a counter, plus those of the
+        counters. Returns None if there are neither.
+        '''
+        counts = self.counts[self._cache_key_from_kvs_key(key)]
+        field_object = self.find(key)
+        if field_object is None and not counts:
+            return None
+
+        value = json.loads(field_object.value) if field_object is not None else None
+        value = dict(value or {})
+        for count_key, count in counts.iteritems():
+            value[count_key] = value.get(count_key, 0) + count
+        return value
+
+    def increment_counts(self, key, increments):
+        '''
+        Add `increments`, a dict of amounts by key, to the counts of the counter
+        field selected by `key`
+        '''
+        XModuleUserStateSummaryCounter.increment(key.block_scope_id, key.field_name, increments)
+        counts = self.counts[self._cache_key_from_kvs_key(key)]
+        for count_key, amount in increments.iteritems():
+            counts[count_key] = counts.get(count_key, 0) + amount
+
+    def delete_counts(self, key):
+        '''
+        Delete the counters of the counter field selected by `key`, and the
+        value stored before the field was a counter
+        '''
+        cache_key = self._cache_key_from_kvs_key(key)
+        XModuleUserStateSummaryCounter.objects.filter(
+            usage_id=key.block_scope_id,
+            field_name=key.field_name,
+        ).delete()
+        self.counts[cache_key] = {}
+
+        field_object = self.find(key)
+        if field_object is not None:
+            field_object.delete()
+            del self.cache[cache_key]
+
     def find_or_create(self, key):
         '''
         Find a model data object in this cache, or create it if it doesn't
@@ -305,6 +391,12 @@ class DjangoKeyValueStore(KeyValueStore):
         if key.scope not in self._allowed_scopes:
             raise InvalidScopeError(key)
 
+        if self._field_data_cache.is_counter(key):
+            counts = self._field_data_cache.find_counts(key)
+            if counts is None:
+                raise KeyError(key.field_name)
+            return counts
+
         field_object = self._field_data_cache.find(key)
         if field_object is None:
             raise KeyError(key.field_name)
@@ -336,6 +428,22 @@ class DjangoKeyValueStore(KeyValueStore):
             if field.scope not in self._allowed_scopes:
                 raise InvalidScopeError(field)
 
+            # Counters are incremented by the changes of the counts, rather
+            # than overwritten, so that concurrent writes don't lose counts
+            if self._field_data_cache.is_counter(field):
+                counts = self._field_data_cache.find_counts(field) or {}
+                increments = {
+                    count_key: count - counts.get(count_key, 0)
+                    for count_key, count in (kv_dict[field] or {}).iteritems()
+                }
+                try:
+                    self._field_data_cache.increment_counts(field, increments)
+                except DatabaseError:
+                    log.exception('Error saving fields %r', [field])
+                    raise KeyValueMultiSaveError(saved_fields)
+                saved_fields.append(field.field_name)
+                continue
+
             # If the field is valid and isn't already in the dictionary, add it.
             field_object = self._field_data_cache.find_or_create(field)
             if field_object not in field_objects.keys():
@@ -368,6 +476,12 @@ class DjangoKeyValueStore(KeyValueStore):
         if key.scope not in self._allowed_scopes:
             raise InvalidScopeError(key)
 
+        if self._field_data_cache.is_counter(key):
+            if self._field_data_cache.find_counts(key) is None:
+                raise KeyError(key.field_name)
+            self._field_data_cache.delete_counts(key)
+            return
+
         field_object = self._field_data_cache.find(key)
         if field_object is None:
             raise KeyError(key.field_name)
@@ -384,6 +498,9 @@ class DjangoKeyValueStore(KeyValueStore):
         if key.scope not in self._allowed_scopes:
             raise InvalidScopeError(key)
 
+        if self._field_data_cache.is_counter(key):
+            return self._field_data_cache.find_counts(key) is not None
+
         field_object = self._field_data_cache.find(key)
         if field_object is None:
             return False
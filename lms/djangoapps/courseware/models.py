@@ -12,9 +12,12 @@ file and check it in at the same time as your model changes. To do that,
 ASSUMPTIONS: modules have unique IDs, even across different module_types
 
 """
+import random
+
 from django.contrib.auth.models import User
 from django.conf import settings
-from django.db import models
+from django.db import models, transaction, IntegrityError
+from django.db.models import F
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 
@@ -160,6 +163,75 @@ class XModuleUserStateSummaryField(models.Model):
         return unicode(repr(self))
 
 
+class XModuleUserStateSummaryCounter(models.Model):
+    """
+    Stores one shard of the count of a key of a Scope.user_state_summary
+    Counts field (see xmodule.fields.Counts).
+
+    Each count is spread over settings.USER_STATE_SUMMARY_COUNTER_SHARDS rows,
+    so that concurrent increments seldom wait on the same row; the count is
+    the sum of its shards.
+    """
+
+    class Meta:
+        unique_together = (('usage_id', 'field_name', 'key', 'shard'),)
+
+    # The name of the field
+    field_name = models.CharField(max_length=64, db_index=True)
+
+    # The definition id for the module
+    usage_id = LocationKeyField(max_length=255, db_index=True)
+
+    # The key counted, e.g. the id of a poll answer
+    key = models.CharField(max_length=255)
+
+    shard = models.PositiveSmallIntegerField()
+
+    count = models.IntegerField(default=0)
+
+    def __repr__(self):
+        return 'XModuleUserStateSummaryCounter<%r>' % ({
+            'field_name': self.field_name,
+            'usage_id': self.usage_id,
+            'key': self.key,
+            'shard': self.shard,
+            'count': self.count,
+        },)
+
+    def __unicode__(self):
+        return unicode(repr(self))
+
+    @classmethod
+    def increment(cls, usage_id, field_name, increments):
+        """
+        Add the amounts of `increments`, a dict of amounts by key, to the
+        counts of the field `field_name` of the module `usage_id`, in a random
+        shard of each count.
+        """
+        for key, amount in increments.iteritems():
+            if not amount:
+                continue
+            shard_filter = {
+                'usage_id': usage_id,
+                'field_name': field_name,
+                'key': key,
+                'shard': random.randrange(settings.USER_STATE_SUMMARY_COUNTER_SHARDS),
+            }
+            if cls.objects.filter(**shard_filter).update(count=F('count') + amount):
+                continue
+
+            # like get_or_create, use a savepoint to recover from an IntegrityError
+            # without losing the rest of the transaction
+            savepoint = transaction.savepoint()
+            try:
+                cls.objects.create(count=amount, **shard_filter)
+                transaction.savepoint_commit(savepoint)
+            except IntegrityError:
+                transaction.savepoint_rollback(savepoint)
+                # Another thread has just created the shard
+                cls.objects.filter(**shard_filter).update(count=F('count') + amount)
+
+
 class XModuleStudentPrefsField(models.Model):
     """
     Stores data set in the Scope.preferences scope by an xmodule field
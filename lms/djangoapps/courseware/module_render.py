@@ -1,3 +1,4 @@
+import hashlib
 import json
 import logging
 import mimetypes
@@ -34,9 +35,11 @@ from xblock.exceptions import NoSuchHandlerError
 from xblock.django.request import django_to_webob_request, webob_to_django_response
 from xmodule.error_module import ErrorDescriptor, NonStaffErrorDescriptor
 from xmodule.exceptions import NotFoundError, ProcessingError
+from xmodule.fields import Date
 from opaque_keys.edx.locations import SlashSeparatedCourseKey
 from xmodule.contentstore.django import contentstore
 from xmodule.modulestore.django import modulestore, ModuleI18nService
+from xmodule.modulestore.edit_info import EditInfoRuntimeMixin
 from xmodule.modulestore.exceptions import ItemNotFoundError
 from xmodule.util.duedate import get_extended_due_date
 from xmodule_modifiers import (
@@ -68,6 +71,10 @@ XQUEUE_INTERFACE = XQueueInterface(
     REQUESTS_AUTH,
 )
 
+# The structure of the table of contents of a course, for a version of its content.
+TOC_STRUCTURE_CACHE_KEY = u"courseware.toc.{course_id}.{version}"
+TOC_STRUCTURE_CACHE_TIMEOUT = 60 * 60 * 24
+
 # TODO: course_id and course_key are used interchangeably in this file, which is wrong.
 # Some brave person should make the variable names consistently someday, but the code's
 # coupled enough that it's kind of tricky--you've been warned!
@@ -113,38 +120,124 @@ def toc_for_course(user, request, course, active_chapter, active_section, field_
     None if this is not the case.
 
     field_data_cache must include data from the course module and 2 levels of its descendents
+
+    The structure of the table of contents is shared by all users, see
+    _course_toc_structure; only the access checks, the due date extensions
+    and the active chapter and section are computed for each request.
     '''
 
     with modulestore().bulk_operations(course.id):
-        course_module = get_module_for_descriptor(user, request, course, field_data_cache, course.id)
-        if course_module is None:
+        if not has_access(user, 'load', course, course.id):
             return None
+        # allow course staff to masquerade as student, as get_module_for_descriptor does
+        if has_access(user, 'staff', course, course.id):
+            setup_masquerade(request, True)
+
+        descriptors = {}
+        for chapter in course.get_display_items():
+            descriptors[chapter.location] = chapter
+            for section in chapter.get_display_items():
+                descriptors[section.location] = section
+
+        def can_load(location):
+            """Whether the user can see the chapter or section at `location`"""
+            descriptor = descriptors.get(location)
+            return descriptor is not None and has_access(user, 'load', descriptor, course.id)
 
         chapters = list()
-        for chapter in course_module.get_display_items():
-            if chapter.hide_from_toc:
+        for chapter in _course_toc_structure(course):
+            if not can_load(chapter['location']):
                 continue
 
             sections = list()
-            for section in chapter.get_display_items():
+            for section in chapter['sections']:
+                if not can_load(section['location']):
+                    continue
+
+                active = (chapter['url_name'] == active_chapter and
+                          section['url_name'] == active_section)
+
+                sections.append({'display_name': section['display_name'],
+                                 'url_name': section['url_name'],
+                                 'format': section['format'],
+                                 'due': get_extended_due_date({
+                                     'due': section['due'],
+                                     'extended_due': _extended_due(user, field_data_cache, section['location']),
+                                 }),
+                                 'active': active,
+                                 'graded': section['graded'],
+                                 })
+
+            chapters.append({'display_name': chapter['display_name'],
+                             'url_name': chapter['url_name'],
+                             'sections': sections,
+                             'active': chapter['url_name'] == active_chapter})
+        return chapters
 
-                active = (chapter.url_name == active_chapter and
-                          section.url_name == active_section)
 
-                if not section.hide_from_toc:
-                    sections.append({'display_name': section.display_name_with_default,
-                                     'url_name': section.url_name,
-                                     'format': section.format if section.format is not None else '',
-                                     'due': get_extended_due_date(section),
-                                     'active': active,
-                                     'graded': section.graded,
-                                     })
+def _course_toc_structure(course):
+    """
+    Return the part of the table of contents of `course` which is the same
+    for all users: the chapters and sections which aren't hidden from the toc,
+    with their locations, names, formats and due dates.
 
-            chapters.append({'display_name': chapter.display_name_with_default,
-                             'url_name': chapter.url_name,
-                             'sections': sections,
-                             'active': chapter.url_name == active_chapter})
-        return chapters
+    It is cached for each version of the course content, so that computing
+    the table of contents doesn't instantiate modules for all the chapters
+    and sections.
+    """
+    version = None
+    if isinstance(course.runtime, EditInfoRuntimeMixin):
+        version = course.runtime.get_subtree_edited_on(course)
+    cache_key = None
+    if version is not None:
+        cache_key = TOC_STRUCTURE_CACHE_KEY.format(
+            course_id=hashlib.md5(unicode(course.id).encode('utf-8')).hexdigest(),
+            version=version.isoformat(),
+        )
+        structure = cache.get(cache_key)
+        if structure is not None:
+            return structure
+
+    structure = []
+    for chapter in course.get_display_items():
+        if chapter.hide_from_toc:
+            continue
+        structure.append({
+            'location': chapter.location,
+            'display_name': chapter.display_name_with_default,
+            'url_name': chapter.url_name,
+            'sections': [
+                {
+                    'location': section.location,
+                    'display_name': section.display_name_with_default,
+                    'url_name': section.url_name,
+                    'format': section.format if section.format is not None else '',
+                    'due': section.due,
+                    'graded': section.graded,
+                }
+                for section in chapter.get_display_items()
+                if not section.hide_from_toc
+            ],
+        })
+
+    if cache_key is not None:
+        cache.set(cache_key, structure, TOC_STRUCTURE_CACHE_TIMEOUT)
+    return structure
+
+
+def _extended_due(user, field_data_cache, location):
+    """
+    Return the due date extension granted to `user` for the module at
+    `location`, if any, reading it from the user's state in `field_data_cache`.
+    """
+    if field_data_cache is None or user.is_anonymous():
+        return None
+    key = DjangoKeyValueStore.Key(Scope.user_state, user.id, location, 'extended_due')
+    try:
+        value = DjangoKeyValueStore(field_data_cache).get(key)
+    except KeyError:
+        return None
+    return Date().from_json(value)
 
 
 def get_module(user, request, usage_key, field_data_cache,
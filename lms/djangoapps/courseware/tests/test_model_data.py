@@ -9,6 +9,7 @@ from courseware.model_data import DjangoKeyValueStore
 from courseware.model_data import InvalidScopeError, FieldDataCache
 from courseware.models import StudentModule
 from courseware.models import XModuleStudentInfoField, XModuleStudentPrefsField
+from courseware.models import XModuleUserStateSummaryCounter, XModuleUserStateSummaryField
 
 from student.tests.factories import UserFactory
 from courseware.tests.factories import StudentModuleFactory as cmfStudentModuleFactory, location, course_id
@@ -17,8 +18,10 @@ from courseware.tests.factories import StudentPrefsFactory, StudentInfoFactory
 
 from xblock.fields import Scope, BlockScope, ScopeIds
 from django.test import TestCase
+from django.test.utils import override_settings
 from django.db import DatabaseError
 from xblock.core import KeyValueMultiSaveError
+from xmodule.fields import Counts
 
 
 def mock_field(scope, name):
@@ -28,6 +31,13 @@ def mock_field(scope, name):
     return field
 
 
+def mock_counts_field(name):
+    field = Mock(spec=Counts)
+    field.scope = Scope.user_state_summary
+    field.name = name
+    return field
+
+
 def mock_descriptor(fields=[]):
     descriptor = Mock()
     descriptor.scope_ids = ScopeIds('user1', 'mock_problem', location('def_id'), location('usage_id'))
@@ -321,6 +331,84 @@ class TestUserStateSummaryStorage(StorageTestBase, TestCase):
     storage_class = factory.FACTORY_FOR
 
 
+class TestUserStateSummaryCounters(TestCase):
+    """Tests for the storage of Scope.user_state_summary Counts fields as counters"""
+
+    def setUp(self):
+        XModuleUserStateSummaryField.objects.create(
+            field_name='counts', usage_id=location('usage_id'), value=json.dumps({'yes': 3})
+        )
+        self.users = [UserFactory.create(), UserFactory.create()]
+
+    def _kvs(self, user):
+        """Return a DjangoKeyValueStore of `user` for a descriptor with a Counts field"""
+        descriptor = mock_descriptor([mock_counts_field('counts'), mock_field(Scope.user_state_summary, 'other_field')])
+        return DjangoKeyValueStore(FieldDataCache([descriptor], course_id, user))
+
+    def test_get_counts(self):
+        XModuleUserStateSummaryCounter.objects.create(
+            field_name='counts', usage_id=location('usage_id'), key='yes', shard=0, count=2
+        )
+        XModuleUserStateSummaryCounter.objects.create(
+            field_name='counts', usage_id=location('usage_id'), key='yes', shard=3, count=1
+        )
+        XModuleUserStateSummaryCounter.objects.create(
+            field_name='counts', usage_id=location('usage_id'), key='no', shard=3, count=4
+        )
+        self.assertEquals({'yes': 6, 'no': 4}, self._kvs(self.users[0]).get(user_state_summary_key('counts')))
+
+    def test_concurrent_votes(self):
+        """Test that votes written from values read before each other's writes all count"""
+        key = user_state_summary_key('counts')
+        stores = [self._kvs(user) for user in self.users]
+        values = [kvs.get(key) for kvs in stores]
+        for kvs, value in zip(stores, values):
+            value['yes'] += 1
+            value['no'] = value.get('no', 0) + 1
+            kvs.set(key, value)
+
+        self.assertEquals({'yes': 5, 'no': 2}, self._kvs(self.users[0]).get(key))
+        # the value stored before the field was a counter is left as it was
+        self.assertEquals(
+            {'yes': 3},
+            json.loads(XModuleUserStateSummaryField.objects.get(field_name='counts').value)
+        )
+
+    @override_settings(USER_STATE_SUMMARY_COUNTER_SHARDS=2)
+    def test_votes_sharded(self):
+        key = user_state_summary_key('counts')
+        kvs = self._kvs(self.users[0])
+        for __ in range(20):
+            kvs.set(key, {'no': kvs.get(key).get('no', 0) + 1})
+
+        self.assertEquals({'yes': 3, 'no': 20}, self._kvs(self.users[1]).get(key))
+        self.assertLessEqual(XModuleUserStateSummaryCounter.objects.count(), 2)
+
+    def test_has_counts(self):
+        kvs = self._kvs(self.users[0])
+        self.assertTrue(kvs.has(user_state_summary_key('counts')))
+        XModuleUserStateSummaryField.objects.all().delete()
+        kvs = self._kvs(self.users[0])
+        self.assertFalse(kvs.has(user_state_summary_key('counts')))
+        self.assertRaises(KeyError, kvs.get, user_state_summary_key('counts'))
+
+    def test_delete_counts(self):
+        key = user_state_summary_key('counts')
+        kvs = self._kvs(self.users[0])
+        kvs.set(key, {'yes': 4})
+        kvs.delete(key)
+        self.assertFalse(kvs.has(key))
+        self.assertEquals(0, XModuleUserStateSummaryCounter.objects.count())
+        self.assertEquals(0, XModuleUserStateSummaryField.objects.count())
+        self.assertRaises(KeyError, kvs.delete, key)
+
+    def test_other_fields_not_counted(self):
+        key = user_state_summary_key('other_field')
+        self._kvs(self.users[0]).set(key, {'yes': 1})
+        self.assertEquals({'yes': 1}, self._kvs(self.users[1]).get(key))
+        self.assertEquals(0, XModuleUserStateSummaryCounter.objects.count())
+
+
 class TestStudentPrefsStorage(OtherUserFailureTestMixin, StorageTestBase, TestCase):
     """Tests for StudentPrefStorage"""
     factory = StudentPrefsFactory
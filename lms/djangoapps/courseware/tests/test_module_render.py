@@ -408,6 +408,26 @@ class TestTOC(ModuleStoreTestCase):
             for toc_section in expected:
                 self.assertIn(toc_section, actual)
 
+    @ddt.data((ModuleStoreEnum.Type.mongo, 3, 0, 0), (ModuleStoreEnum.Type.split, 6, 0, 2))
+    @ddt.unpack
+    def test_toc_structure_cached(self, default_ms, setup_finds, setup_sends, toc_finds):
+        with self.store.default_store(default_ms):
+            self.setup_modulestore(default_ms, setup_finds, setup_sends)
+            expected = render.toc_for_course(
+                self.request.user, self.request, self.toy_course, self.chapter, None, self.field_data_cache
+            )
+
+            # The second time, no module is instantiated and the structure comes from the cache.
+            with patch.object(render, 'get_module_for_descriptor') as mock_get_module:
+                with patch.object(render.cache, 'set') as mock_cache_set:
+                    with check_mongo_calls(toc_finds, 0):
+                        actual = render.toc_for_course(
+                            self.request.user, self.request, self.toy_course, self.chapter, None, self.field_data_cache
+                        )
+        self.assertFalse(mock_get_module.called)
+        self.assertFalse(mock_cache_set.called)
+        self.assertEqual(actual, expected)
+
 
 @override_settings(MODULESTORE=TEST_DATA_MIXED_MODULESTORE)
 class TestHtmlModifiers(ModuleStoreTestCase):
@@ -5,7 +5,8 @@ Tests courseware views.py
 import unittest
 from datetime import datetime
 
-from mock import MagicMock, patch, create_autospec
+from mock import MagicMock, Mock, patch, create_autospec
+import pymongo.message
 from pytz import UTC
 
 from django.test import TestCase
@@ -24,12 +25,14 @@ from edxmako.tests import mako_middleware_process_request
 
 from opaque_keys.edx.locations import Location
 from xmodule.modulestore.django import modulestore
-from xmodule.modulestore.tests.factories import CourseFactory, ItemFactory
+from xmodule.modulestore.tests.factories import CourseFactory, ItemFactory, check_mongo_operations
+from xmodule.modulestore.tracing import trace_mongo_calls
 from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
 from opaque_keys.edx.locations import SlashSeparatedCourseKey
 from student.tests.factories import UserFactory
 
 import courseware.views as views
+from courseware import module_render
 from courseware.tests.modulestore_config import TEST_DATA_MIXED_MODULESTORE
 from course_modes.models import CourseMode
 import shoppingcart
@@ -480,6 +483,94 @@ class TestAccordionDueDate(BaseDueDateTests):
         )
 
 
+@override_settings(MODULESTORE=TEST_DATA_MIXED_MODULESTORE)
+class IndexModulestoreCallsTests(ModuleStoreTestCase):
+    """
+    Test the modulestore calls made to render a courseware page.
+    """
+    def setUp(self):
+        super(IndexModulestoreCallsTests, self).setUp()
+        self.course = CourseFactory.create()
+        self.chapter = ItemFactory.create(category='chapter', parent_location=self.course.location)  # pylint: disable=no-member
+        self.sections = [
+            ItemFactory.create(category='sequential', parent_location=self.chapter.location)
+            for __ in range(3)
+        ]
+        for section in self.sections:
+            vertical = ItemFactory.create(category='vertical', parent_location=section.location)
+            ItemFactory.create(category='html', parent_location=vertical.location)
+
+        self.user = UserFactory.create()
+        CourseEnrollment.enroll(self.user, self.course.id)
+        self.request_factory = RequestFactory()
+
+    def _render(self, section):
+        """
+        Render the courseware page of `section`.
+        """
+        request = self.request_factory.get('foo')
+        request.user = self.user
+        request.session = {}
+        mako_middleware_process_request(request)
+        response = views.index(
+            request, self.course.id.to_deprecated_string(), self.chapter.url_name, section.url_name
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def _count_modulestore_finds(self, section):
+        """
+        Render the courseware page of `section`, and return the number of
+        find queries made to the modulestore.
+        """
+        mocks = {method: Mock(wraps=getattr(pymongo.message, method)) for method in ('query', 'get_more')}
+        with patch.multiple(pymongo.message, **mocks):
+            self._render(section)
+        return sum(mock.call_count for mock in mocks.values())
+
+    def _count_modulestore_finds_and_toc_sets(self, section):
+        """
+        Render the courseware page of `section`, and return the number of find
+        queries made to the modulestore and the toc structure cache keys set.
+        """
+        with patch.object(module_render.cache, 'set', wraps=module_render.cache.set) as mock_cache_set:
+            finds = self._count_modulestore_finds(section)
+        toc_keys = [
+            args[0] for args, __ in mock_cache_set.call_args_list if args[0].startswith('courseware.toc.')
+        ]
+        return finds, toc_keys
+
+    def test_toc_structure_cached(self):
+        # the first page caches the structure of the table of contents
+        __, toc_keys = self._count_modulestore_finds_and_toc_sets(self.sections[0])
+        self.assertEqual(len(toc_keys), 1)
+        toc_key = toc_keys[0]
+        self.assertIsNotNone(module_render.cache.get(toc_key))
+
+        # with the cached structure missing, it is built and cached again
+        cache_get = module_render.cache.get
+        with patch.object(
+            module_render.cache, 'get',
+            side_effect=lambda key, *args, **kwargs: None if key == toc_key else cache_get(key, *args, **kwargs)
+        ):
+            uncached_finds, toc_keys = self._count_modulestore_finds_and_toc_sets(self.sections[1])
+        self.assertEqual(toc_keys, [toc_key])
+
+        # with the cached structure, it isn't built again, and as the chapters and
+        # sections are loaded for the access checks anyway, the same queries are made
+        cached_finds, toc_keys = self._count_modulestore_finds_and_toc_sets(self.sections[1])
+        self.assertEqual(toc_keys, [])
+        self.assertEqual(cached_finds, uncached_finds)
+
+    def test_mongo_operations(self):
+        with trace_mongo_calls('index') as trace:
+            self._render(self.sections[0])
+        self.assertGreater(trace.total_count, 0)
+
+        # Other sections of the course don't need more operations
+        with check_mongo_operations(trace.total_count):
+            self._render(self.sections[1])
+
+
 @override_settings(MODULESTORE=TEST_DATA_MIXED_MODULESTORE)
 class StartDateTests(ModuleStoreTestCase):
     """
@@ -5,10 +5,14 @@ Does not include any access control, be sure to check access before calling.
 """
 
 import json
+import logging
 from django.contrib.auth.models import User
 from django.conf import settings
+from django.core.exceptions import ObjectDoesNotExist, ValidationError
 from django.core.urlresolvers import reverse
-from django.core.mail import send_mail
+from django.core.mail import EmailMessage, get_connection, send_mail
+from django.core.validators import validate_email
+from django.db.models import Q
 
 from student.models import CourseEnrollment, CourseEnrollmentAllowed
 from courseware.models import StudentModule
@@ -19,6 +23,8 @@ from student.models import anonymous_id_for_user
 
 from microsite_configuration import microsite
 
+log = logging.getLogger(__name__)
+
 
 class EmailEnrollmentState(object):
     """ Store the complete enrollment state of an email in a class """
@@ -138,6 +144,127 @@ def unenroll_email(course_id, student_email, email_students=False, email_params=
     return previous_state, after_state
 
 
+def _full_name(user):
+    """
+    Return the full name of `user`, or None if they have no profile.
+    """
+    try:
+        return user.profile.name
+    except ObjectDoesNotExist:
+        return None
+
+
+def bulk_update_enrollment(course_id, identifiers, action, auto_enroll=False):
+    """
+    Enroll (`action` 'enroll') or unenroll (`action` 'unenroll') students given
+    by email or username, like `enroll_email` and `unenroll_email` do for one
+    student, with a few queries for all of them.
+
+    `identifiers` is a list of emails and/or usernames, of a size which can be
+        used in a query (see settings.ENROLLMENT_UPDATES_PER_BATCH).
+    `auto_enroll` determines what is put in CourseEnrollmentAllowed.auto_enroll
+        for the emails which aren't registered yet.
+
+    Returns a tuple of:
+    - the list of the results of the identifiers, each a dict with the keys
+      'identifier' and either 'invalidIdentifier' (True) or 'before' and
+      'after' (the EmailEnrollmentState dicts of the student);
+    - the list of the notifications which can be sent to the students with
+      `send_mails_to_students`, each a tuple of (message, email, full name,
+      identifier).
+    """
+    if action not in ('enroll', 'unenroll'):
+        raise ValueError(u"Unrecognized action '{}'".format(action))
+
+    # find the users, by email or by username like get_student_from_identifier
+    emails = [email_or_username for email_or_username in identifiers if '@' in email_or_username]
+    usernames = [email_or_username for email_or_username in identifiers if '@' not in email_or_username]
+    users = User.objects.filter(Q(email__in=emails) | Q(username__in=usernames)).select_related('profile')
+    users_by_email = dict((user.email.lower(), user) for user in users)
+    users_by_username = dict((user.username.lower(), user) for user in users)
+
+    results = []
+    students = []
+    for identifier in identifiers:
+        if '@' in identifier:
+            user = users_by_email.get(identifier.lower())
+        else:
+            user = users_by_username.get(identifier.lower())
+        email = user.email if user is not None else identifier
+        try:
+            validate_email(email)
+        except ValidationError:
+            results.append({'identifier': identifier, 'invalidIdentifier': True})
+        else:
+            result = {'identifier': identifier}
+            results.append(result)
+            students.append((result, email, user))
+
+    users = dict((user.id, user) for __, __, user in students if user is not None)
+    active_enrollments = set(CourseEnrollment.objects.filter(
+        course_id=course_id, user__in=users.keys(), is_active=True
+    ).values_list('user_id', flat=True))
+    allowed = dict(
+        (cea.email.lower(), cea)
+        for cea in CourseEnrollmentAllowed.objects.filter(
+            course_id=course_id, email__in=[student_email for __, student_email, __ in students]
+        )
+    )
+
+    for result, email, user in students:
+        cea = allowed.get(email.lower())
+        result['before'] = {
+            'user': user is not None,
+            'enrollment': user is not None and user.id in active_enrollments,
+            'allowed': cea is not None,
+            'auto_enroll': cea is not None and cea.auto_enroll,
+        }
+        result['after'] = dict(result['before'])
+
+    notifications = []
+    if action == 'enroll':
+        CourseEnrollment.bulk_enroll(users.values(), course_id)
+        allowed_emails = set()
+        for result, email, user in students:
+            if user is not None:
+                result['after']['enrollment'] = True
+                notifications.append(('enrolled_enroll', email, _full_name(user), result['identifier']))
+            else:
+                allowed_emails.add(email.lower())
+                result['after']['allowed'] = True
+                result['after']['auto_enroll'] = auto_enroll
+                notifications.append(('allowed_enroll', email, None, result['identifier']))
+
+        changed_allowed = [
+            allowed_cea.pk for allowed_email, allowed_cea in allowed.iteritems()
+            if allowed_email in allowed_emails and allowed_cea.auto_enroll != auto_enroll
+        ]
+        if changed_allowed:
+            CourseEnrollmentAllowed.objects.filter(pk__in=changed_allowed).update(auto_enroll=auto_enroll)
+        CourseEnrollmentAllowed.objects.bulk_create([
+            CourseEnrollmentAllowed(course_id=course_id, email=new_email, auto_enroll=auto_enroll)
+            for new_email in allowed_emails if new_email not in allowed
+        ])
+    else:
+        CourseEnrollment.bulk_unenroll(
+            [enrolled_user for user_id, enrolled_user in users.iteritems() if user_id in active_enrollments],
+            course_id
+        )
+        for result, email, user in students:
+            if result['before']['enrollment']:
+                result['after']['enrollment'] = False
+                notifications.append(('enrolled_unenroll', email, _full_name(user), result['identifier']))
+            if result['before']['allowed']:
+                result['after']['allowed'] = False
+                result['after']['auto_enroll'] = False
+                # Since no User object exists for this student there is no "full_name" available.
+                notifications.append(('allowed_unenroll', email, None, result['identifier']))
+        if allowed:
+            CourseEnrollmentAllowed.objects.filter(pk__in=[allowed_cea.pk for allowed_cea in allowed.itervalues()]).delete()
+
+    return results, notifications
+
+
 def send_beta_role_email(action, user, email_params):
     """
     Send an email to a user added or removed as a beta tester.
@@ -269,9 +396,10 @@ def get_email_params(course, auto_enroll, secure=True):
     return email_params
 
 
-def send_mail_to_student(student, param_dict):
+def _render_mail_to_student(student, param_dict):
     """
-    Construct the email using templates and then send it.
+    Construct the email using templates, and return its subject, message and
+    from address, or None if there is no email for its message type.
     `student` is the student's email address (a `str`),
 
     `param_dict` is a `dict` with keys
@@ -286,8 +414,6 @@ def send_mail_to_student(student, param_dict):
         `message`: type of email to send and template to use (a `str`)
         `is_shib_course`: (a `boolean`)
     ]
-
-    Returns a boolean indicating whether the email was sent successfully.
     """
 
     # add some helpers and microconfig subsitutions
@@ -349,9 +475,66 @@ def send_mail_to_student(student, param_dict):
             settings.DEFAULT_FROM_EMAIL
         )
 
+        return subject, message, from_address
+    return None
+
+
+def send_mail_to_student(student, param_dict):
+    """
+    Construct the email using templates and then send it.
+    `student` is the student's email address (a `str`),
+
+    `param_dict` is a `dict` with the keys documented in `_render_mail_to_student`.
+    """
+    mail = _render_mail_to_student(student, param_dict)
+    if mail is not None:
+        subject, message, from_address = mail
         send_mail(subject, message, from_address, [student], fail_silently=False)
 
 
+def send_mails_to_students(notifications, email_params):
+    """
+    Send the `notifications` returned by `bulk_update_enrollment`, over a
+    single connection to the mail server.
+
+    `email_params` parameters used while parsing email templates (a `dict`).
+
+    Returns the list of the notifications which could not be sent; a failure
+    to send one email doesn't prevent the others from being sent.
+    """
+    messages = []
+    for notification in notifications:
+        message_type, email, full_name, __ = notification
+        param_dict = dict(email_params, message=message_type, email_address=email)
+        if full_name is not None:
+            param_dict['full_name'] = full_name
+        mail = _render_mail_to_student(email, param_dict)
+        if mail is not None:
+            subject, message, from_address = mail
+            messages.append((notification, EmailMessage(subject, message, from_address, [email])))
+    if not messages:
+        return []
+
+    connection = get_connection(fail_silently=False)
+    try:
+        connection.open()
+    except Exception:  # pylint: disable=broad-except
+        log.exception(u"Could not connect to the mail server to send %d enrollment emails", len(messages))
+        return [unsent[0] for unsent in messages]
+
+    failed = []
+    try:
+        for notification, message in messages:
+            try:
+                connection.send_messages([message])
+            except Exception:  # pylint: disable=broad-except
+                log.exception(u"Could not send the enrollment email to %s", notification[1])
+                failed.append(notification)
+    finally:
+        connection.close()
+    return failed
+
+
 def uses_shib(course):
     """
     Used to return whether course has Shibboleth as the enrollment domain
@@ -0,0 +1,126 @@
+"""
+Students and grades of the spoc gradebook.
+
+The gradebook shows one page of the enrolled students at a time, so only the
+students of the page are graded. Their grades are read, in order, from:
+
+- the cache, where the grades computed by the gradebook are kept for
+  settings.GRADEBOOK_GRADE_CACHE_TIMEOUT seconds;
+- the grades computed offline (see `instructor.offline_gradecalc`), when they
+  are asked for;
+- the grading of the students, which is then cached.
+
+The cached grades of a student are removed when the student's scores change
+(see `invalidate_cached_grades`).
+"""
+import json
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db.models import Q
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from courseware.models import OfflineComputedGrade, StudentModule
+from instructor.offline_gradecalc import student_grades
+from student.models import anonymous_ids_for_users
+
+# The ways students can be sorted in the gradebook, by the name of the sort.
+GRADEBOOK_SORTS = {
+    'username': 'username',
+    'email': 'email',
+    'name': 'profile__name',
+}
+
+# The fields of the grade summaries the gradebook shows, and caches.
+GRADE_SUMMARY_FIELDS = ('grade', 'percent', 'section_breakdown', 'grade_breakdown')
+
+
+def gradebook_students(course_key, sort='username', search=None):
+    """
+    Return the students enrolled in the course, ordered by `sort` (one of
+    GRADEBOOK_SORTS, optionally prefixed by '-' for a descending order), whose
+    username, email or name contains `search`.
+
+    Raises ValueError if `sort` is unknown.
+    """
+    descending = sort.startswith('-')
+    order_by = GRADEBOOK_SORTS.get(sort.lstrip('-'))
+    if order_by is None:
+        raise ValueError(u"Unknown gradebook sort: {}".format(sort))
+
+    students = User.objects.filter(
+        courseenrollment__course_id=course_key,
+        courseenrollment__is_active=1
+    )
+    if search:
+        students = students.filter(
+            Q(username__icontains=search) | Q(email__icontains=search) | Q(profile__name__icontains=search)
+        )
+    # order by username too, so that the pages are stable when names are equal
+    return students.order_by(
+        ('-' if descending else '') + order_by,
+        '-username' if descending else 'username'
+    ).select_related('profile')
+
+
+def _grade_cache_key(course_key, student_id):
+    """
+    Return the cache key of the grades of the student in the course.
+    """
+    return u"gradebook.grades.{}.{}".format(course_key, student_id)
+
+
+@receiver(post_save, sender=StudentModule)
+@receiver(post_delete, sender=StudentModule)
+def invalidate_cached_grades(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Remove the cached grades of the student of a StudentModule whose score was
+    saved (by a submission or a rescore) or which was deleted (by a reset of
+    the student's attempts).
+    """
+    if kwargs.get('signal') is post_save and instance.grade is None and instance.max_grade is None:
+        # the state of an ungraded module, like the position in a sequence
+        return
+    cache.delete(_grade_cache_key(instance.course_id, instance.student_id))
+
+
+def _summarize(gradeset):
+    """
+    Return the fields of the grade summary `gradeset` which the gradebook shows.
+    """
+    return {field: gradeset[field] for field in GRADE_SUMMARY_FIELDS if field in gradeset}
+
+
+def gradebook_grades(request, course, students, use_offline=False):
+    """
+    Return the grade summaries of the `students` of the course, by student id.
+
+    Only the students whose grades are neither cached nor computed offline
+    (when `use_offline`) are graded.
+    """
+    cache_keys = {_grade_cache_key(course.id, student.id): student for student in students}
+    cached = cache.get_many(cache_keys.keys())
+    grades = {cache_keys[key].id: summary for key, summary in cached.iteritems()}
+
+    ungraded = [student for student in students if student.id not in grades]
+    if ungraded and use_offline:
+        offline_grades = OfflineComputedGrade.objects.filter(
+            course_id=course.id,
+            user__in=[student.id for student in ungraded],
+        )
+        for offline_grade in offline_grades:
+            grades[offline_grade.user_id] = _summarize(json.loads(offline_grade.gradeset))
+        ungraded = [student for student in ungraded if student.id not in grades]
+
+    computed = {}
+    anonymous_ids_for_users(ungraded, course.id)
+    for student in ungraded:
+        summary = _summarize(student_grades(student, request, course))
+        grades[student.id] = summary
+        computed[_grade_cache_key(course.id, student.id)] = summary
+    if computed:
+        cache.set_many(computed, settings.GRADEBOOK_GRADE_CACHE_TIMEOUT)
+
+    return grades
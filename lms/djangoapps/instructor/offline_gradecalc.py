@@ -13,6 +13,7 @@ from json import JSONEncoder
 from courseware import grades, models
 from courseware.courses import get_course_by_id
 from django.contrib.auth.models import User
+from student.models import anonymous_ids_for_users
 
 from instructor.utils import DummyRequest
 
@@ -42,6 +43,7 @@ def offline_grade_calculation(course_key):
 
     print "{} enrolled students".format(len(enrolled_students))
     course = get_course_by_id(course_key)
+    anonymous_ids_for_users(enrolled_students, course_key)
 
     for student in enrolled_students:
         request = DummyRequest()
@@ -0,0 +1,5 @@
+"""
+Register the signal receivers of the instructor app during django startup.
+"""
+# the receivers removing the cached gradebook grades are connected on import
+from instructor import gradebook  # pylint: disable=unused-import
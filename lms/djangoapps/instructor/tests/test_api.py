@@ -9,6 +9,7 @@ import requests
 import datetime
 import ddt
 import random
+from smtplib import SMTPException
 from urllib import quote
 from django.test import TestCase
 from nose.tools import raises
@@ -518,6 +519,37 @@ class TestInstructorAPIEnrollment(ModuleStoreTestCase, LoginEnrollmentTestCase):
             )
         )
 
+    def test_enroll_with_email_failure(self):
+        url = reverse('students_update_enrollment', kwargs={'course_id': self.course.id.to_deprecated_string()})
+        params = {
+            'identifiers': u'{}, {}'.format(self.notenrolled_student.username, self.notregistered_email),
+            'action': 'enroll',
+            'email_students': True,
+        }
+
+        def send_messages(messages):
+            """ Fail to send the email of the student who isn't registered yet. """
+            if messages[0].to == [self.notregistered_email]:
+                raise SMTPException("mail server error")
+            mail.outbox.extend(messages)
+            return len(messages)
+
+        with patch('django.core.mail.backends.locmem.EmailBackend.send_messages', side_effect=send_messages):
+            response = self.client.post(url, params)
+        self.assertEqual(response.status_code, 200)
+
+        # the enrollments are kept, and the email which wasn't sent is reported
+        self.assertTrue(CourseEnrollment.is_enrolled(self.notenrolled_student, self.course.id))
+        self.assertTrue(CourseEnrollmentAllowed.objects.filter(
+            course_id=self.course.id, email=self.notregistered_email
+        ).exists())
+        results = json.loads(response.content)['results']
+        self.assertNotIn('emailError', results[0])
+        self.assertTrue(results[0]['after']['enrollment'])
+        self.assertTrue(results[1]['emailError'])
+        self.assertTrue(results[1]['after']['allowed'])
+        self.assertEqual([message.to for message in mail.outbox], [[self.notenrolled_student.email]])
+
     @ddt.data('http', 'https')
     def test_enroll_with_email_not_registered(self, protocol):
         url = reverse('students_update_enrollment', kwargs={'course_id': self.course.id.to_deprecated_string()})
@@ -808,6 +840,35 @@ class TestInstructorAPIEnrollment(ModuleStoreTestCase, LoginEnrollmentTestCase):
             )
         )
 
+    def test_enroll_many(self):
+        url = reverse('students_update_enrollment', kwargs={'course_id': self.course.id.to_deprecated_string()})
+        identifiers = [self.notenrolled_student.username, self.enrolled_student.email, self.notregistered_email]
+        params = {'identifiers': ', '.join(identifiers), 'action': 'enroll', 'email_students': True}
+        response = self.client.post(url, params)
+        self.assertEqual(response.status_code, 200)
+
+        res_json = json.loads(response.content)
+        self.assertEqual([result['identifier'] for result in res_json['results']], identifiers)
+        self.assertTrue(CourseEnrollment.is_enrolled(self.notenrolled_student, self.course.id))
+        self.assertTrue(CourseEnrollmentAllowed.objects.filter(email=self.notregistered_email).exists())
+        self.assertEqual(len(mail.outbox), 3)
+
+    @override_settings(ENROLLMENT_UPDATES_PER_BATCH=1)
+    def test_enroll_many_as_task(self):
+        url = reverse('students_update_enrollment', kwargs={'course_id': self.course.id.to_deprecated_string()})
+        identifiers = [self.notenrolled_student.username, self.notregistered_email]
+        params = {'identifiers': '\n'.join(identifiers), 'action': 'enroll', 'email_students': True}
+        with patch('instructor_task.api.submit_update_enrollments') as mock_submit:
+            response = self.client.post(url, params)
+        self.assertEqual(response.status_code, 200)
+
+        args = mock_submit.call_args[0]
+        self.assertEqual(args[1:], (self.course.id, identifiers, 'enroll', False, True))
+        res_json = json.loads(response.content)
+        self.assertEqual(res_json['results'], [])
+        self.assertIn('status', res_json)
+        self.assertFalse(CourseEnrollment.is_enrolled(self.notenrolled_student, self.course.id))
+
 
 @ddt.ddt
 @override_settings(MODULESTORE=TEST_DATA_MIXED_MODULESTORE)
@@ -1729,6 +1790,30 @@ class TestInstructorAPILevelsDataDump(ModuleStoreTestCase, LoginEnrollmentTestCa
         already_running_status = "{report_type} report generation task is already in progress. Check the 'Pending Instructor Tasks' table for the status of the task. When completed, the report will be available for download in the table below.".format(report_type=report_type)
         self.assertIn(already_running_status, response.content)
 
+    def test_generate_certificates_success(self):
+        url = reverse('generate_certificates', kwargs={'course_id': unicode(self.course.id)})
+        with patch('instructor_task.api.submit_generate_certificates') as mock_submit:
+            response = self.client.get(url, {})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(mock_submit.call_args[0][1], self.course.id)
+        self.assertIn("Certificates are being requested for the enrolled students.", response.content)
+
+    def test_generate_certificates_already_running(self):
+        url = reverse('generate_certificates', kwargs={'course_id': unicode(self.course.id)})
+        with patch('instructor_task.api.submit_generate_certificates') as mock_submit:
+            mock_submit.side_effect = AlreadyRunningError()
+            response = self.client.get(url, {})
+        self.assertIn("Certificates are already being requested for this course.", response.content)
+
+    def test_generate_certificates_staff_forbidden(self):
+        staff = StaffFactory(course_key=self.course.id)
+        self.client.login(username=staff.username, password='test')
+        url = reverse('generate_certificates', kwargs={'course_id': unicode(self.course.id)})
+        with patch('instructor_task.api.submit_generate_certificates') as mock_submit:
+            response = self.client.get(url, {})
+        self.assertEqual(response.status_code, 403)
+        self.assertFalse(mock_submit.called)
+
     def test_get_distribution_no_feature(self):
         """
         Test that get_distribution lists available features
@@ -16,6 +16,7 @@ from courseware.tests.modulestore_config import TEST_DATA_MIXED_MODULESTORE
 from student.models import CourseEnrollment, CourseEnrollmentAllowed
 from instructor.enrollment import (
     EmailEnrollmentState,
+    bulk_update_enrollment,
     enroll_email,
     get_email_params,
     reset_student_attempts,
@@ -286,6 +287,77 @@ class TestInstructorUnenrollDB(TestEnrollmentChangeBase):
         return self._run_state_change_test(before_ideal, after_ideal, action)
 
 
+class TestInstructorBulkUpdateDB(TestEnrollmentChangeBase):
+    """ Test instructor.enrollment.bulk_update_enrollment """
+    def _bulk_update(self, email, action, auto_enroll=False):
+        """
+        Update the enrollment of `email`, checking that the result matches the
+        database.
+        """
+        before = EmailEnrollmentState(self.course_key, email)
+        results, __ = bulk_update_enrollment(self.course_key, [email], action, auto_enroll)
+        after = EmailEnrollmentState(self.course_key, email)
+        self.assertEqual(results, [{'identifier': email, 'before': before.to_dict(), 'after': after.to_dict()}])
+
+    def test_enroll(self):
+        before_ideal = SettableEnrollmentState(user=True, enrollment=False, allowed=False, auto_enroll=False)
+        after_ideal = SettableEnrollmentState(user=True, enrollment=True, allowed=False, auto_enroll=False)
+        action = lambda email: self._bulk_update(email, 'enroll')
+        return self._run_state_change_test(before_ideal, after_ideal, action)
+
+    def test_enroll_again(self):
+        before_ideal = SettableEnrollmentState(user=True, enrollment=True, allowed=False, auto_enroll=False)
+        after_ideal = SettableEnrollmentState(user=True, enrollment=True, allowed=False, auto_enroll=False)
+        action = lambda email: self._bulk_update(email, 'enroll')
+        return self._run_state_change_test(before_ideal, after_ideal, action)
+
+    def test_enroll_nouser_autoenroll(self):
+        before_ideal = SettableEnrollmentState(user=False, enrollment=False, allowed=False, auto_enroll=False)
+        after_ideal = SettableEnrollmentState(user=False, enrollment=False, allowed=True, auto_enroll=True)
+        action = lambda email: self._bulk_update(email, 'enroll', auto_enroll=True)
+        return self._run_state_change_test(before_ideal, after_ideal, action)
+
+    def test_enroll_nouser_change_autoenroll(self):
+        before_ideal = SettableEnrollmentState(user=False, enrollment=False, allowed=True, auto_enroll=True)
+        after_ideal = SettableEnrollmentState(user=False, enrollment=False, allowed=True, auto_enroll=False)
+        action = lambda email: self._bulk_update(email, 'enroll', auto_enroll=False)
+        return self._run_state_change_test(before_ideal, after_ideal, action)
+
+    def test_unenroll(self):
+        before_ideal = SettableEnrollmentState(user=True, enrollment=True, allowed=False, auto_enroll=False)
+        after_ideal = SettableEnrollmentState(user=True, enrollment=False, allowed=False, auto_enroll=False)
+        action = lambda email: self._bulk_update(email, 'unenroll')
+        return self._run_state_change_test(before_ideal, after_ideal, action)
+
+    def test_unenroll_disallow(self):
+        before_ideal = SettableEnrollmentState(user=False, enrollment=False, allowed=True, auto_enroll=True)
+        after_ideal = SettableEnrollmentState(user=False, enrollment=False, allowed=False, auto_enroll=False)
+        action = lambda email: self._bulk_update(email, 'unenroll')
+        return self._run_state_change_test(before_ideal, after_ideal, action)
+
+    def test_enroll_many(self):
+        users = [UserFactory() for __ in range(3)]
+        CourseEnrollment.enroll(users[0], self.course_key)
+        CourseEnrollment.unenroll(users[1], self.course_key)
+        identifiers = [users[0].username, users[1].email, users[2].username, 'new@example.com', 'invalid']
+
+        results, notifications = bulk_update_enrollment(self.course_key, identifiers, 'enroll')
+
+        self.assertEqual([result['identifier'] for result in results], identifiers)
+        self.assertTrue(results[-1]['invalidIdentifier'])
+        for user in users:
+            self.assertTrue(CourseEnrollment.is_enrolled(user, self.course_key))
+        self.assertEqual(CourseEnrollment.objects.filter(course_id=self.course_key).count(), 3)
+        self.assertEqual(
+            [message for message, __, __, __ in notifications],
+            ['enrolled_enroll'] * 3 + ['allowed_enroll']
+        )
+
+    def test_bad_action(self):
+        with self.assertRaises(ValueError):
+            bulk_update_enrollment(self.course_key, ['robot@example.com'], 'promote')
+
+
 @override_settings(MODULESTORE=TEST_DATA_MIXED_MODULESTORE)
 class TestInstructorEnrollmentStudentModule(TestCase):
     """ Test student module manipulations. """
@@ -2,6 +2,9 @@
 Tests of the instructor dashboard spoc gradebook
 """
 
+from mock import patch
+
+from django.core.cache import cache
 from django.test.utils import override_settings
 from django.core.urlresolvers import reverse
 from xmodule.modulestore.tests.factories import CourseFactory, ItemFactory
@@ -9,7 +12,9 @@ from student.tests.factories import UserFactory, CourseEnrollmentFactory, AdminF
 from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
 from courseware.tests.tests import TEST_DATA_MIXED_MODULESTORE
 from capa.tests.response_xml_factory import StringResponseXMLFactory
+from courseware.models import StudentModule
 from courseware.tests.factories import StudentModuleFactory
+from instructor.offline_gradecalc import student_grades
 from xmodule.modulestore.django import modulestore
 
 
@@ -30,6 +35,7 @@ class TestGradebook(ModuleStoreTestCase):
         self.client.login(username=instructor.username, password='test')
 
         # remove the caches
+        cache.clear()
         modulestore().request_cache = None
         modulestore().metadata_inheritance_cache_subsystem = None
 
@@ -71,10 +77,16 @@ class TestGradebook(ModuleStoreTestCase):
                     module_state_key=item.location
                 )
 
-        self.response = self.client.get(reverse(
-            'spoc_gradebook',
-            args=(self.course.id.to_deprecated_string(),)
-        ))
+        self.response = self.get_gradebook()
+
+    def get_gradebook(self, view='spoc_gradebook', **params):
+        """
+        Return the response of the gradebook `view` with the GET `params`.
+        """
+        return self.client.get(
+            reverse(view, args=(self.course.id.to_deprecated_string(),)),
+            params
+        )
 
     def test_response_code(self):
         self.assertEquals(self.response.status_code, 200)
@@ -166,3 +178,77 @@ class TestLetterCutoffPolicy(TestGradebook):
         # User 0 has 0 on the class [1]
         # One use at the top of the page [1]
         self.assertEquals(3, self.response.content.count('grade_None'))
+
+
+@override_settings(GRADEBOOK_PAGE_SIZE=4)
+class TestGradebookPages(TestGradebook):
+    """
+    Tests of the pagination, sorting, searching and caching of the gradebook, and
+    of its csv export.
+    """
+    def assert_users_listed(self, response, users):
+        """
+        Assert that exactly `users` are listed in the gradebook `response`.
+        """
+        content = unicode(response.content, 'utf-8')
+        for user in self.users:
+            link_text = u">{}</a>".format(user.username)
+            if user in users:
+                self.assertIn(link_text, content)
+            else:
+                self.assertNotIn(link_text, content)
+
+    def test_pages(self):
+        users = sorted(self.users, key=lambda user: user.username)
+        self.assert_users_listed(self.response, users[:4])
+        self.assert_users_listed(self.get_gradebook(page=2), users[4:8])
+        self.assert_users_listed(self.get_gradebook(page=3), users[8:])
+        # out of range pages show the last page
+        self.assert_users_listed(self.get_gradebook(page=4), users[8:])
+
+    def test_sort(self):
+        users = sorted(self.users, key=lambda user: user.email, reverse=True)
+        self.assert_users_listed(self.get_gradebook(sort='-email'), users[:4])
+
+    def test_unknown_sort(self):
+        self.assertEquals(self.get_gradebook(sort='password').status_code, 400)
+
+    def test_search(self):
+        user = self.users[7]
+        self.assert_users_listed(self.get_gradebook(search=user.email), [user])
+
+    @patch('instructor.gradebook.student_grades')
+    def test_grades_cached(self, mock_student_grades):
+        # the first page was graded by setUp
+        self.get_gradebook()
+        self.assertFalse(mock_student_grades.called)
+
+    @patch('instructor.gradebook.student_grades', wraps=student_grades)
+    def test_grades_cache_invalidated(self, mock_student_grades):
+        users = sorted(self.users, key=lambda user: user.username)[:3]
+        # a rescore of a student, and a reset of the attempts of another
+        module = StudentModule.objects.filter(student=users[0], course_id=self.course.id)[0]
+        module.grade = 1 - module.grade
+        module.save()
+        StudentModule.objects.filter(student=users[1], course_id=self.course.id)[0].delete()
+        # the position in a sequence doesn't change the grades
+        StudentModuleFactory.create(
+            student=users[2],
+            course_id=self.course.id,
+            module_type='sequential',
+            module_state_key=self.course.id.make_usage_key('sequential', 'position'),
+        )
+
+        self.get_gradebook()
+        self.assertItemsEqual([args[0] for args, __ in mock_student_grades.call_args_list], users[:2])
+
+    def test_csv(self):
+        response = self.get_gradebook('spoc_gradebook_csv')
+        self.assertEquals(response['Content-Type'], 'text/csv')
+        content = response.content
+        lines = content.splitlines()
+        self.assertEquals(lines[0].split(',')[:4], ['"id"', '"username"', '"email"', '"name"'])
+        self.assertEquals(lines[0].split(',')[-1], '"Total"')
+        self.assertEquals(len(lines), USER_COUNT + 1)
+        for user in self.users:
+            self.assertIn('"{}"'.format(user.username), content)
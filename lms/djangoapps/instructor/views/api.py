@@ -15,11 +15,10 @@ from django.conf import settings
 from django_future.csrf import ensure_csrf_cookie
 from django.views.decorators.http import require_POST
 from django.views.decorators.cache import cache_control
-from django.core.exceptions import ValidationError
+from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
 from django.core.mail.message import EmailMessage
 from django.db import IntegrityError
 from django.core.urlresolvers import reverse
-from django.core.validators import validate_email
 from django.utils.translation import ugettext as _
 from django.http import HttpResponse, HttpResponseBadRequest, HttpResponseForbidden, HttpResponseNotFound
 from django.utils.html import strip_tags
@@ -49,13 +48,13 @@ from instructor_task.api_helper import AlreadyRunningError
 from instructor_task.models import ReportStore
 import instructor.enrollment as enrollment
 from instructor.enrollment import (
-    enroll_email,
+    bulk_update_enrollment,
     get_email_params,
     send_beta_role_email,
-    unenroll_email
+    send_mails_to_students,
 )
 from instructor.access import list_with_level, allow_access, revoke_access, update_forum_role
-from instructor.offline_gradecalc import student_grades
+from instructor.gradebook import gradebook_students, gradebook_grades
 import instructor_analytics.basic
 import instructor_analytics.distributions
 import instructor_analytics.csvs
@@ -235,6 +234,11 @@ def students_update_enrollment(request, course_id):
         If email_students is true, students will be sent email notification
         If email_students is false, students will not be sent email notification
 
+    When there are more than settings.ENROLLMENT_UPDATES_PER_BATCH identifiers,
+    the students are updated by an instructor task, and the response has no
+    results but a 'status' message. The result of a student whose email could
+    not be sent has 'emailError' set to true; the enrollment is still updated.
+
     Returns an analog to this JSON structure: {
         "action": "enroll",
         "auto_enroll": false,
@@ -264,62 +268,46 @@ def students_update_enrollment(request, course_id):
     auto_enroll = request.POST.get('auto_enroll') in ['true', 'True', True]
     email_students = request.POST.get('email_students') in ['true', 'True', True]
 
-    email_params = {}
-    if email_students:
-        course = get_course_by_id(course_id)
-        email_params = get_email_params(course, auto_enroll, secure=request.is_secure())
-
-    results = []
-    for identifier in identifiers:
-        # First try to get a user object from the identifer
-        user = None
-        email = None
-        try:
-            user = get_student_from_identifier(identifier)
-        except User.DoesNotExist:
-            email = identifier
-        else:
-            email = user.email
+    if action not in ['enroll', 'unenroll']:
+        return HttpResponseBadRequest(strip_tags(
+            "Unrecognized action '{}'".format(action)
+        ))
 
+    if len(identifiers) > settings.ENROLLMENT_UPDATES_PER_BATCH:
+        # too many students to update within the request
         try:
-            # Use django.core.validators.validate_email to check email address
-            # validity (obviously, cannot check if email actually /exists/,
-            # simply that it is plausibly valid)
-            validate_email(email)  # Raises ValidationError if invalid
-
-            if action == 'enroll':
-                before, after = enroll_email(course_id, email, auto_enroll, email_students, email_params)
-            elif action == 'unenroll':
-                before, after = unenroll_email(course_id, email, email_students, email_params)
-            else:
-                return HttpResponseBadRequest(strip_tags(
-                    "Unrecognized action '{}'".format(action)
-                ))
-
-        except ValidationError:
-            # Flag this email as an error if invalid, but continue checking
-            # the remaining in the list
-            results.append({
-                'identifier': identifier,
-                'invalidIdentifier': True,
-            })
-
-        except Exception as exc:  # pylint: disable=W0703
-            # catch and log any exceptions
-            # so that one error doesn't cause a 500.
-            log.exception("Error while #{}ing student")
-            log.exception(exc)
-            results.append({
-                'identifier': identifier,
-                'error': True,
-            })
+            instructor_task.api.submit_update_enrollments(
+                request, course_id, identifiers, action, auto_enroll, email_students
+            )
+            status = _("The enrollments are being updated! You can view the status of the update task in the 'Pending Instructor Tasks' section.")
+        except AlreadyRunningError:
+            status = _("The same enrollment update is already in progress. Check the 'Pending Instructor Tasks' table for the status of the task.")
+        return JsonResponse({
+            'action': action,
+            'results': [],
+            'auto_enroll': auto_enroll,
+            'status': status,
+        })
 
-        else:
-            results.append({
-                'identifier': identifier,
-                'before': before.to_dict(),
-                'after': after.to_dict(),
-            })
+    try:
+        results, notifications = bulk_update_enrollment(course_id, identifiers, action, auto_enroll)
+    except Exception as exc:  # pylint: disable=W0703
+        # catch and log any exceptions
+        # so that one error doesn't cause a 500.
+        log.exception("Error while #{}ing students".format(action))
+        log.exception(exc)
+        results = [{'identifier': identifier, 'error': True} for identifier in identifiers]
+    else:
+        if email_students:
+            course = get_course_by_id(course_id)
+            email_params = get_email_params(course, auto_enroll, secure=request.is_secure())
+            # the enrollments are kept even if some of the emails can't be sent
+            failed_identifiers = set(
+                identifier for __, __, __, identifier in send_mails_to_students(notifications, email_params)
+            )
+            for result in results:
+                if result['identifier'] in failed_identifiers:
+                    result['emailError'] = True
 
     response_payload = {
         'action': action,
@@ -1418,6 +1406,27 @@ def calculate_grades_csv(request, course_id):
         })
 
 
+@ensure_csrf_cookie
+@cache_control(no_cache=True, no_store=True, must_revalidate=True)
+@require_level('instructor')
+def generate_certificates(request, course_id):
+    """
+    Request certificates for all the students enrolled in the course, as a background task.
+
+    AlreadyRunningError is raised if certificates are already being requested for the course.
+    """
+    course_key = SlashSeparatedCourseKey.from_deprecated_string(course_id)
+    try:
+        instructor_task.api.submit_generate_certificates(request, course_key)
+        success_status = _("Certificates are being requested for the enrolled students. You can view the status of the task in the 'Pending Instructor Tasks' section.")
+        return JsonResponse({"status": success_status})
+    except AlreadyRunningError:
+        already_running_status = _("Certificates are already being requested for this course. Check the 'Pending Instructor Tasks' table for the status of the task.")
+        return JsonResponse({
+            "status": already_running_status
+        })
+
+
 @ensure_csrf_cookie
 @cache_control(no_cache=True, no_store=True, must_revalidate=True)
 @require_level('staff')
@@ -1771,41 +1780,115 @@ def _split_input_list(str_list):
     return new_list
 
 
-#---- Gradebook (shown to small courses only) ----
+#---- Gradebook ----
 @cache_control(no_cache=True, no_store=True, must_revalidate=True)
 @require_level('staff')
 def spoc_gradebook(request, course_id):
     """
-    Show the gradebook for this course:
-    - Only shown for courses with enrollment < settings.FEATURES.get("MAX_ENROLLMENT_INSTR_BUTTONS")
-    - Only displayed to course staff
+    Show a page of the gradebook for this course, only displayed to course staff.
+
+    Only the students of the page are graded (see `instructor.gradebook`).
+
+    Takes the optional GET parameters:
+    - page: the number of the page, from 1
+    - sort: one of `instructor.gradebook.GRADEBOOK_SORTS` ('username' by
+      default), prefixed by '-' for a descending order
+    - search: only show the students whose username, email or name contains it
+    - use_offline: read the grades computed offline, when there are some
     """
     course_key = SlashSeparatedCourseKey.from_deprecated_string(course_id)
     course = get_course_with_access(request.user, 'staff', course_key, depth=None)
 
-    enrolled_students = User.objects.filter(
-        courseenrollment__course_id=course_key,
-        courseenrollment__is_active=1
-    ).order_by('username').select_related("profile")
+    sort = request.GET.get('sort', 'username')
+    search = request.GET.get('search', '').strip()
+    use_offline = bool(request.GET.get('use_offline'))
+    try:
+        enrolled_students = gradebook_students(course_key, sort, search)
+    except ValueError as err:
+        return HttpResponseBadRequest(strip_tags(err.message))
 
-    # possible extension: implement pagination to show to large courses
+    paginator = Paginator(enrolled_students, settings.GRADEBOOK_PAGE_SIZE)
+    try:
+        page = paginator.page(request.GET.get('page', 1))
+    except PageNotAnInteger:
+        page = paginator.page(1)
+    except EmptyPage:
+        page = paginator.page(paginator.num_pages)
 
+    grades = gradebook_grades(request, course, page.object_list, use_offline)
     student_info = [
         {
             'username': student.username,
             'id': student.id,
             'email': student.email,
-            'grade_summary': student_grades(student, request, course),
+            'grade_summary': grades[student.id],
             'realname': student.profile.name,
         }
-        for student in enrolled_students
+        for student in page.object_list
     ]
 
     return render_to_response('courseware/gradebook.html', {
         'students': student_info,
+        'page': page,
+        'sort': sort,
+        'search': search,
+        'use_offline': use_offline,
         'course': course,
         'course_id': course_key,
         # Checked above
         'staff_access': True,
         'ordered_grades': sorted(course.grade_cutoffs.items(), key=lambda i: i[1], reverse=True),
     })
+
+
+@cache_control(no_cache=True, no_store=True, must_revalidate=True)
+@require_level('staff')
+def spoc_gradebook_csv(request, course_id):
+    """
+    Stream the gradebook of this course as a csv file, only to course staff.
+
+    Takes the same `sort`, `search` and `use_offline` GET parameters as
+    `spoc_gradebook`. The students are graded a page at a time while the file
+    is sent, so that the response starts right away, however large the course.
+    """
+    course_key = SlashSeparatedCourseKey.from_deprecated_string(course_id)
+    course = get_course_with_access(request.user, 'staff', course_key, depth=None)
+
+    use_offline = bool(request.GET.get('use_offline'))
+    try:
+        enrolled_students = gradebook_students(
+            course_key, request.GET.get('sort', 'username'), request.GET.get('search', '').strip()
+        )
+    except ValueError as err:
+        return HttpResponseBadRequest(strip_tags(err.message))
+
+    def csv_rows():
+        """
+        Yield the lines of the csv file, a page of students at a time.
+        """
+        csv_file = StringIO.StringIO()
+        csv_writer = csv.writer(csv_file, dialect='excel', quotechar='"', quoting=csv.QUOTE_ALL)
+        header_written = False
+        paginator = Paginator(enrolled_students, settings.GRADEBOOK_PAGE_SIZE)
+        for page_number in paginator.page_range:
+            students = paginator.page(page_number).object_list
+            grades = gradebook_grades(request, course, students, use_offline)
+            for student in students:
+                grade_summary = grades[student.id]
+                sections = grade_summary.get('section_breakdown', [])
+                if not header_written:
+                    header = ['id', 'username', 'email', 'name'] + [section['label'] for section in sections]
+                    csv_writer.writerow([unicode(field).encode('utf-8') for field in header + ['Total']])
+                    header_written = True
+                row = [student.id, student.username, student.email, student.profile.name]
+                row += [section['percent'] for section in sections]
+                row.append(grade_summary.get('percent', 0))
+                csv_writer.writerow([unicode(field).encode('utf-8') for field in row])
+            yield csv_file.getvalue()
+            csv_file.truncate(0)
+
+    response = HttpResponse(csv_rows(), mimetype='text/csv')
+    response['Content-Disposition'] = 'attachment; filename={0}'.format(
+        u"{}_gradebook.csv".format(course_key.to_deprecated_string().replace('/', '-')).encode('utf-8')
+    )
+    return response
@@ -66,6 +66,10 @@ urlpatterns = patterns('',  # nopep8
     url(r'calculate_grades_csv$',
         'instructor.views.api.calculate_grades_csv', name="calculate_grades_csv"),
 
+    # Certificates...
+    url(r'generate_certificates$',
+        'instructor.views.api.generate_certificates', name="generate_certificates"),
+
     # Registration Codes..
     url(r'get_registration_codes$',
         'instructor.views.api.get_registration_codes', name="get_registration_codes"),
@@ -83,4 +87,6 @@ urlpatterns = patterns('',  # nopep8
     # spoc gradebook
     url(r'^gradebook$',
         'instructor.views.api.spoc_gradebook', name='spoc_gradebook'),
+    url(r'^gradebook/csv$',
+        'instructor.views.api.spoc_gradebook_csv', name='spoc_gradebook_csv'),
 )
@@ -7,6 +7,7 @@ arguments.
 
 """
 import hashlib
+import json
 
 from celery.states import READY_STATES
 
@@ -18,7 +19,9 @@ from instructor_task.tasks import (rescore_problem,
                                    delete_problem_state,
                                    send_bulk_course_email,
                                    calculate_grades_csv,
-                                   calculate_students_features_csv)
+                                   calculate_students_features_csv,
+                                   generate_certificates,
+                                   update_enrollments)
 
 from instructor_task.api_helper import (check_arguments_for_rescoring,
                                         encode_problem_and_student_input,
@@ -233,3 +236,40 @@ def submit_calculate_students_features_csv(request, course_key, features):
     task_key = ""
 
     return submit_task(request, task_type, task_class, course_key, task_input, task_key)
+
+
+def submit_generate_certificates(request, course_key):
+    """
+    Submits a task to request certificates for all the students enrolled in
+    a course.
+
+    Raises AlreadyRunningError if certificates are already being requested.
+    """
+    task_type = 'generate_certificates'
+    task_class = generate_certificates
+    task_input = {}
+    task_key = ""
+
+    return submit_task(request, task_type, task_class, course_key, task_input, task_key)
+
+
+def submit_update_enrollments(request, course_key, identifiers, action, auto_enroll, email_students):
+    """
+    Submits a task to enroll or unenroll (`action`) the students identified by
+    the emails and/or usernames `identifiers`, and to notify them by email if
+    `email_students`.
+
+    Raises AlreadyRunningError if the same update is already running.
+    """
+    task_type = 'update_enrollments'
+    task_class = update_enrollments
+    task_input = {
+        'action': action,
+        'auto_enroll': auto_enroll,
+        'email_students': email_students,
+        'secure': request.is_secure(),
+        'num_identifiers': len(identifiers),
+    }
+    task_key = hashlib.md5(json.dumps([action, auto_enroll, email_students, identifiers])).hexdigest()
+
+    return submit_task(request, task_type, task_class, course_key, task_input, task_key, [identifiers])
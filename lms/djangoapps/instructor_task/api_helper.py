@@ -276,7 +276,7 @@ def encode_problem_and_student_input(usage_key, student=None):  # pylint: disabl
     return task_input, task_key
 
 
-def submit_task(request, task_type, task_class, course_key, task_input, task_key):
+def submit_task(request, task_type, task_class, course_key, task_input, task_key, extra_task_args=()):
     """
     Helper method to submit a task.
 
@@ -286,6 +286,9 @@ def submit_task(request, task_type, task_class, course_key, task_input, task_key
     the `request` provided by the originating server request.  Then the task is submitted to run
     asynchronously, using the specified `task_class` and using the task_id constructed for it.
 
+    `extra_task_args` are passed to the task after the usual arguments, for
+    inputs too large to be stored in the `task_input`.
+
     `AlreadyRunningError` is raised if the task is already running.
 
     The _reserve_task method makes sure the InstructorTask entry is committed.
@@ -301,7 +304,7 @@ def submit_task(request, task_type, task_class, course_key, task_input, task_key
 
     # submit task:
     task_id = instructor_task.task_id
-    task_args = [instructor_task.id, _get_xmodule_instance_args(request, task_id)]  # pylint: disable=E1101
+    task_args = [instructor_task.id, _get_xmodule_instance_args(request, task_id)] + list(extra_task_args)  # pylint: disable=E1101
     task_class.apply_async(task_args, task_id=task_id)
 
     return instructor_task
@@ -31,9 +31,11 @@ from instructor_task.tasks_helper import (
     reset_attempts_module_state,
     delete_problem_module_state,
     upload_grades_csv,
-    upload_students_csv
+    upload_students_csv,
+    update_enrollments_for_identifiers,
 )
 from bulk_email.tasks import perform_delegate_email_batches
+from certificates.tasks import perform_delegate_certificate_batches
 
 
 @task(base=BaseInstructorTask)  # pylint: disable=E1102
@@ -153,3 +155,29 @@ def calculate_students_features_csv(entry_id, xmodule_instance_args):
     action_name = ugettext_noop('generated')
     task_fn = partial(upload_students_csv, xmodule_instance_args)
     return run_main_task(entry_id, task_fn, action_name)
+
+
+@task(base=BaseInstructorTask, routing_key=settings.GRADES_DOWNLOAD_ROUTING_KEY)  # pylint: disable=E1102
+def generate_certificates(entry_id, _xmodule_instance_args):
+    """
+    Grade the students enrolled in a course, and request certificates for
+    those who earned one, in batches run as subtasks.
+    """
+    # Translators: This is a past-tense verb that is inserted into task progress messages as {action}.
+    action_name = ugettext_noop('certified')
+    return run_main_task(entry_id, perform_delegate_certificate_batches, action_name)
+
+
+@task(base=BaseInstructorTask)  # pylint: disable=E1102
+def update_enrollments(entry_id, _xmodule_instance_args, identifiers):
+    """
+    Enroll or unenroll students in a course, in batches, and notify them by
+    email.
+
+    `identifiers` is the list of the emails and/or usernames of the students,
+    passed apart from the `task_input` for its size.
+    """
+    # Translators: This is a past-tense verb that is inserted into task progress messages as {action}.
+    action_name = ugettext_noop('updated')
+    task_fn = partial(update_enrollments_for_identifiers, identifiers)
+    return run_main_task(entry_id, task_fn, action_name)
@@ -11,6 +11,7 @@ from time import time
 from celery import Task, current_task
 from celery.utils.log import get_task_logger
 from celery.states import SUCCESS, FAILURE
+from django.conf import settings
 from django.contrib.auth.models import User
 from django.db import transaction, reset_queries
 import dogstats_wrapper as dog_stats_api
@@ -19,10 +20,12 @@ from pytz import UTC
 from xmodule.modulestore.django import modulestore
 from track.views import task_track
 
+from courseware.courses import get_course_by_id
 from courseware.grades import iterate_grades_for
 from courseware.models import StudentModule
 from courseware.model_data import FieldDataCache
 from courseware.module_render import get_module_for_descriptor_internal
+from instructor.enrollment import bulk_update_enrollment, get_email_params, send_mails_to_students
 from instructor_analytics.basic import enrolled_students_features
 from instructor_analytics.csvs import format_dictlist
 from instructor_task.models import ReportStore, InstructorTask, PROGRESS
@@ -624,3 +627,59 @@ def upload_students_csv(_xmodule_instance_args, _entry_id, course_id, task_input
     upload_csv_to_report_store(rows, 'student_profile_info', course_id, start_date)
 
     return task_progress.update_task_state(extra_meta=current_step)
+
+
+def update_enrollments_for_identifiers(identifiers, _entry_id, course_id, task_input, action_name):
+    """
+    Enroll or unenroll (task_input['action']) the students identified by the
+    emails and/or usernames `identifiers` in batches of
+    settings.ENROLLMENT_UPDATES_PER_BATCH, and notify them by email if
+    task_input['email_students'].
+
+    The students whose enrollment changed count as succeeded, the others as
+    skipped, and the invalid identifiers as failed. The invalid identifiers,
+    and the emails which couldn't be sent, are stored as a CSV using a
+    `ReportStore`.
+    """
+    start_time = time()
+    start_date = datetime.now(UTC)
+    action = task_input['action']
+    auto_enroll = task_input['auto_enroll']
+    task_progress = TaskProgress(action_name, len(identifiers), start_time)
+    current_step = {'step': 'Updating Enrollments'}
+    task_progress.update_task_state(extra_meta=current_step)
+
+    email_params = None
+    if task_input['email_students']:
+        course = get_course_by_id(course_id)
+        email_params = get_email_params(course, auto_enroll, secure=task_input['secure'])
+
+    err_rows = [["identifier", "error"]]
+    batch_size = settings.ENROLLMENT_UPDATES_PER_BATCH
+    for start in xrange(0, len(identifiers), batch_size):
+        batch = identifiers[start:start + batch_size]
+        with dog_stats_api.timer('instructor_tasks.enrollments.time.batch', tags=[u'action:{}'.format(action)]):
+            with transaction.commit_on_success():
+                results, notifications = bulk_update_enrollment(course_id, batch, action, auto_enroll)
+            if email_params is not None:
+                # the enrollments were updated even if some emails couldn't be sent
+                failed_notifications = send_mails_to_students(notifications, email_params)
+                err_rows.extend([email, 'email not sent'] for __, email, __, __ in failed_notifications)
+
+        task_progress.attempted += len(results)
+        for result in results:
+            if result.get('invalidIdentifier'):
+                task_progress.failed += 1
+                err_rows.append([result['identifier'], 'invalid identifier'])
+            elif result['before'] != result['after']:
+                task_progress.succeeded += 1
+            else:
+                task_progress.skipped += 1
+        task_progress.update_task_state(extra_meta=current_step)
+
+    # If there are any error rows (don't count the header), write them out
+    if len(err_rows) > 1:
+        current_step = {'step': 'Uploading CSV'}
+        upload_csv_to_report_store(err_rows, 'enrollment_update_err', course_id, start_date)
+
+    return task_progress.update_task_state(extra_meta=current_step)
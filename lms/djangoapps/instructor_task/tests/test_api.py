@@ -16,6 +16,7 @@ from instructor_task.api import (
     submit_delete_problem_state_for_all_students,
     submit_bulk_course_email,
     submit_calculate_students_features_csv,
+    submit_update_enrollments,
 )
 
 from instructor_task.api_helper import AlreadyRunningError
@@ -202,3 +203,14 @@ class InstructorTaskCourseSubmitTest(InstructorTaskCourseTestCase):
             features=[]
         )
         self._test_resubmission(api_call)
+
+    def test_submit_update_enrollments(self):
+        api_call = lambda: submit_update_enrollments(
+            self.create_task_request(self.instructor),
+            self.course.id,
+            [self.student.email, 'robot@example.com'],
+            'enroll',
+            auto_enroll=False,
+            email_students=False
+        )
+        self._test_resubmission(api_call)
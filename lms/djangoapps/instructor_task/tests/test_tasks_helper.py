@@ -11,15 +11,18 @@ import ddt
 from mock import Mock, patch
 
 from django.conf import settings
+from django.core import mail
 from django.test.testcases import TestCase
+from django.test.utils import override_settings
 
 from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
 from xmodule.modulestore.tests.factories import CourseFactory
 
+from student.models import CourseEnrollment, CourseEnrollmentAllowed
 from student.tests.factories import CourseEnrollmentFactory, UserFactory
 
 from instructor_task.models import ReportStore
-from instructor_task.tasks_helper import upload_grades_csv, upload_students_csv
+from instructor_task.tasks_helper import upload_grades_csv, upload_students_csv, update_enrollments_for_identifiers
 
 
 class TestReport(ModuleStoreTestCase):
@@ -118,3 +121,48 @@ class TestStudentReport(TestReport):
         #This assertion simply confirms that the generation completed with no errors
         num_students = len(students)
         self.assertDictContainsSubset({'attempted': num_students, 'succeeded': num_students, 'failed': 0}, result)
+
+
+@override_settings(ENROLLMENT_UPDATES_PER_BATCH=2)
+class TestEnrollmentUpdates(TestReport):
+    """
+    Tests that the enrollment update task updates the enrollments in batches.
+    """
+    def _update_enrollments(self, identifiers, action, email_students=False):
+        """
+        Run the task helper on `identifiers`, and return its progress.
+        """
+        task_input = {'action': action, 'auto_enroll': True, 'email_students': email_students, 'secure': False}
+        with patch('instructor_task.tasks_helper._get_current_task'):
+            return update_enrollments_for_identifiers(identifiers, None, self.course.id, task_input, 'updated')
+
+    def test_enroll(self):
+        students = [UserFactory.create() for __ in range(3)]
+        enrolled = self.create_student('enrolled', 'enrolled@example.com')
+        identifiers = [student.username for student in students] + [enrolled.email, 'new@example.com', 'invalid']
+
+        result = self._update_enrollments(identifiers, 'enroll', email_students=True)
+
+        self.assertDictContainsSubset(
+            {'attempted': 6, 'succeeded': 4, 'skipped': 1, 'failed': 1, 'total': 6},
+            result
+        )
+        for student in students:
+            self.assertTrue(CourseEnrollment.is_enrolled(student, self.course.id))
+        self.assertTrue(CourseEnrollmentAllowed.objects.get(email='new@example.com', course_id=self.course.id).auto_enroll)
+        self.assertEqual(len(mail.outbox), 5)
+
+        report_store = ReportStore.from_config()
+        self.assertTrue(any('enrollment_update_err' in item[0] for item in report_store.links_for(self.course.id)))
+
+    def test_unenroll(self):
+        students = [self.create_student('student{}'.format(i), 'student{}@example.com'.format(i)) for i in range(3)]
+        CourseEnrollmentAllowed.objects.create(email='new@example.com', course_id=self.course.id)
+        identifiers = [student.email for student in students] + ['new@example.com', 'other@example.com']
+
+        result = self._update_enrollments(identifiers, 'unenroll')
+
+        self.assertDictContainsSubset({'attempted': 5, 'succeeded': 4, 'skipped': 1, 'failed': 0}, result)
+        self.assertEqual(CourseEnrollment.num_enrolled_in(self.course.id), 0)
+        self.assertFalse(CourseEnrollmentAllowed.objects.filter(course_id=self.course.id).exists())
+        self.assertEqual(len(mail.outbox), 0)
@@ -1,25 +1,64 @@
 """
 Serializer for video outline
 """
+import hashlib
+from functools import partial
+
+from django.core.cache import cache
 from rest_framework.reverse import reverse
 
 from courseware.access import has_access
+from xmodule.modulestore.django import modulestore
 
 from edxval.api import (
     get_video_info_for_course_and_profile, ValInternalError
 )
 
+# The precomputed outline is keyed by course content version, so it only has
+# to expire to pick up changes made outside the modulestore (e.g. in VAL).
+OUTLINE_CACHE_TIMEOUT = 60 * 60
+
+
+def course_content_version(course):
+    """
+    Return a string identifying the current content version of `course`, or
+    None if the modulestore backing the course does not track edit info.
+
+    Versions are ISO 8601 UTC timestamps, so they sort chronologically.
+    """
+    try:
+        edited_on = course.subtree_edited_on
+    except (AttributeError, NotImplementedError):
+        return None
+    if edited_on is None:
+        return None
+    return edited_on.isoformat()
+
+
+def _block_edited_on(block):
+    """
+    Return the isoformat edit time of `block` or an empty string if unknown.
+    """
+    try:
+        edited_on = block.edited_on
+    except (AttributeError, NotImplementedError):
+        return u''
+    return edited_on.isoformat() if edited_on else u''
+
 
 class BlockOutline(object):
     """
     Serializes course videos, pulling data from VAL and the video modules.
+
+    The outline produced is independent of the requesting user: URLs are
+    relative and no access checks are made, so it can be cached per course
+    content version. See `get_video_outline` for the per-request part.
     """
-    def __init__(self, course_id, start_block, categories_to_outliner, request):
+    def __init__(self, course_id, start_block, categories_to_outliner):
         """Create a BlockOutline using `start_block` as a starting point."""
         self.start_block = start_block
         self.categories_to_outliner = categories_to_outliner
         self.course_id = course_id
-        self.request = request  # needed for making full URLS
         self.local_cache = {}
         try:
             self.local_cache['course_videos'] = get_video_info_for_course_and_profile(
@@ -28,83 +67,59 @@ class BlockOutline(object):
         except ValInternalError:  # pragma: nocover
             self.local_cache['course_videos'] = {}
 
-    def __iter__(self):
-        child_to_parent = {}
-        stack = [self.start_block]
-
-        # path should be optional
-        def path(block):
-            """path for block"""
-            block_path = []
-            while block in child_to_parent:
-                block = child_to_parent[block]
-                if block is not self.start_block:
-                    block_path.append({
-                        'name': block.display_name,
-                        'category': block.category,
-                    })
-            return reversed(block_path)
-
-        def find_urls(block):
-            """section and unit urls for block"""
-            block_path = []
-            while block in child_to_parent:
-                block = child_to_parent[block]
-                block_path.append(block)
-
-            course, chapter, section, unit = list(reversed(block_path))[:4]
-            position = 1
-            unit_name = unit.url_name
-            for block in section.children:
-                if block.name == unit_name:
-                    break
-                position += 1
-
-            kwargs = dict(
-                course_id=course.id.to_deprecated_string(),
-                chapter=chapter.url_name,
-                section=section.url_name
-            )
-            section_url = reverse(
-                "courseware_section",
-                kwargs=kwargs,
-                request=self.request,
-            )
-            kwargs['position'] = position
-            unit_url = reverse(
-                "courseware_position",
-                kwargs=kwargs,
-                request=self.request,
-            )
-            return unit_url, section_url
+    def _find_urls(self, ancestors, positions):
+        """
+        Section and unit urls for a block with the given `ancestors` (root
+        first) whose entries were found at the 1-based `positions` within
+        their parents.
+        """
+        course, chapter, section, unit = ancestors[:4]
+        kwargs = dict(
+            course_id=course.id.to_deprecated_string(),
+            chapter=chapter.url_name,
+            section=section.url_name
+        )
+        section_url = reverse("courseware_section", kwargs=kwargs)
+        kwargs['position'] = positions[3]
+        unit_url = reverse("courseware_position", kwargs=kwargs)
+        return unit_url, section_url
 
-        user = self.request.user
+    def __iter__(self):
+        # Each stack entry carries its ancestors and its position within each
+        # ancestor, so paths and positions never need to be recomputed.
+        stack = [(self.start_block, (), ())]
 
         while stack:
-            curr_block = stack.pop()
+            curr_block, ancestors, positions = stack.pop()
 
             if curr_block.category in self.categories_to_outliner:
-                if not has_access(user, 'load', curr_block, course_key=self.course_id):
-                    continue
-
                 summary_fn = self.categories_to_outliner[curr_block.category]
-                block_path = list(path(curr_block))
-                unit_url, section_url = find_urls(curr_block)
+                block_path = [
+                    {'name': block.display_name, 'category': block.category}
+                    for block in ancestors
+                    if block is not self.start_block
+                ]
+                unit_url, section_url = self._find_urls(ancestors, positions)
                 yield {
-                    "path": block_path,
-                    "named_path": [b["name"] for b in block_path[:-1]],
-                    "unit_url": unit_url,
-                    "section_url": section_url,
-                    "summary": summary_fn(self.course_id, curr_block, self.request, self.local_cache)
+                    "block_id": unicode(curr_block.location),
+                    "version": max(_block_edited_on(block) for block in ancestors[1:] + (curr_block,)),
+                    "outline": {
+                        "path": block_path,
+                        "named_path": [b["name"] for b in block_path[:-1]],
+                        "unit_url": unit_url,
+                        "section_url": section_url,
+                        "summary": summary_fn(self.course_id, curr_block, self.local_cache),
+                    },
                 }
 
             if curr_block.has_children:
-                for block in reversed(curr_block.get_children()):
-                    stack.append(block)
-                    child_to_parent[block] = curr_block
+                children = curr_block.get_children()
+                child_ancestors = ancestors + (curr_block,)
+                for position in xrange(len(children), 0, -1):
+                    stack.append((children[position - 1], child_ancestors, positions + (position,)))
 
 
-def video_summary(course, course_id, video_descriptor, request, local_cache):
+def video_summary(course, course_id, video_descriptor, local_cache):
     """
     returns summary dict for the given video module
     """
@@ -133,7 +148,6 @@ def video_summary(course, course_id, video_descriptor, request, local_cache):
                 'block_id': video_descriptor.scope_ids.usage_id.block_id,
                 'lang': lang
             },
-            request=request,
         )
         for lang in transcript_langs
     }
@@ -149,3 +163,90 @@ def video_summary(course, course_id, video_descriptor, request, local_cache):
         "category": video_descriptor.category,
         "id": unicode(video_descriptor.scope_ids.usage_id),
     }
+
+
+def _outline_cache_key(course_id, version):
+    """
+    Cache key for the precomputed video outline of `course_id` at `version`.
+    """
+    return u"mobile_api.video_outline.{}.{}".format(course_id, version)
+
+
+def get_course_video_entries(course_id, version):
+    """
+    Return the user-independent video outline entries of the course, computing
+    and caching them for `version` if needed.
+
+    Each entry is a dict with the video's `block_id`, the content `version`
+    at which the video or any of its ancestors last changed, and the
+    `outline` item with relative URLs.
+    """
+    cache_key = _outline_cache_key(course_id, version) if version else None
+    if cache_key:
+        entries = cache.get(cache_key)
+        if entries is not None:
+            return entries
+
+    course = modulestore().get_course(course_id, depth=None)
+    entries = list(
+        BlockOutline(
+            course_id,
+            course,
+            {"video": partial(video_summary, course)},
+        )
+    )
+    if cache_key:
+        cache.set(cache_key, entries, OUTLINE_CACHE_TIMEOUT)
+    return entries
+
+
+def _absolute_outline(outline, request):
+    """
+    Return a copy of the cached `outline` item with its URLs made absolute.
+    """
+    absolute = dict(outline)
+    absolute['unit_url'] = request.build_absolute_uri(outline['unit_url'])
+    absolute['section_url'] = request.build_absolute_uri(outline['section_url'])
+    absolute['summary'] = dict(outline['summary'])
+    absolute['summary']['transcripts'] = {
+        lang: request.build_absolute_uri(url)
+        for lang, url in outline['summary']['transcripts'].iteritems()
+    }
+    return absolute
+
+
+def get_video_outline(course, request, since_version=None):
+    """
+    Return `(outline, etag)` for the videos in `course` visible to the
+    requesting user.
+
+    Only the access filtering is done per request; the rest of the outline is
+    precomputed per course content version. If `since_version` is given,
+    only videos which changed after that version are returned.
+    """
+    course_id = course.id
+    version = course_content_version(course)
+    entries = get_course_video_entries(course_id, version)
+
+    user = request.user
+    videos = {
+        unicode(video.location): video
+        for video in modulestore().get_items(course_id, qualifiers={'category': 'video'})
+    }
+    visible = [
+        entry for entry in entries
+        if entry['block_id'] in videos and
+        has_access(user, 'load', videos[entry['block_id']], course_key=course_id)
+    ]
+
+    if since_version:
+        visible = [entry for entry in visible if entry['version'] > since_version]
+
+    # the etag is of the returned outline, so it differs with since_version
+    etag = hashlib.md5(
+        u"{}|{}|{}".format(
+            version, since_version or u"", u",".join(entry['block_id'] for entry in visible)
+        ).encode('utf-8')
+    ).hexdigest()
+
+    return [_absolute_outline(entry['outline'], request) for entry in visible], etag
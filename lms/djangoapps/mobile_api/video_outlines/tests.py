@@ -161,6 +161,51 @@ class TestVideoOutline(ModuleStoreTestCase, APITestCase):
         self.assertEqual(course_outline[2]['summary']['video_url'], self.html5_video_url)
         self.assertEqual(course_outline[2]['summary']['size'], 0)
 
+    def test_etag(self):
+        url = reverse('video-summary-list', kwargs={'course_id': unicode(self.course.id)})
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        ItemFactory.create(
+            parent_location=self.other_unit.location,
+            category="video",
+            display_name=u"test video omega 2 \u03a9",
+            html5_sources=[self.html5_video_url]
+        )
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(len(response.data), 2)  # pylint: disable=E1103
+
+    def test_since_version(self):
+        url = reverse('video-summary-list', kwargs={'course_id': unicode(self.course.id)})
+        response = self.client.get(url)
+        version = response['X-Course-Content-Version']
+        etag = response['ETag']
+
+        response = self.client.get(url, {'since_version': version})
+        self.assertEqual(response.data, [])  # pylint: disable=E1103
+        self.assertNotEqual(response['ETag'], etag)
+
+        # the full outline isn't the filtered outline the client has
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 200)
+
+        ItemFactory.create(
+            parent_location=self.other_unit.location,
+            category="video",
+            display_name=u"test video omega 2 \u03a9",
+            html5_sources=[self.html5_video_url]
+        )
+        response = self.client.get(url, {'since_version': version})
+        course_outline = response.data  # pylint: disable=E1103
+        self.assertEqual(len(course_outline), 1)
+        self.assertEqual(course_outline[0]['summary']['name'], u"test video omega 2 \u03a9")
+
     def test_transcripts(self):
         kwargs = {
             'course_id': unicode(self.course.id),
@@ -6,11 +6,9 @@ only displayed at the course level. This is because it makes it a lot easier to
 optimize and reason about, and it avoids having to tackle the bigger problem of
 general XBlock representation in this rather specialized formatting.
 """
-from functools import partial
-
 from django.http import Http404, HttpResponse
 
-from rest_framework import generics, permissions
+from rest_framework import generics, permissions, status
 from rest_framework.authentication import OAuth2Authentication, SessionAuthentication
 from rest_framework.response import Response
 from rest_framework.exceptions import PermissionDenied
@@ -21,7 +19,7 @@ from courseware.access import has_access
 from xmodule.exceptions import NotFoundError
 from xmodule.modulestore.django import modulestore
 
-from .serializers import BlockOutline, video_summary
+from .serializers import course_content_version, get_video_outline
 
 
 class VideoSummaryList(generics.ListAPIView):
@@ -35,6 +33,20 @@ class VideoSummaryList(generics.ListAPIView):
 
         GET /api/mobile/v0.5/video_outlines/courses/{organization}/{course_number}/{course_run}
 
+        GET /api/mobile/v0.5/video_outlines/courses/{organization}/{course_number}/{course_run}?since_version={version}
+
+    **Incremental Sync**
+
+        The response has an ETag header, which changes whenever the course
+        content or the set of videos visible to the user changes. Send it
+        back in an If-None-Match header to get a 304 response when nothing
+        changed.
+
+        The X-Course-Content-Version header of the response holds the course
+        content version. Pass it as the since_version query parameter to get
+        only the videos which were added or changed after that version. Use
+        a full request to detect removed videos.
+
     **Response Values**
 
         An array of videos in the course. For each video:
@@ -84,15 +96,20 @@ class VideoSummaryList(generics.ListAPIView):
         course_id = CourseKey.from_string(kwargs['course_id'])
         course = get_mobile_course(course_id, request.user)
 
-        video_outline = list(
-            BlockOutline(
-                course_id,
-                course,
-                {"video": partial(video_summary, course)},
-                request,
-            )
+        video_outline, etag = get_video_outline(
+            course, request, since_version=request.GET.get('since_version')
         )
-        return Response(video_outline)
+        quoted_etag = '"{}"'.format(etag)
+        if request.META.get('HTTP_IF_NONE_MATCH') == quoted_etag:
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = Response(video_outline)
+        response['ETag'] = quoted_etag
+
+        version = course_content_version(course)
+        if version:
+            response['X-Course-Content-Version'] = version
+        return response
 
 
 class VideoTranscripts(generics.RetrieveAPIView):
@@ -133,12 +150,12 @@ class VideoTranscripts(generics.RetrieveAPIView):
         return response
 
 
-def get_mobile_course(course_id, user):
+def get_mobile_course(course_id, user, depth=0):
     """
     Return only a CourseDescriptor if the course is mobile-ready or if the
     requesting user is a staff member.
     """
-    course = modulestore().get_course(course_id, depth=None)
+    course = modulestore().get_course(course_id, depth=depth)
     if course.mobile_available or has_access(user, 'staff', course):
         return course
 
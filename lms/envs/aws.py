@@ -242,6 +242,11 @@ META_UNIVERSITIES = ENV_TOKENS.get('META_UNIVERSITIES', {})
 COMMENTS_SERVICE_URL = ENV_TOKENS.get("COMMENTS_SERVICE_URL", '')
 COMMENTS_SERVICE_KEY = ENV_TOKENS.get("COMMENTS_SERVICE_KEY", '')
 CERT_QUEUE = ENV_TOKENS.get("CERT_QUEUE", 'test-pull')
+CERTIFICATES_STUDENTS_PER_TASK = ENV_TOKENS.get('CERTIFICATES_STUDENTS_PER_TASK', CERTIFICATES_STUDENTS_PER_TASK)
+ENROLLMENT_UPDATES_PER_BATCH = ENV_TOKENS.get('ENROLLMENT_UPDATES_PER_BATCH', ENROLLMENT_UPDATES_PER_BATCH)
+CERT_XQUEUE_CONCURRENCY = ENV_TOKENS.get('CERT_XQUEUE_CONCURRENCY', CERT_XQUEUE_CONCURRENCY)
+REQUEST_PROFILER_SAMPLE_RATE = ENV_TOKENS.get('REQUEST_PROFILER_SAMPLE_RATE', REQUEST_PROFILER_SAMPLE_RATE)
+MODULESTORE_MONGO_BUDGETS.update(ENV_TOKENS.get('MODULESTORE_MONGO_BUDGETS', {}))
 ZENDESK_URL = ENV_TOKENS.get("ZENDESK_URL")
 FEEDBACK_SUBMISSION_EMAIL = ENV_TOKENS.get("FEEDBACK_SUBMISSION_EMAIL")
 MKTG_URLS = ENV_TOKENS.get('MKTG_URLS', MKTG_URLS)
@@ -415,6 +420,11 @@ GRADES_DOWNLOAD_ROUTING_KEY = HIGH_MEM_QUEUE
 
 GRADES_DOWNLOAD = ENV_TOKENS.get("GRADES_DOWNLOAD", GRADES_DOWNLOAD)
 
+GRADEBOOK_PAGE_SIZE = ENV_TOKENS.get('GRADEBOOK_PAGE_SIZE', GRADEBOOK_PAGE_SIZE)
+GRADEBOOK_GRADE_CACHE_TIMEOUT = ENV_TOKENS.get('GRADEBOOK_GRADE_CACHE_TIMEOUT', GRADEBOOK_GRADE_CACHE_TIMEOUT)
+
+USER_STATE_SUMMARY_COUNTER_SHARDS = ENV_TOKENS.get('USER_STATE_SUMMARY_COUNTER_SHARDS', USER_STATE_SUMMARY_COUNTER_SHARDS)
+
 ##### ORA2 ######
 # Prefix for uploads of example-based assessment AI classifiers
 # This can be used to separate uploads for different environments
@@ -287,6 +287,15 @@ FEATURES = {
 
     # Enable the new dashboard, account, and profile pages
     'ENABLE_NEW_DASHBOARD': False,
+
+    # Profile a sample of the requests (see REQUEST_PROFILER_SAMPLE_RATE):
+    # count and time their SQL queries, Mongo operations, cache calls,
+    # safe_exec runs and xblock renders, and send them to datadog and the logs.
+    'ENABLE_REQUEST_PROFILER': False,
+
+    # Trace the Mongo operations of the modulestores in each request and task,
+    # and warn about the views and tasks over their MODULESTORE_MONGO_BUDGETS.
+    'ENABLE_MODULESTORE_TRACING': False,
 }
 
 # Ignore static asset files on import which match this pattern
@@ -614,6 +623,16 @@ CODE_JAIL = {
         # How many CPU seconds can jailed code use?
         'CPU': 1,
     },
+
+    # Pool of warm sandbox processes, see capa.safe_exec.sandbox_pool.
+    'pool': {
+        # How many sandbox processes per LMS process?  0 means no pool.
+        'size': 0,
+        # Replace a sandbox process after this many executions.
+        'max_executions': 100,
+        # Kill a sandbox process which doesn't answer within this many seconds.
+        'timeout': 10,
+    },
 }
 
 # Some courses are allowed to run unsafe code. This is a list of regexes, one
@@ -896,6 +915,10 @@ TEMPLATE_LOADERS = (
 
 MIDDLEWARE_CLASSES = (
     'request_cache.middleware.RequestCache',
+    # Does nothing unless FEATURES['ENABLE_REQUEST_PROFILER'] is set
+    'request_profiler.middleware.RequestProfilerMiddleware',
+    # Does nothing unless FEATURES['ENABLE_MODULESTORE_TRACING'] is set
+    'request_profiler.middleware.ModulestoreTracingMiddleware',
     'microsite_configuration.middleware.MicrositeMiddleware',
     'django_comment_client.middleware.AjaxExceptionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -952,6 +975,14 @@ MIDDLEWARE_CLASSES = (
     'course_wiki.middleware.WikiAccessMiddleware',
 )
 
+# Fraction of the requests profiled by RequestProfilerMiddleware
+REQUEST_PROFILER_SAMPLE_RATE = 0.01
+
+# Number of modulestore Mongo operations above which a view or a task (by
+# name, e.g. {'index': 50}) logs a warning, when ENABLE_MODULESTORE_TRACING is
+# set. The 'default' budget applies to the others.
+MODULESTORE_MONGO_BUDGETS = {'default': None}
+
 # Clickjacking protection can be enabled by setting this to 'DENY'
 X_FRAME_OPTIONS = 'ALLOW'
 
@@ -1464,6 +1495,7 @@ INSTALLED_APPS = (
 
     # Monitoring functionality
     'monitoring',
+    'request_profiler',
 
     # Course action state
     'course_action_state',
@@ -1544,6 +1576,23 @@ REGISTRATION_EXTRA_FIELDS = {
 CERT_NAME_SHORT = "Certificate"
 CERT_NAME_LONG = "Certificate of Achievement"
 
+# Name of the xqueue queue that certificate requests are put on
+CERT_QUEUE = 'certificates'
+
+# Number of students whose certificates are requested by each subtask of the
+# generate_certificates instructor task.
+CERTIFICATES_STUDENTS_PER_TASK = 100
+
+# Maximum number of certificate requests sent to the xqueue at the same time
+# when certificates are requested in bulk.
+CERT_XQUEUE_CONCURRENCY = 4
+
+###################### Enrollment Updates ######################
+# Number of students enrolled or unenrolled together by the instructor
+# dashboard. Larger updates are run by the update_enrollments instructor task,
+# in batches of this size.
+ENROLLMENT_UPDATES_PER_BATCH = 200
+
 ###################### Grade Downloads ######################
 GRADES_DOWNLOAD_ROUTING_KEY = HIGH_MEM_QUEUE
 
@@ -1553,6 +1602,19 @@ GRADES_DOWNLOAD = {
     'ROOT_PATH': '/tmp/edx-s3/grades',
 }
 
+###################### Gradebook ######################
+# Number of students shown on each page of the instructor gradebook
+GRADEBOOK_PAGE_SIZE = 50
+
+# Seconds for which the grades computed by the gradebook are cached
+GRADEBOOK_GRADE_CACHE_TIMEOUT = 15 * 60
+
+###################### Module state ######################
+# Number of rows over which each count of the poll answers, word cloud words
+# and other Scope.user_state_summary counters is spread, so that concurrent
+# increments seldom wait on the same row
+USER_STATE_SUMMARY_COUNTER_SHARDS = 10
+
 ######################## PROGRESS SUCCESS BUTTON ##############################
 # The following fields are available in the URL: {course_id} {student_id}
 PROGRESS_SUCCESS_BUTTON_URL = 'http://<domain>/<path>/{course_id}'
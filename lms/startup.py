@@ -35,6 +35,8 @@ def run():
     if settings.FEATURES.get('ENABLE_THIRD_PARTY_AUTH', False):
         enable_third_party_auth()
 
+    configure_sandbox_pool()
+
     # Initialize Segment.io analytics module. Flushes first time a message is received and 
     # every 50 messages thereafter, or if 10 seconds have passed since last flush
     if settings.FEATURES.get('SEGMENT_IO_LMS') and hasattr(settings, 'SEGMENT_IO_LMS_KEY'):
@@ -55,6 +57,20 @@ def add_mimetypes():
     mimetypes.add_type('application/font-woff', '.woff')
 
 
+def configure_sandbox_pool():
+    """
+    Configure the pool of warm sandbox processes used by capa's safe_exec.
+    """
+    from capa.safe_exec import sandbox_pool
+
+    pool_settings = settings.CODE_JAIL.get('pool', {})
+    sandbox_pool.configure(
+        pool_settings.get('size', 0),
+        max_executions=pool_settings.get('max_executions', 100),
+        timeout=pool_settings.get('timeout', 10),
+    )
+
+
 def enable_theme():
     """
     Enable the settings for a custom theme, whose files should be stored